@@ -3,13 +3,10 @@
 from __future__ import annotations
 
 import sys
-import tempfile
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from cwrappers.finder import cli as finder_cli
-from cwrappers.finder.runner import run_finder
-from cwrappers.fuzzy import cli as fuzzy_cli
-from cwrappers.fuzzy.io import process_csv
+# Subcommand modules are imported on dispatch, so usage/help and the finder
+# path never pay for the fuzzy stack (yaml, rapidfuzz).
 
 USAGE = """usage: cwrappers <finder|fuzzy|pipeline|run> [args...]
 
@@ -27,85 +24,100 @@ examples:
 """
 
 
-def _find_flag_value(argv: List[str], flag: str) -> Optional[str]:
+def _index_flags(argv: List[str]) -> Dict[str, str]:
+    """Map each flag to its first value, for both `--k v` and `--k=v` forms."""
+    index: Dict[str, str] = {}
+    n = len(argv)
     for i, tok in enumerate(argv):
-        if tok == flag and i + 1 < len(argv):
-            return argv[i + 1]
-        if tok.startswith(flag + "="):
-            return tok.split("=", 1)[1]
-    return None
+        head, eq, val = tok.partition("=")
+        if eq:
+            index.setdefault(head, val)
+        elif i + 1 < n:
+            index.setdefault(tok, argv[i + 1])
+    return index
 
 
-def _has_flag(argv: List[str], flag: str) -> bool:
-    return _find_flag_value(argv, flag) is not None
-
-
-def _extract_pipeline_flags(argv: List[str]):
-    fuzzy = False
-    fuzzy_out: Optional[str] = None
-    fuzzy_out_dir: Optional[str] = None
-    fuzzy_top_k: Optional[int] = None
-
+def _int_or_none(val: str) -> Optional[int]:
+    try:
+        return int(val)
+    except Exception:
+        return None
+
+
+# Pipeline-only flags: flag -> (key, value parser). A parser of None marks a
+# bare switch that takes no value.
+_PIPELINE_FLAGS: Dict[str, Tuple[str, Optional[Callable[[str], Any]]]] = {
+    "--fuzzy": ("fuzzy", None),
+    "--fuzzy-out": ("fuzzy_out", str),
+    "--fuzzy-out-dir": ("fuzzy_out_dir", str),
+    "--fuzzy-top-k": ("fuzzy_top_k", _int_or_none),
+}
+
+
+def _extract_pipeline_flags(argv: List[str]) -> Dict[str, Any]:
+    """Split pipeline flags out of argv; everything else is left in `remaining`."""
+    flags: Dict[str, Any] = {
+        "fuzzy": False,
+        "fuzzy_out": None,
+        "fuzzy_out_dir": None,
+        "fuzzy_top_k": None,
+    }
     remaining: List[str] = []
+    n = len(argv)
     i = 0
-    while i < len(argv):
+    while i < n:
         tok = argv[i]
-        if tok == "--fuzzy":
-            fuzzy = True
-            i += 1
-            continue
-        if tok.startswith("--fuzzy-out="):
-            fuzzy_out = tok.split("=", 1)[1]
-            i += 1
-            continue
-        if tok == "--fuzzy-out" and i + 1 < len(argv):
-            fuzzy_out = argv[i + 1]
-            i += 2
-            continue
-        if tok.startswith("--fuzzy-out-dir="):
-            fuzzy_out_dir = tok.split("=", 1)[1]
-            i += 1
-            continue
-        if tok == "--fuzzy-out-dir" and i + 1 < len(argv):
-            fuzzy_out_dir = argv[i + 1]
-            i += 2
-            continue
-        if tok.startswith("--fuzzy-top-k="):
-            try:
-                fuzzy_top_k = int(tok.split("=", 1)[1])
-            except Exception:
-                fuzzy_top_k = None
-            i += 1
-            continue
-        if tok == "--fuzzy-top-k" and i + 1 < len(argv):
-            try:
-                fuzzy_top_k = int(argv[i + 1])
-            except Exception:
-                fuzzy_top_k = None
-            i += 2
-            continue
+        head, eq, val = tok.partition("=")
+        spec = _PIPELINE_FLAGS.get(head)
+        if spec is not None:
+            key, conv = spec
+            if conv is None:
+                if not eq:
+                    flags[key] = True
+                    i += 1
+                    continue
+            elif eq:
+                flags[key] = conv(val)
+                i += 1
+                continue
+            elif i + 1 < n:
+                flags[key] = conv(argv[i + 1])
+                i += 2
+                continue
         remaining.append(tok)
         i += 1
 
-    return fuzzy, fuzzy_out, fuzzy_out_dir, fuzzy_top_k, remaining
+    flags["remaining"] = remaining
+    return flags
 
 
 def _pipeline(argv: List[str]) -> int:
-    fuzzy, fuzzy_out, fuzzy_out_dir, fuzzy_top_k, finder_argv = _extract_pipeline_flags(argv)
+    flags = _extract_pipeline_flags(argv)
+    fuzzy = flags["fuzzy"]
+    fuzzy_out = flags["fuzzy_out"]
+    fuzzy_out_dir = flags["fuzzy_out_dir"]
+    fuzzy_top_k = flags["fuzzy_top_k"]
+    finder_argv = flags["remaining"]
 
     if fuzzy:
-        has_out = _has_flag(finder_argv, "--out") or _has_flag(finder_argv, "--out-dir")
+        finder_flags = _index_flags(finder_argv)
+        has_out = "--out" in finder_flags or "--out-dir" in finder_flags
         if not has_out:
+            import tempfile
+
             tmp = tempfile.NamedTemporaryFile(prefix="cwrappers_finder_", suffix=".csv", delete=False)
             tmp.close()
             finder_argv = finder_argv + ["--out", tmp.name]
         else:
-            out_val = _find_flag_value(finder_argv, "--out")
+            out_val = finder_flags.get("--out")
             if out_val == "-":
                 print("error: --fuzzy requires finder output to be a file (not stdout). Use --out or omit it.")
                 return 2
 
+    from cwrappers.finder import cli as finder_cli
+
     finder_args = finder_cli.parse_args(finder_argv)
+    from cwrappers.finder.runner import run_finder
     if fuzzy and getattr(finder_args, "edge_evidence", None):
         print("error: --fuzzy cannot be combined with --edge-evidence.")
         return 2
@@ -121,6 +133,8 @@ def _pipeline(argv: List[str]) -> int:
         print("error: pipeline could not determine finder output path for fuzzy stage.")
         return 2
 
+    from cwrappers.fuzzy.io import process_csv
+
     yaml_path = getattr(finder_args, "yaml", None)
     try:
         process_csv(
@@ -176,8 +190,12 @@ def main(argv: List[str] | None = None) -> int:
     rest = argv[1:]
 
     if cmd == "finder":
+        from cwrappers.finder import cli as finder_cli
+
         return finder_cli.main(rest)
     if cmd == "fuzzy":
+        from cwrappers.fuzzy import cli as fuzzy_cli
+
         return fuzzy_cli.main(rest)
     if cmd == "pipeline":
         return _pipeline(rest)
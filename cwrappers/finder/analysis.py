@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from cwrappers.finder.ast_utils import (
+    _CursorCache,
     _callee_definition,
     _callee_name,
+    _cursor_children,
     _function_body_cursor,
+    _nondecl_stmts,
 )
 from cwrappers.finder.catalog import ApiCatalog, HelperConfig
 from cwrappers.finder.clang_bootstrap import cindex, K
@@ -20,31 +23,95 @@ def is_helper_call(call: cindex.Cursor, helpers: HelperConfig, kind: str = "help
     return helpers.any_match(nm, "benign" if kind == "benign" else "helpers")
 
 
+@dataclass(frozen=True)
+class _CalleeInfo:
+    """Direct calls found in a callee body: (callee name, callee definition) pairs."""
+    calls: Tuple[Tuple[str, Optional[cindex.Cursor]], ...]
+    small: bool
+
+
+# Per-TU memo of callee body summaries keyed by cursor hash.
+_SMALL_FUNCTION_MAX_STMTS = 6
+_callee_cache = _CursorCache(max_entries=10000)
+
+# Per-TU memo of _analyze_stmt_bits results: cursor hash -> {(targets, helpers, hops) key: entry}.
+_path_cache = _CursorCache(max_entries=10000)
+
+# Per-TU memo of hop verdicts: callee hash -> {(query, id(targets), hops): (targets, hit)}.
+_hop_cache = _CursorCache(max_entries=10000)
+
+# Per-TU memo of collect_target_calls: function hash -> {id(targets): (targets, hits)}.
+_target_calls_cache = _CursorCache(max_entries=10000)
+
+
+def reset_hop_cache() -> None:
+    """Drop memoized callee and path summaries; call before analyzing a new translation unit."""
+    _callee_cache.clear()
+    _path_cache.clear()
+    _hop_cache.clear()
+    _target_calls_cache.clear()
+
+
+def _new_hop_entries(_callee: cindex.Cursor) -> Dict[Tuple[str, int, int], Tuple[Set[str], bool]]:
+    return {}
+
+
+def _memoized_hop_query(callee: cindex.Cursor, query: str, target_names: Set[str], max_hops: int,
+                        compute: Callable[[], bool]) -> bool:
+    entries = _hop_cache.get(callee, _new_hop_entries)
+    key = (query, id(target_names), max_hops)
+    entry = entries.get(key)
+    # The stored target set is checked by identity, so a recycled id() never matches.
+    if entry is not None and entry[0] is target_names:
+        return entry[1]
+    hit = compute()
+    entries[key] = (target_names, hit)
+    return hit
+
+
+def _cursor_hash(c: cindex.Cursor) -> int:
+    try:
+        return c.hash
+    except Exception:
+        return id(c)
+
+
+def _summarize_callee(callee: cindex.Cursor) -> Optional[_CalleeInfo]:
+    body = _function_body_cursor(callee)
+    if not body:
+        return None
+    calls: List[Tuple[str, Optional[cindex.Cursor]]] = []
+    n_stmts = 0
+    try:
+        for ch in _cursor_children(body):
+            if ch.kind != K.DECL_STMT:
+                n_stmts += 1
+            if ch.kind == K.CALL_EXPR:
+                calls.append((_callee_name(ch) or "", _callee_definition(ch)))
+    except Exception:
+        pass
+    return _CalleeInfo(calls=tuple(calls), small=n_stmts <= _SMALL_FUNCTION_MAX_STMTS)
+
+
+def _callee_info(callee: cindex.Cursor) -> Optional[_CalleeInfo]:
+    """Return the memoized direct-call summary for a callee definition (None if it has no body)."""
+    return _callee_cache.get(callee, _summarize_callee)
+
+
 def _call_hits_target_via_one_hop(call: cindex.Cursor, target_names: Set[str]) -> bool:
     """Conservative one-hop check: call resolves to helper with body that directly calls a target."""
     callee = _callee_definition(call)
     if not callee:
         return False
-    body = _function_body_cursor(callee)
-    if not body:
-        return False
-    for ch in body.get_children():
-        if ch.kind == K.CALL_EXPR:
-            nm = _callee_name(ch)
-            if nm in target_names:
-                return True
-    return False
+    return _memoized_hop_query(callee, "one", target_names, 1,
+                               lambda: _callee_calls_target(callee, target_names))
 
 
-def _is_small_function(fn: cindex.Cursor, max_stmts: int = 6) -> bool:
-    body = _function_body_cursor(fn)
-    if not body:
-        return False
-    try:
-        stmts = [c for c in body.get_children() if c.kind != K.DECL_STMT]
-        return len(stmts) <= max_stmts
-    except Exception:
+def _callee_calls_target(callee: cindex.Cursor, target_names: Set[str]) -> bool:
+    info = _callee_info(callee)
+    if info is None:
         return False
+    return any(nm in target_names for nm, _defn in info.calls)
 
 
 def _call_hits_target_via_n_hops(call: cindex.Cursor, target_names: Set[str], max_hops: int = 2, seen: Optional[Set[int]] = None) -> bool:
@@ -52,50 +119,56 @@ def _call_hits_target_via_n_hops(call: cindex.Cursor, target_names: Set[str], ma
     if max_hops < 1:
         return False
     callee = _callee_definition(call)
-    if not callee or not _is_small_function(callee):
+    if not callee or seen is not None:
+        return _callee_hits_target_via_n_hops(callee, target_names, max_hops, seen)
+    # A fresh DFS depends only on (callee, targets, max_hops), so it can be memoized.
+    return _memoized_hop_query(callee, "n", target_names, max_hops,
+                               lambda: _callee_hits_target_via_n_hops(callee, target_names, max_hops, None))
+
+
+def _callee_hits_target_via_n_hops(callee: Optional[cindex.Cursor], target_names: Set[str], max_hops: int, seen: Optional[Set[int]]) -> bool:
+    if max_hops < 1 or not callee:
+        return False
+    info = _callee_info(callee)
+    if info is None or not info.small:
         return False
     if seen is None:
         seen = set()
-    try:
-        hid = callee.hash
-    except Exception:
-        hid = id(callee)
+    hid = _cursor_hash(callee)
     if hid in seen:
         return False
     seen.add(hid)
-    body = _function_body_cursor(callee)
-    if not body:
-        return False
-    for ch in body.get_children():
-        if ch.kind == K.CALL_EXPR:
-            nm = _callee_name(ch) or ""
-            if nm in target_names:
-                return True
-            if _call_hits_target_via_n_hops(ch, target_names, max_hops - 1, seen):
-                return True
+    for nm, defn in info.calls:
+        if nm in target_names:
+            return True
+        if _callee_hits_target_via_n_hops(defn, target_names, max_hops - 1, seen):
+            return True
     return False
 
 
 # Whitelist of atomic pairs (by name). Kept under the "" family
-_ATOMIC_PAIRS: Dict[str, set] = {
+_ATOMIC_PAIRS: Dict[str, Set[Tuple[str, str]]] = {
     "": {
         ("open", "close"),
         ("fopen", "fclose"),
         ("socket", "close"),
         ("malloc", "free"),
         ("calloc", "free"),
-        frozenset(("pthread_mutex_lock", "pthread_mutex_unlock")),
-        frozenset(("pthread_rwlock_rdlock", "pthread_rwlock_unlock")),
+        ("pthread_mutex_lock", "pthread_mutex_unlock"),
+        ("pthread_rwlock_rdlock", "pthread_rwlock_unlock"),
     }
 }
 
+# Order-insensitive view of _ATOMIC_PAIRS: one frozenset lookup per check.
+_ATOMIC_PAIRS_CANON: Dict[str, FrozenSet[FrozenSet[str]]] = {
+    fam: frozenset(frozenset(p) for p in items) for fam, items in _ATOMIC_PAIRS.items()
+}
+
 
 def is_atomic_pair(api_names: List[str], family: str) -> bool:
     if len(api_names) != 2:
         return False
-    pairs = _ATOMIC_PAIRS.get(family or "", set())
-    a, b = api_names[0], api_names[1]
-    return (a, b) in pairs or (b, a) in pairs or (frozenset((a, b)) in pairs)
+    return frozenset(api_names) in _ATOMIC_PAIRS_CANON.get(family or "", frozenset())
 
 
 def has_early_guard_return(func_cursor: cindex.Cursor, helpers: HelperConfig) -> bool:
@@ -104,7 +177,7 @@ def has_early_guard_return(func_cursor: cindex.Cursor, helpers: HelperConfig) ->
     if not body:
         return False
 
-    stmts = [c for c in body.get_children() if c.kind != K.DECL_STMT]
+    stmts = _nondecl_stmts(body)
     if not stmts:
         return False
 
@@ -133,7 +206,7 @@ def has_early_guard_return(func_cursor: cindex.Cursor, helpers: HelperConfig) ->
             if ch.kind == K.RETURN_STMT:
                 return True
             if ch.kind == K.COMPOUND_STMT:
-                inner = [cc for cc in ch.get_children() if cc.kind != K.DECL_STMT]
+                inner = _nondecl_stmts(ch)
                 if inner and inner[0].kind == K.RETURN_STMT:
                     return True
         return False
@@ -143,6 +216,8 @@ def has_early_guard_return(func_cursor: cindex.Cursor, helpers: HelperConfig) ->
 
 SYSNR_TO_NAME: Dict[str, str] = {}
 
+_SYSCALL_SELECTOR_RE = re.compile(r"(?:SYS|__NR)_(\w+)")
+
 
 def resolve_syscall_indirection(call: cindex.Cursor) -> Optional[str]:
     """If `call` is syscall(SYS_* or __NR_*), return the implied base name."""
@@ -154,12 +229,13 @@ def resolve_syscall_indirection(call: cindex.Cursor) -> Optional[str]:
         return None
     selector = kids[1]
     try:
-        txt = "".join(tok.spelling for tok in selector.get_tokens())
+        txt = "".join([tok.spelling for tok in selector.get_tokens()])
     except Exception:
         txt = ""
-    m = re.search(r"(?:SYS|__NR)_(\w+)", txt)
-    if m:
-        return m.group(1)
+    if "SYS_" in txt or "__NR_" in txt:
+        m = _SYSCALL_SELECTOR_RE.search(txt)
+        if m:
+            return m.group(1)
     try:
         ev = selector.evaluate()
         if ev is not None and hasattr(ev, "value"):
@@ -176,14 +252,12 @@ def _inner_target_from_one_hop(call_cursor: cindex.Cursor, target_names: Set[str
     defn = _callee_definition(call_cursor)
     if not defn:
         return None
-    body = _function_body_cursor(defn)
-    if not body:
+    info = _callee_info(defn)
+    if info is None:
         return None
-    for ch in body.get_children():
-        if ch.kind == K.CALL_EXPR:
-            nm = _callee_name(ch)
-            if nm in target_names:
-                return nm
+    for nm, _defn in info.calls:
+        if nm in target_names:
+            return nm
     return None
 
 
@@ -217,28 +291,30 @@ def count_calls_in_expr(node: Optional[cindex.Cursor],
     """Count *target* calls inside an expression subtree."""
     if node is None:
         return 0
+    call_kind = K.CALL_EXPR
+    any_match = helpers.any_match
     cnt = 0
-    try:
-        children = node.get_children()
-    except Exception:
-        return 0
-
-    for ch in children:
-        if ch.kind == K.CALL_EXPR:
-            if is_helper_call(ch, helpers, kind="benign"):
-                pass
-            else:
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        try:
+            children = list(n.get_children())
+        except Exception:
+            continue
+        for ch in children:
+            if ch.kind == call_kind:
                 name = _callee_name(ch)
-                if name in target_names:
+                if any_match(name or "", "benign"):
+                    pass
+                elif name in target_names:
                     cnt += 1
                 else:
                     mapped = resolve_syscall_indirection(ch)
                     if mapped and mapped in target_names:
                         cnt += 1
-                    else:
-                        if _call_hits_target_via_one_hop(ch, target_names) or (max_helper_hops > 1 and _call_hits_target_via_n_hops(ch, target_names, max_helper_hops)):
-                            cnt += 1
-        cnt += count_calls_in_expr(ch, target_names, helpers, max_helper_hops)
+                    elif _call_hits_target_via_one_hop(ch, target_names) or (max_helper_hops > 1 and _call_hits_target_via_n_hops(ch, target_names, max_helper_hops)):
+                        cnt += 1
+            stack.append(ch)
     return cnt
 
 
@@ -256,6 +332,59 @@ def _merge_pr(a: PathResult, b: PathResult) -> PathResult:
     return PathResult(counts=(a.counts | b.counts), unknown=(a.unknown or b.unknown))
 
 
+# Cursor kinds that never have a CALL_EXPR beneath them (a zero-call path for analyze_stmt).
+_LEAF_KINDS = frozenset({
+    K.INTEGER_LITERAL,
+    K.FLOATING_LITERAL,
+    K.IMAGINARY_LITERAL,
+    K.STRING_LITERAL,
+    K.CHARACTER_LITERAL,
+    K.CXX_BOOL_LITERAL_EXPR,
+    K.CXX_NULL_PTR_LITERAL_EXPR,
+    K.TYPE_REF,
+    K.TEMPLATE_REF,
+    K.NAMESPACE_REF,
+    K.MEMBER_REF,
+    K.LABEL_REF,
+    K.DECL_REF_EXPR,
+    K.NULL_STMT,
+    K.BREAK_STMT,
+    K.CONTINUE_STMT,
+    K.GOTO_STMT,
+})
+
+
+# Per-path counts are capped at 2, so a count set is a 3-bit mask:
+# bit0 = "0 calls", bit1 = "1 call", bit2 = "2+ calls".
+_BIT_0, _BIT_1, _BIT_2 = 1, 2, 4
+
+
+_COUNTS_BY_BITS: Tuple[FrozenSet[int], ...] = tuple(
+    frozenset(v for v in range(3) if bits & (1 << v)) for bits in range(8)
+)
+
+
+def _bits_to_counts(bits: int) -> Set[int]:
+    return set(_COUNTS_BY_BITS[bits])
+
+
+def _build_seq_table() -> Tuple[int, ...]:
+    """_SEQ[a << 3 | b]: capped sums of every count in `a` followed by every count in `b`."""
+    table = []
+    for a in range(8):
+        lhs = _COUNTS_BY_BITS[a] or {0}
+        for b in range(8):
+            out = 0
+            for x in lhs:
+                for y in _COUNTS_BY_BITS[b]:
+                    out |= 1 << min(x + y, 2)
+            table.append(out)
+    return tuple(table)
+
+
+_SEQ = _build_seq_table()
+
+
 def analyze_stmt(stmt: cindex.Cursor,
                 target_names: Set[str],
                 helpers: HelperConfig,
@@ -263,72 +392,73 @@ def analyze_stmt(stmt: cindex.Cursor,
     """
     Compute a conservative set of per-path call-counts for `stmt`.
     """
+    bits, unknown = _analyze_stmt_bits(stmt, target_names, helpers, max_helper_hops)
+    return PathResult(counts=_bits_to_counts(bits), unknown=unknown)
+
+
+def _analyze_stmt_bits(stmt: cindex.Cursor,
+                       target_names: Set[str],
+                       helpers: HelperConfig,
+                       max_helper_hops: int = 1) -> Tuple[int, bool]:
+    """analyze_stmt on count bitmasks; returns (bits, unknown). Memoized per TU."""
+    if stmt.kind in _LEAF_KINDS:
+        return _BIT_0, False
+    memo = _path_cache.get(stmt, lambda _c: {})
+    key = (id(target_names), id(helpers), max_helper_hops)
+    entry = memo.get(key)
+    # The entry keeps target_names/helpers alive, so their ids cannot be reused
+    # by other objects while it is cached.
+    if entry is not None and entry[0] is target_names and entry[1] is helpers:
+        return entry[2]
+    result = _analyze_stmt_bits_uncached(stmt, target_names, helpers, max_helper_hops)
+    memo[key] = (target_names, helpers, result)
+    return result
+
+
+def _analyze_stmt_bits_uncached(stmt: cindex.Cursor,
+                                target_names: Set[str],
+                                helpers: HelperConfig,
+                                max_helper_hops: int = 1) -> Tuple[int, bool]:
     kind = stmt.kind
-    pr = PathResult()
-
-    def cap_union(sumset: Set[int], val: int) -> Set[int]:
-        out = set()
-        for s in sumset or {0}:
-            k = s + val
-            if k <= 2:
-                out.add(k)
-            else:
-                out.add(2)
-        return out
 
     if kind == K.RETURN_STMT:
         cnt = 0
         for ch in stmt.get_children():
             cnt += count_calls_in_expr(ch, target_names, helpers, max_helper_hops)
-        pr.counts = {cnt if cnt <= 2 else 2}
-        return pr
+        return (1 << (cnt if cnt <= 2 else 2)), False
 
     if kind == K.CALL_EXPR:
         if is_helper_call(stmt, helpers, kind="benign"):
-            pr.counts = {0}
-            return pr
+            return _BIT_0, False
         nm = _callee_name(stmt)
-        val = 0
         if nm in target_names:
-            val = 1
-        else:
-            mapped = resolve_syscall_indirection(stmt)
-            if mapped and mapped in target_names:
-                val = 1
-            elif _call_hits_target_via_one_hop(stmt, target_names) or (max_helper_hops > 1 and _call_hits_target_via_n_hops(stmt, target_names, max_helper_hops)):
-                val = 1
-        pr.counts = {val}
-        return pr
-
-    if kind == K.IF_STMT:
+            return _BIT_1, False
+        mapped = resolve_syscall_indirection(stmt)
+        if mapped and mapped in target_names:
+            return _BIT_1, False
+        if _call_hits_target_via_one_hop(stmt, target_names) or (max_helper_hops > 1 and _call_hits_target_via_n_hops(stmt, target_names, max_helper_hops)):
+            return _BIT_1, False
+        return _BIT_0, False
+
+    if kind == K.IF_STMT or kind == K.CONDITIONAL_OPERATOR:
         kids = list(stmt.get_children())
-        then_branch = kids[1] if len(kids) > 1 else None
-        else_branch = kids[2] if len(kids) > 2 else None
-        pr_then = analyze_stmt(then_branch, target_names, helpers, max_helper_hops) if then_branch else PathResult({0}, False)
-        pr_else = analyze_stmt(else_branch, target_names, helpers, max_helper_hops) if else_branch else PathResult({0}, False)
-        pr.counts = pr_then.counts | pr_else.counts
-        pr.unknown = pr_then.unknown or pr_else.unknown
-        return pr
+        then_node = kids[1] if len(kids) > 1 else None
+        else_node = kids[2] if len(kids) > 2 else None
+        then_bits, then_unknown = _analyze_stmt_bits(then_node, target_names, helpers, max_helper_hops) if then_node else (_BIT_0, False)
+        else_bits, else_unknown = _analyze_stmt_bits(else_node, target_names, helpers, max_helper_hops) if else_node else (_BIT_0, False)
+        return then_bits | else_bits, then_unknown or else_unknown
 
     if kind == K.SWITCH_STMT:
-        acc_pr = PathResult(counts=set(), unknown=False)
+        bits = 0
+        unknown = False
         for ch in stmt.get_children():
             if ch.kind in (K.CASE_STMT, K.DEFAULT_STMT):
                 kids = list(ch.get_children())
                 body = kids[1] if len(kids) >= 2 else None
-                prb = analyze_stmt(body, target_names, helpers, max_helper_hops) if body else PathResult({0}, False)
-                acc_pr = _merge_pr(acc_pr, prb)
-        if not acc_pr.counts:
-            acc_pr.counts = {0}
-        return acc_pr
-
-    if kind == K.CONDITIONAL_OPERATOR:
-        kids = list(stmt.get_children())
-        then_node = kids[1] if len(kids) >= 2 else None
-        else_node = kids[2] if len(kids) >= 3 else None
-        pr_then = analyze_stmt(then_node, target_names, helpers, max_helper_hops) if then_node else PathResult({0}, False)
-        pr_else = analyze_stmt(else_node, target_names, helpers, max_helper_hops) if else_node else PathResult({0}, False)
-        return _merge_pr(pr_then, pr_else)
+                b, u = _analyze_stmt_bits(body, target_names, helpers, max_helper_hops) if body else (_BIT_0, False)
+                bits |= b
+                unknown = unknown or u
+        return (bits or _BIT_0), unknown
 
     if kind in (K.FOR_STMT, K.WHILE_STMT, K.DO_STMT):
         body = None
@@ -336,32 +466,28 @@ def analyze_stmt(stmt: cindex.Cursor,
             if ch.kind == K.COMPOUND_STMT or ch.kind == K.BREAK_STMT or ch.kind == K.CONTINUE_STMT:
                 body = ch if ch.kind == K.COMPOUND_STMT else body
         if body is None:
-            return PathResult(counts={2}, unknown=True)
-        pr_body = analyze_stmt(body, target_names, helpers)
-        if any(x >= 2 for x in pr_body.counts):
-            return PathResult(counts={2}, unknown=True)
-        pr.counts = pr_body.counts | {0, 1}
-        pr.unknown = pr_body.unknown
-        return pr
+            return _BIT_2, True
+        body_bits, body_unknown = _analyze_stmt_bits(body, target_names, helpers)
+        if body_bits & _BIT_2:
+            return _BIT_2, True
+        return body_bits | _BIT_0 | _BIT_1, body_unknown
 
     if kind == K.COMPOUND_STMT:
-        acc: Set[int] = {0}
+        acc = _BIT_0
         unknown = False
-        for ch in stmt.get_children():
-            child = analyze_stmt(ch, target_names, helpers, max_helper_hops)
-            new_acc: Set[int] = set()
-            for v in child.counts:
-                new_acc |= cap_union(acc, v)
-            acc = new_acc
-            unknown = unknown or child.unknown
-        pr.counts = acc
-        pr.unknown = unknown
-        return pr
-
-    acc_pr = PathResult(counts={0}, unknown=False)
+        for ch in _cursor_children(stmt):
+            b, u = _analyze_stmt_bits(ch, target_names, helpers, max_helper_hops)
+            acc = _SEQ[acc << 3 | b]
+            unknown = unknown or u
+        return acc, unknown
+
+    bits = _BIT_0
+    unknown = False
     for ch in stmt.get_children():
-        acc_pr = _merge_pr(acc_pr, analyze_stmt(ch, target_names, helpers, max_helper_hops))
-    return acc_pr
+        b, u = _analyze_stmt_bits(ch, target_names, helpers, max_helper_hops)
+        bits |= b
+        unknown = unknown or u
+    return bits, unknown
 
 
 # ===========================
@@ -370,26 +496,44 @@ def analyze_stmt(stmt: cindex.Cursor,
 
 def collect_target_calls(fn: cindex.Cursor, target_names: Set[str]) -> List[Tuple[cindex.Cursor, str]]:
     """Find target calls inside `fn`, including helper hops and syscall mapping."""
-    hits: List[Tuple[cindex.Cursor, str]] = []
+    # The runner and the analyzers all ask for the same function's hits; walk it once.
+    entries = _target_calls_cache.get(fn, _new_target_call_entries)
+    entry = entries.get(id(target_names))
+    if entry is None or entry[0] is not target_names:
+        entry = entries[id(target_names)] = (target_names, tuple(_collect_target_calls_uncached(fn, target_names)))
+    return list(entry[1])
+
+
+def _new_target_call_entries(_fn: cindex.Cursor) -> Dict[int, Tuple[Set[str], Tuple[Tuple[cindex.Cursor, str], ...]]]:
+    return {}
 
-    def visit(n: cindex.Cursor):
-        if n.kind == K.CALL_EXPR:
+
+def _collect_target_calls_uncached(fn: cindex.Cursor, target_names: Set[str]) -> List[Tuple[cindex.Cursor, str]]:
+    hits: List[Tuple[cindex.Cursor, str]] = []
+    add_hit = hits.append
+    call_kind = K.CALL_EXPR
+    leaf_kinds = _LEAF_KINDS
+
+    stack = [fn]
+    while stack:
+        n = stack.pop()
+        kind = n.kind
+        if kind == call_kind:
             name = _callee_name(n)
-            if name in target_names:
-                loc = n.location
-                hits.append((n, f"{loc.line}:{loc.column}" if loc else "?"))
-            else:
+            hit = name in target_names
+            if not hit:
                 mapped = resolve_syscall_indirection(n)
-                if mapped and mapped in target_names:
-                    loc = n.location
-                    hits.append((n, f"{loc.line}:{loc.column}" if loc else "?"))
-                elif _call_hits_target_via_one_hop(n, target_names) or _call_hits_target_via_n_hops(n, target_names, 2):
-                    loc = n.location
-                    hits.append((n, f"{loc.line}:{loc.column}" if loc else "?"))
-        for ch in n.get_children():
-            visit(ch)
-
-    visit(fn)
+                hit = bool(mapped and mapped in target_names) or (
+                    _call_hits_target_via_one_hop(n, target_names)
+                    or _call_hits_target_via_n_hops(n, target_names, 2)
+                )
+            if hit:
+                loc = n.location
+                add_hit((n, f"{loc.line}:{loc.column}" if loc else "?"))
+        elif kind in leaf_kinds:
+            continue
+        # Reversed so children are visited in source (preorder) order.
+        stack.extend(reversed(list(n.get_children())))
     return hits
 
 
@@ -400,6 +544,7 @@ __all__ = [
     "has_early_guard_return",
     "is_atomic_pair",
     "is_helper_call",
+    "reset_hop_cache",
     "resolve_syscall_indirection",
     "_call_hits_target_via_n_hops",
     "_call_hits_target_via_one_hop",
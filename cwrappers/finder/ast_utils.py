@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 from pathlib import Path
-from typing import Optional, Tuple
+from sys import intern
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from cwrappers.finder.clang_bootstrap import cindex, K
 
@@ -40,7 +42,157 @@ def _is_callable_definition(c: Optional[cindex.Cursor]) -> bool:
         return False
 
 
-def _callee_name(call: cindex.Cursor) -> Optional[str]:
+# Declaration contexts that may contain callable definitions.
+_DECL_CONTAINER_KINDS = _cursor_kinds(
+    "TRANSLATION_UNIT",
+    "UNEXPOSED_DECL",
+    "LINKAGE_SPEC",
+    "NAMESPACE",
+    "CLASS_DECL",
+    "STRUCT_DECL",
+    "UNION_DECL",
+    "CLASS_TEMPLATE",
+    "CLASS_TEMPLATE_PARTIAL_SPECIALIZATION",
+    "FRIEND_DECL",
+)
+
+
+# clang_visitChildren visitor results (CXChildVisitResult).
+_VISIT_CONTINUE = 1
+_VISIT_RECURSE = 2
+
+
+def _callable_definitions_via_visitor(root: cindex.Cursor) -> Optional[List[cindex.Cursor]]:
+    """Collect callable definitions below `root` with one clang_visitChildren call.
+
+    libclang does the recursion in C and only calls back into Python per
+    visited declaration. Returns None when the bindings don't expose the
+    visitor API.
+    """
+    try:
+        visit_children = cindex.conf.lib.clang_visitChildren
+        make_callback = cindex.callbacks["cursor_visit"]
+    except Exception:
+        return None
+
+    tu = getattr(root, "_tu", None)
+    found: List[cindex.Cursor] = []
+
+    def visitor(child, _parent, _data):
+        try:
+            child._tu = tu
+            if _is_callable_definition(child):
+                found.append(child)
+                return _VISIT_CONTINUE
+            if child.kind in _DECL_CONTAINER_KINDS:
+                return _VISIT_RECURSE
+        except Exception:
+            pass
+        return _VISIT_CONTINUE
+
+    try:
+        visit_children(root, make_callback(visitor), found)
+    except Exception:
+        return None
+    return found
+
+
+def _iter_callable_definitions_py(root: cindex.Cursor) -> Iterator[cindex.Cursor]:
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if _is_callable_definition(n):
+            yield n
+            continue
+        if n.kind not in _DECL_CONTAINER_KINDS:
+            continue
+        try:
+            children = list(n.get_children())
+        except Exception:
+            continue
+        stack.extend(reversed(children))
+
+
+def iter_callable_definitions(root: cindex.Cursor) -> Iterator[cindex.Cursor]:
+    """Yield callable definitions under `root` in preorder.
+
+    Only declaration contexts (namespaces, records, linkage specs, ...) are
+    descended; function bodies are never walked, so this is much cheaper than
+    filtering `walk_preorder()`. Methods of classes declared inside a function
+    body are therefore not reported.
+    """
+    if _is_callable_definition(root):
+        yield root
+        return
+    if getattr(root, "_tu", None) is None or root.kind not in _DECL_CONTAINER_KINDS:
+        yield from _iter_callable_definitions_py(root)
+        return
+    found = _callable_definitions_via_visitor(root)
+    if found is None:
+        yield from _iter_callable_definitions_py(root)
+        return
+    yield from found
+
+
+class _CursorCache:
+    """Memo keyed by cursor hash, scoped to one translation unit at a time.
+
+    Cursor hashes are only meaningful within a live TU, so the cache empties
+    itself whenever it sees a cursor from a different TU. They are 32-bit and
+    collide even within one TU, so each entry keeps its cursor and a hit must
+    compare equal to it. Cursors without a TU (e.g. test doubles) bypass the
+    cache.
+    """
+
+    def __init__(self, max_entries: int = 100000) -> None:
+        self.max_entries = max_entries
+        self._tu: Any = None
+        self._data: Dict[int, Tuple[Any, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._tu = None
+        self._data.clear()
+
+    def get(self, c: Any, compute: Callable[[Any], Any]) -> Any:
+        tu = getattr(c, "_tu", None)
+        if tu is None:
+            return compute(c)
+        try:
+            h = c.hash
+        except Exception:
+            return compute(c)
+        if tu is not self._tu:
+            self._data.clear()
+            self._tu = tu
+        entry = self._data.get(h)
+        if entry is not None and entry[0] == c:
+            return entry[1]
+        value = compute(c)
+        if len(self._data) >= self.max_entries:
+            self._data.clear()
+        self._data[h] = (c, value)
+        return value
+
+
+_callee_name_cache = _CursorCache()
+_callee_definition_cache = _CursorCache()
+
+
+def reset_caches() -> None:
+    """Drop per-TU cursor memos (and the TU reference they hold)."""
+    _callee_name_cache.clear()
+    _callee_definition_cache.clear()
+    _function_body_cache.clear()
+    _cursor_children_cache.clear()
+    _var_key_cache.clear()
+    _call_line_col_cache.clear()
+    _cursor_loc_key_cache.clear()
+
+
+def _callee_name_uncached(call: cindex.Cursor) -> Optional[str]:
     try:
         ref = call.get_definition() or call.referenced
         if ref is None:
@@ -50,7 +202,7 @@ def _callee_name(call: cindex.Cursor) -> Optional[str]:
         return call.spelling or call.displayname
 
 
-def _callee_definition(call: cindex.Cursor) -> Optional[cindex.Cursor]:
+def _callee_definition_uncached(call: cindex.Cursor) -> Optional[cindex.Cursor]:
     try:
         ref = call.get_definition() or call.referenced
         if _is_callable_decl(ref):
@@ -60,7 +212,75 @@ def _callee_definition(call: cindex.Cursor) -> Optional[cindex.Cursor]:
     return None
 
 
-def _function_body_cursor(fn: cindex.Cursor) -> Optional[cindex.Cursor]:
+def _callee_name(call: cindex.Cursor) -> Optional[str]:
+    return _callee_name_cache.get(call, _callee_name_uncached)
+
+
+def _callee_definition(call: cindex.Cursor) -> Optional[cindex.Cursor]:
+    return _callee_definition_cache.get(call, _callee_definition_uncached)
+
+
+def _first_child_of_kind(parent: cindex.Cursor, kind: Any) -> Optional[cindex.Cursor]:
+    """Visit ``parent``'s children in libclang and stop at the first one of ``kind``.
+
+    Unlike get_children(), this does not wrap every sibling in a Python cursor
+    or resolve its CursorKind. It raises if the cindex internals it relies on
+    are unavailable, so callers can fall back to get_children().
+    """
+    kind_id = kind.value
+    found: List[cindex.Cursor] = []
+
+    def visitor(child: cindex.Cursor, _parent: cindex.Cursor, out: List[cindex.Cursor]) -> int:
+        if child._kind_id == kind_id:
+            # Keep the TU alive for as long as the cursor is, as get_children() does.
+            child._tu = parent._tu
+            out.append(child)
+            return 0  # CXChildVisit_Break
+        return 1  # CXChildVisit_Continue
+
+    cindex.conf.lib.clang_visitChildren(parent, cindex.callbacks["cursor_visit"](visitor), found)
+    return found[0] if found else None
+
+
+def _descendants_of_kind(parent: cindex.Cursor,
+                         kind: Any,
+                         prune_kinds: Iterable[Any] = (),
+                         max_nodes: Optional[int] = None) -> Tuple[List[cindex.Cursor], bool]:
+    """Collect every descendant of ``parent`` of ``kind`` in one libclang visit.
+
+    Matches are still descended into; nodes of ``prune_kinds`` are not. Returns
+    ``(matches, complete)``, where ``complete`` is False if the walk stopped
+    after ``max_nodes`` nodes. Like _first_child_of_kind, it raises if the
+    cindex internals are unavailable.
+    """
+    kind_id = kind.value
+    prune_ids = frozenset(k.value for k in prune_kinds)
+    tu = parent._tu
+    found: List[cindex.Cursor] = []
+    budget = [max_nodes if max_nodes is not None else -1]
+
+    def visitor(child: cindex.Cursor, _parent: cindex.Cursor, out: List[cindex.Cursor]) -> int:
+        if budget[0] >= 0:
+            if budget[0] == 0:
+                budget[0] = -2
+                return 0  # CXChildVisit_Break
+            budget[0] -= 1
+        child_kind = child._kind_id
+        if child_kind == kind_id:
+            child._tu = tu
+            out.append(child)
+        return 1 if child_kind in prune_ids else 2  # CXChildVisit_Continue / _Recurse
+
+    cindex.conf.lib.clang_visitChildren(parent, cindex.callbacks["cursor_visit"](visitor), found)
+    return found, budget[0] != -2
+
+
+def _function_body_cursor_uncached(fn: cindex.Cursor) -> Optional[cindex.Cursor]:
+    if isinstance(fn, cindex.Cursor):
+        try:
+            return _first_child_of_kind(fn, K.COMPOUND_STMT)
+        except Exception:
+            pass
     try:
         for ch in fn.get_children():
             if ch.kind == K.COMPOUND_STMT:
@@ -70,23 +290,71 @@ def _function_body_cursor(fn: cindex.Cursor) -> Optional[cindex.Cursor]:
     return None
 
 
+_function_body_cache = _CursorCache()
+_cursor_children_cache = _CursorCache()
+
+
+def _function_body_cursor(fn: cindex.Cursor) -> Optional[cindex.Cursor]:
+    return _function_body_cache.get(fn, _function_body_cursor_uncached)
+
+
+def _cursor_children_uncached(c: cindex.Cursor) -> Tuple[cindex.Cursor, ...]:
+    try:
+        return tuple(c.get_children())
+    except Exception:
+        return ()
+
+
+def _cursor_children(c: cindex.Cursor) -> Tuple[cindex.Cursor, ...]:
+    """Memoized direct children of any cursor; the AST is immutable within a TU."""
+    return _cursor_children_cache.get(c, _cursor_children_uncached)
+
+
+def _nondecl_stmts(body: cindex.Cursor) -> List[cindex.Cursor]:
+    """Direct children of `body` that are not declarations."""
+    return [c for c in _cursor_children(body) if c.kind != K.DECL_STMT]
+
+
 def _is_param(c: cindex.Cursor) -> bool:
     return c.kind == cindex.CursorKind.PARM_DECL
 
 
-def _var_key(c: cindex.Cursor) -> str:
+def _var_key_uncached(c: cindex.Cursor) -> str:
     # Stable key for both declarations (PARM_DECL/VAR_DECL) and references (DECL_REF_EXPR).
     base = c
     try:
-        if c.kind == K.DECL_REF_EXPR and getattr(c, "referenced", None):
-            base = c.referenced
+        ref = c.referenced if c.kind == K.DECL_REF_EXPR else None
+        if ref:
+            base = ref
         else:
             canon = getattr(c, "canonical", None)
             if canon is not None:
                 base = canon
     except Exception:
         base = c
-    return f"{base.spelling}@{base.hash}"
+    # Interned so a declaration and its references share one key object and
+    # taint/param-set probes hit the identity fast path.
+    return intern(f"{base.spelling}@{base.hash}")
+
+
+_var_key_cache = _CursorCache()
+_call_line_col_cache = _CursorCache()
+
+
+def _var_key(c: cindex.Cursor) -> str:
+    return _var_key_cache.get(c, _var_key_uncached)
+
+
+def _call_line_col_uncached(call: cindex.Cursor) -> Optional[str]:
+    loc = call.location
+    if loc and loc.file:
+        return f"{loc.line}:{loc.column}"
+    return None
+
+
+def _call_line_col(call: cindex.Cursor) -> Optional[str]:
+    """Return "line:column" for a call in a file, or None (memoized per cursor)."""
+    return _call_line_col_cache.get(call, _call_line_col_uncached)
 
 
 def _caller_name(fn_cursor: cindex.Cursor) -> str:
@@ -97,6 +365,12 @@ def _caller_name(fn_cursor: cindex.Cursor) -> str:
         return "<anon>"
 
 
+@functools.lru_cache(maxsize=4096)
+def _resolved_file_name(name: str) -> str:
+    """str(Path(name).resolve()), memoized; every cursor in a file shares its name."""
+    return str(Path(name).resolve())
+
+
 def _function_key(fn_cursor: cindex.Cursor) -> str:
     """Return a stable key for a function definition: prefer Clang USR if available,
     otherwise fall back to 'name@abs_path:line'."""
@@ -112,7 +386,7 @@ def _function_key(fn_cursor: cindex.Cursor) -> str:
         name = _caller_name(fn_cursor)
         loc = getattr(fn_cursor, "location", None)
         if loc and getattr(loc, "file", None):
-            return f"{name}@{Path(loc.file.name).resolve()}:{loc.line}"
+            return f"{name}@{_resolved_file_name(loc.file.name)}:{loc.line}"
         return f"{name}@<unknown>"
     except Exception:
         return "<unknown>"
@@ -126,14 +400,12 @@ def _callsite_loc(call: cindex.Cursor) -> str:
             return "<unknown>:0:0"
         if not loc.file:
             return f"<unknown>:{int(getattr(loc, 'line', 0) or 0)}:{int(getattr(loc, 'column', 0) or 0)}"
-        return f"{Path(loc.file.name).resolve()}:{loc.line}:{loc.column}"
+        return f"{_resolved_file_name(loc.file.name)}:{loc.line}:{loc.column}"
     except Exception:
         return "<unknown>:0:0"
 
 
-def _cursor_loc_key(c: Optional[cindex.Cursor]) -> Optional[Tuple[str, int, int]]:
-    if c is None:
-        return None
+def _cursor_loc_key_uncached(c: cindex.Cursor) -> Optional[Tuple[str, int, int]]:
     try:
         loc = c.location
         if not loc or not loc.file:
@@ -143,16 +415,33 @@ def _cursor_loc_key(c: Optional[cindex.Cursor]) -> Optional[Tuple[str, int, int]
         return None
 
 
+_cursor_loc_key_cache = _CursorCache()
+
+
+def _cursor_loc_key(c: Optional[cindex.Cursor]) -> Optional[Tuple[str, int, int]]:
+    if c is None:
+        return None
+    return _cursor_loc_key_cache.get(c, _cursor_loc_key_uncached)
+
+
 __all__ = [
+    "reset_caches",
+    "_CursorCache",
+    "_call_line_col",
     "_callee_definition",
     "_callee_name",
     "_callsite_loc",
     "_caller_name",
+    "_cursor_children",
     "_cursor_loc_key",
+    "_descendants_of_kind",
     "_function_body_cursor",
     "_function_key",
     "_is_callable_decl",
     "_is_callable_definition",
+    "iter_callable_definitions",
     "_is_param",
+    "_nondecl_stmts",
+    "_resolved_file_name",
     "_var_key",
 ]
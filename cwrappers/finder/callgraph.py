@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import csv
-from collections import defaultdict, namedtuple
+import hashlib
+from collections import Counter, defaultdict, namedtuple
 from dataclasses import dataclass
 from pathlib import Path
+from sys import intern
 from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from cwrappers.finder.ast_utils import (
@@ -15,7 +17,8 @@ from cwrappers.finder.ast_utils import (
     _function_body_cursor,
     _function_key,
     _caller_name,
-    _is_callable_definition,
+    _resolved_file_name,
+    iter_callable_definitions,
 )
 from cwrappers.finder.clang_bootstrap import cindex, K
 from cwrappers.finder.models import EdgeEvidenceRow, TranslationUnitReport
@@ -50,13 +53,12 @@ def resolve_project_function_key(
     function_defs_by_key: Mapping[str, FunctionDef],
     keys_by_name: Mapping[str, Set[str]],
 ) -> tuple[Optional[str], str]:
-    key = str(function_key or "")
-    name = str(function_name or "")
+    key = function_key or ""
     if key and key in function_defs_by_key:
         return key, "resolved_key"
-    if name and (not key or key.endswith("@<unknown>")):
-        candidates = keys_by_name.get(name, set())
-        if len(candidates) == 1:
+    if function_name and (not key or key.endswith("@<unknown>")):
+        candidates = keys_by_name.get(function_name)
+        if candidates and len(candidates) == 1:
             return next(iter(candidates)), "name_fallback"
     return None, ""
 
@@ -69,14 +71,30 @@ def _detailed_edge_identity(caller_key: str, callee_key: str, loc: str) -> tuple
     return (str(loc or ""), str(caller_key or ""), str(callee_key or ""))
 
 
-def collect_function_defs_for_tu(tu: cindex.TranslationUnit) -> List[FunctionDef]:
+def _iter_body_calls(body: cindex.Cursor) -> Iterable[cindex.Cursor]:
+    """Yield every CALL_EXPR below `body` (explicit-stack walk)."""
+    stack = [body]
+    while stack:
+        n = stack.pop()
+        try:
+            children = list(n.get_children())
+        except Exception:
+            continue
+        for ch in children:
+            if ch.kind == K.CALL_EXPR:
+                yield ch
+            stack.append(ch)
+
+
+def collect_function_defs_for_tu(
+    tu: cindex.TranslationUnit,
+    definitions: Optional[Iterable[cindex.Cursor]] = None,
+) -> List[FunctionDef]:
+    """Index callable definitions in a TU; pass `definitions` to reuse an existing scan."""
     defs: List[FunctionDef] = []
     seen_keys: Set[str] = set()
 
-    for cur in tu.cursor.walk_preorder():
-        if not _is_callable_definition(cur):
-            continue
-
+    for cur in (iter_callable_definitions(tu.cursor) if definitions is None else definitions):
         function_key = _function_key(cur)
         if function_key in seen_keys:
             continue
@@ -86,7 +104,7 @@ def collect_function_defs_for_tu(tu: cindex.TranslationUnit) -> List[FunctionDef
         file_name = ""
         line = 0
         if loc and getattr(loc, "file", None):
-            file_name = str(Path(loc.file.name).resolve())
+            file_name = _resolved_file_name(loc.file.name)
             line = int(getattr(loc, "line", 0) or 0)
 
         defs.append(
@@ -195,6 +213,7 @@ def build_edge_evidence_rows(query: FunctionDef, edges: Iterable[DetailedEdge])
 
 def collect_callgraph_for_tu(
     tu: cindex.TranslationUnit,
+    definitions: Optional[Iterable[cindex.Cursor]] = None,
 ) -> tuple[list[Edge], set[tuple[str, str, str]]]:
     """
     Collect call edges for a single translational unit.
@@ -205,35 +224,44 @@ def collect_callgraph_for_tu(
     edges: list[Edge] = []
     seen: set[tuple[str, str, str]] = set()
 
-    for cur in tu.cursor.walk_preorder():
-        if _is_callable_definition(cur):
-            caller = _caller_name(cur)
-            body = _function_body_cursor(cur)
-            if not body:
-                continue
+    for cur in (iter_callable_definitions(tu.cursor) if definitions is None else definitions):
+        caller = intern(_caller_name(cur))
+        body = _function_body_cursor(cur)
+        if not body:
+            continue
 
-            stack = [body]
-            while stack:
-                n = stack.pop()
-                try:
-                    for ch in n.get_children():
-                        if ch.kind == K.CALL_EXPR:
-                            callee = _callee_name(ch) or "<indirect>"
-                            loc = _callsite_loc(ch)
-                            edge_key = _simple_edge_identity(caller, callee, loc)
-                            if edge_key not in seen:
-                                seen.add(edge_key)
-                                edges.append(Edge(caller=caller, callee=callee, loc=loc))
-                        stack.append(ch)
-                except Exception:
-                    pass
+        for ch in _iter_body_calls(body):
+            callee = intern(_callee_name(ch) or "<indirect>")
+            loc = _callsite_loc(ch)
+            edge_key = _simple_edge_identity(caller, callee, loc)
+            if edge_key not in seen:
+                seen.add(edge_key)
+                edges.append(Edge(caller=caller, callee=callee, loc=loc))
 
     return edges, seen
 
 
+def _callee_key_for_call(call: cindex.Cursor, callee_name: str) -> str:
+    callee_def = _callee_definition(call)
+    if callee_def:
+        return _function_key(callee_def)
+    # Try to use the USR from the referenced declaration when definition isn't visible
+    callee_ref = getattr(call, "referenced", None)
+    if callee_ref is not None:
+        try:
+            if hasattr(callee_ref, "get_usr"):
+                usr = callee_ref.get_usr()
+                if usr:
+                    return usr
+        except Exception:
+            pass
+    return f"{callee_name}@<unknown>"
+
+
 def collect_callgraph_for_tu_detailed(
     tu: cindex.TranslationUnit,
     translation_unit: str | None = None,
+    definitions: Optional[Iterable[cindex.Cursor]] = None,
 ) -> tuple[list[DetailedEdge], set[tuple[str, str, str]]]:
     """
     Collect call edges for a single translational unit, returning DetailedEdge with caller_key/callee_key
@@ -243,48 +271,24 @@ def collect_callgraph_for_tu_detailed(
     seen: set[tuple[str, str, str]] = set()
     tu_name = str(translation_unit or getattr(tu, "spelling", "") or "")
 
-    for cur in tu.cursor.walk_preorder():
-        if _is_callable_definition(cur):
-            caller_key = _function_key(cur)
-            caller_name = _caller_name(cur)
-            body = _function_body_cursor(cur)
-            if not body:
-                continue
+    for cur in (iter_callable_definitions(tu.cursor) if definitions is None else definitions):
+        caller_key = intern(_function_key(cur))
+        caller_name = intern(_caller_name(cur))
+        body = _function_body_cursor(cur)
+        if not body:
+            continue
 
-            stack = [body]
-            while stack:
-                n = stack.pop()
-                try:
-                    for ch in n.get_children():
-                        if ch.kind == K.CALL_EXPR:
-                            callee_name = _callee_name(ch) or "<indirect>"
-                            callee_def = _callee_definition(ch)
-                            if callee_def:
-                                callee_key = _function_key(callee_def)
-                            else:
-                                # Try to use the USR from the referenced declaration when definition isn't visible
-                                callee_ref = getattr(ch, "referenced", None)
-                                callee_key = None
-                                if callee_ref is not None:
-                                    try:
-                                        if hasattr(callee_ref, "get_usr"):
-                                            usr = callee_ref.get_usr()
-                                            if usr:
-                                                callee_key = usr
-                                    except Exception:
-                                        callee_key = None
-                                if not callee_key:
-                                    callee_key = f"{callee_name}@<unknown>"
-                            loc = _callsite_loc(ch)
-                            edge_key = _detailed_edge_identity(caller_key, callee_key, loc)
-                            if edge_key not in seen:
-                                seen.add(edge_key)
-                                edges.append(DetailedEdge(caller_key=caller_key, callee_key=callee_key,
-                                                          caller=caller_name, callee=callee_name, loc=loc,
-                                                          translation_unit=tu_name))
-                        stack.append(ch)
-                except Exception:
-                    pass
+        # Names and keys repeat across many edges; interning lets them share storage.
+        for ch in _iter_body_calls(body):
+            callee_name = intern(_callee_name(ch) or "<indirect>")
+            callee_key = intern(_callee_key_for_call(ch, callee_name))
+            loc = _callsite_loc(ch)
+            edge_key = _detailed_edge_identity(caller_key, callee_key, loc)
+            if edge_key not in seen:
+                seen.add(edge_key)
+                edges.append(DetailedEdge(caller_key=caller_key, callee_key=callee_key,
+                                          caller=caller_name, callee=callee_name, loc=loc,
+                                          translation_unit=tu_name))
 
     return edges, seen
 
@@ -308,6 +312,10 @@ def _infer_project_function_defs_from_edges(edges: Iterable[DetailedEdge]) -> Li
     return inferred
 
 
+# Callgraph CSVs can run to many MB; write them through a 1 MiB buffer.
+_CSV_BUFFER_SIZE = 1 << 20
+
+
 def write_callgraph(
     outputs_dir: Path,
     edges: list,
@@ -329,44 +337,51 @@ def write_callgraph(
         project_defs_list = _infer_project_function_defs_from_edges(edges)
     project_defs_by_key, project_keys_by_name = build_function_index(project_defs_list)
 
-    # Dedup only truly identical exported rows. When translation-unit identity is present,
-    # preserve repeated header observations across different TUs.
-    dedup_edges: list = []
-    seen_edge_keys: set[tuple[str, str, str, str]] = set()
+    # Project-only aggregates keyed by project function key. Incoming totals feed both
+    # call_counts.csv and function_fan_summary.csv.
+    incoming_callers: Dict[str, Set[str]] = {}
+    incoming_caller_names: Dict[str, Set[str]] = {}
+    incoming_callsites: Dict[str, Set[str]] = {}
+    incoming_tus: Dict[str, Set[str]] = {}
+    incoming_edge_keys: List[str] = []
+
+    outgoing_callees: Dict[str, Set[str]] = {}
+    outgoing_callee_names: Dict[str, Set[str]] = {}
+    outgoing_callsites: Dict[str, Set[str]] = {}
+    outgoing_tus: Dict[str, Set[str]] = {}
+    outgoing_edge_keys: List[str] = []
+
+    exported_tus: List[str] = []
+
+    # Single pass: dedup, resolve project keys and aggregate. Dedup only truly identical
+    # exported rows. When translation-unit identity is present, preserve repeated header
+    # observations across different TUs.
     sample = edges[0] if edges else None
     use_detailed = bool(sample and hasattr(sample, "caller_key"))
-    for e in edges:
-        loc = getattr(e, "loc", None) or "<unknown>"
-        caller_k = getattr(e, "caller_key", None) or getattr(e, "caller", "")
-        callee_k = getattr(e, "callee_key", None) or getattr(e, "callee", "")
-        tu = getattr(e, "translation_unit", None) or ""
-        key = (str(tu), str(loc), str(caller_k), str(callee_k))
+    # Only membership is ever asked of this set, and it holds one entry per exported edge,
+    # so it stores 8-byte digests rather than 4-tuples of strings.
+    seen_edge_keys: set[bytes] = set()
+    blake2b = hashlib.blake2b
+    exported: list = []
+    # The edge type is fixed for the whole list, so pick the field layout once.
+    if use_detailed:
+        edge_fields = (
+            (e.loc or "", e.caller_key or "", e.callee_key or "", e.caller or "", e.callee or "", e.translation_unit or "")
+            for e in edges
+        )
+    else:
+        edge_fields = ((e.loc or "", "", "", e.caller or "", e.callee or "", "") for e in edges)
+    for loc, caller_key, callee_key, caller_name, callee_name, tu in edge_fields:
+        key = blake2b(
+            f"{tu}\0{loc or '<unknown>'}\0{caller_key or caller_name}\0{callee_key or callee_name}".encode(
+                "utf-8", "surrogateescape"
+            ),
+            digest_size=8,
+        ).digest()
         if key in seen_edge_keys:
             continue
         seen_edge_keys.add(key)
-        dedup_edges.append(e)
 
-    if use_detailed:
-        dedup_edges.sort(
-            key=lambda e: (
-                str(getattr(e, "translation_unit", "") or ""),
-                str(getattr(e, "loc", "") or ""),
-                str(getattr(e, "caller_key", "") or ""),
-                str(getattr(e, "callee_key", "") or ""),
-                str(getattr(e, "caller", "") or ""),
-                str(getattr(e, "callee", "") or ""),
-            )
-        )
-    else:
-        dedup_edges.sort(key=lambda e: (str(getattr(e, "loc", "") or ""), str(getattr(e, "caller", "") or ""), str(getattr(e, "callee", "") or "")))
-
-    enriched_edges = []
-    exported_edge_count_by_tu: Dict[str, int] = defaultdict(int)
-    for e in dedup_edges:
-        caller_key = str(getattr(e, "caller_key", "") or "")
-        callee_key = str(getattr(e, "callee_key", "") or "")
-        caller_name = str(getattr(e, "caller", "") or "")
-        callee_name = str(getattr(e, "callee", "") or "")
         caller_project_key, _caller_match = resolve_project_function_key(
             caller_key,
             caller_name,
@@ -379,25 +394,59 @@ def write_callgraph(
             project_defs_by_key,
             project_keys_by_name,
         )
-        tu = str(getattr(e, "translation_unit", "") or "")
+        caller_project_key = caller_project_key or ""
+        callee_project_key = callee_project_key or ""
         if tu:
-            exported_edge_count_by_tu[tu] += 1
-        enriched_edges.append(
-            {
-                "edge": e,
-                "caller_key": caller_key,
-                "caller_name": caller_name,
-                "caller_project_key": caller_project_key or "",
-                "callee_key": callee_key,
-                "callee_name": callee_name,
-                "callee_project_key": callee_project_key or "",
-                "translation_unit": tu,
-                "loc": str(getattr(e, "loc", "") or ""),
-            }
-        )
+            exported_tus.append(tu)
+
+        if callee_project_key:
+            caller_k = caller_project_key or caller_key or caller_name
+            caller_def = project_defs_by_key.get(caller_project_key)
+            caller_label = caller_def.function if caller_def is not None else caller_name
+            incoming_edge_keys.append(callee_project_key)
+            if caller_k:
+                incoming_callers.setdefault(callee_project_key, set()).add(caller_k)
+            if caller_label:
+                incoming_caller_names.setdefault(callee_project_key, set()).add(caller_label)
+            if loc:
+                incoming_callsites.setdefault(callee_project_key, set()).add(loc)
+            if tu:
+                incoming_tus.setdefault(callee_project_key, set()).add(tu)
+
+        if caller_project_key:
+            callee_k = callee_project_key or callee_key or callee_name
+            callee_def = project_defs_by_key.get(callee_project_key)
+            callee_label = callee_def.function if callee_def is not None else callee_name
+            outgoing_edge_keys.append(caller_project_key)
+            if callee_k:
+                outgoing_callees.setdefault(caller_project_key, set()).add(callee_k)
+            if callee_label:
+                outgoing_callee_names.setdefault(caller_project_key, set()).add(callee_label)
+            if loc:
+                outgoing_callsites.setdefault(caller_project_key, set()).add(loc)
+            if tu:
+                outgoing_tus.setdefault(caller_project_key, set()).add(tu)
+
+        exported.append((
+            (tu, loc, caller_key, callee_key, caller_name, callee_name) if use_detailed else (loc, caller_name, callee_name),
+            caller_name,
+            caller_key,
+            caller_project_key,
+            callee_name,
+            callee_key,
+            callee_project_key,
+            loc,
+            tu,
+        ))
+
+    incoming_edge_counts = Counter(incoming_edge_keys)
+    outgoing_edge_counts = Counter(outgoing_edge_keys)
+    exported_edge_count_by_tu = Counter(exported_tus)
+
+    exported.sort(key=lambda rec: rec[0])
 
     # 1) Edges: include optional function keys when available
-    with open(outputs_dir / "callgraph_edges.csv", "w", newline="", encoding="utf-8") as f:
+    with open(outputs_dir / "callgraph_edges.csv", "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         if use_detailed:
             w.writerow([
@@ -415,56 +464,31 @@ def write_callgraph(
                 "callsite_column",
                 "translation_unit",
             ])
-            for row in enriched_edges:
-                callsite_file, callsite_line, callsite_column = split_callsite_loc(row["loc"])
-                w.writerow([
-                    row["caller_name"],
-                    row["caller_key"],
-                    row["caller_project_key"],
-                    "TRUE" if row["caller_project_key"] else "FALSE",
-                    row["callee_name"],
-                    row["callee_key"],
-                    row["callee_project_key"],
-                    "TRUE" if row["callee_project_key"] else "FALSE",
-                    row["loc"],
-                    callsite_file,
-                    callsite_line,
-                    callsite_column,
-                    row["translation_unit"],
-                ])
+            w.writerows([
+                [
+                    caller_name,
+                    caller_key,
+                    caller_project_key,
+                    "TRUE" if caller_project_key else "FALSE",
+                    callee_name,
+                    callee_key,
+                    callee_project_key,
+                    "TRUE" if callee_project_key else "FALSE",
+                    loc,
+                    *split_callsite_loc(loc),
+                    tu,
+                ]
+                for _sk, caller_name, caller_key, caller_project_key, callee_name, callee_key, callee_project_key, loc, tu in exported
+            ])
         else:
             w.writerow(["caller", "callee", "callsite", "callsite_file", "callsite_line", "callsite_column"])
-            for e in dedup_edges:
-                callsite_file, callsite_line, callsite_column = split_callsite_loc(getattr(e, "loc", "") or "")
-                w.writerow([e.caller, e.callee, e.loc, callsite_file, callsite_line, callsite_column])
-
-    incoming_subject_edges = [row for row in enriched_edges if row["callee_project_key"]]
-    outgoing_subject_edges = [row for row in enriched_edges if row["caller_project_key"]]
-
-    # 2) Aggregate project-only incoming counts by callee.
-    counts: Dict[str, int] = defaultdict(int)
-    callers_by_callee: Dict[str, Set[str]] = defaultdict(set)
-    caller_names_by_callee: Dict[str, Set[str]] = defaultdict(set)
-    callsites_by_callee: Dict[str, Set[str]] = defaultdict(set)
-    tus_by_callee: Dict[str, Set[str]] = defaultdict(set)
-    for row in incoming_subject_edges:
-        callee_k = row["callee_project_key"]
-        caller_k = row["caller_project_key"] or row["caller_key"] or row["caller_name"]
-        caller_def = project_defs_by_key.get(row["caller_project_key"])
-        caller_name = caller_def.function if caller_def is not None else row["caller_name"]
-        loc = row["loc"]
-        tu = row["translation_unit"]
-        counts[callee_k] += 1
-        if caller_k:
-            callers_by_callee[callee_k].add(caller_k)
-        if caller_name:
-            caller_names_by_callee[callee_k].add(caller_name)
-        if loc:
-            callsites_by_callee[callee_k].add(str(loc))
-        if tu:
-            tus_by_callee[callee_k].add(str(tu))
+            w.writerows([
+                [caller_name, callee_name, loc, *split_callsite_loc(loc)]
+                for _sk, caller_name, _ck, _cpk, callee_name, _ek, _epk, loc, _tu in exported
+            ])
 
-    with open(outputs_dir / "call_counts.csv", "w", newline="", encoding="utf-8") as f:
+    # 2) Project-only incoming counts by callee.
+    with open(outputs_dir / "call_counts.csv", "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         w.writerow([
             "callee_name",
@@ -482,34 +506,35 @@ def write_callgraph(
         ])
         if unique_callers:
             items = sorted(
-                counts.items(),
+                incoming_edge_counts.items(),
                 key=lambda x: (
-                    -len(callers_by_callee.get(x[0], set())),
+                    -len(incoming_callers.get(x[0], set())),
                     -x[1],
                     x[0],
                 ),
             )
         else:
             items = sorted(
-                counts.items(),
+                incoming_edge_counts.items(),
                 key=lambda x: (
                     -x[1],
-                    -len(callers_by_callee.get(x[0], set())),
+                    -len(incoming_callers.get(x[0], set())),
                     x[0],
                 ),
             )
+        count_rows = []
         for callee_k, n in items:
-            caller_keys = sorted(callers_by_callee.get(callee_k, set()))
-            caller_names = sorted(caller_names_by_callee.get(callee_k, set()))
-            translation_units = sorted(tus_by_callee.get(callee_k, set()))
+            caller_keys = sorted(incoming_callers.get(callee_k, set()))
+            caller_names = sorted(incoming_caller_names.get(callee_k, set()))
+            translation_units = sorted(incoming_tus.get(callee_k, set()))
             callee_def = project_defs_by_key.get(callee_k)
-            w.writerow([
+            count_rows.append([
                 callee_def.function if callee_def is not None else "",
                 callee_k,
                 callee_def.file if callee_def is not None else "",
                 callee_def.line if callee_def is not None else 0,
                 n,
-                len(callsites_by_callee.get(callee_k, set())),
+                len(incoming_callsites.get(callee_k, set())),
                 len(translation_units),
                 len(caller_keys),
                 len(caller_names),
@@ -517,58 +542,9 @@ def write_callgraph(
                 ";".join(caller_names),
                 ";".join(translation_units),
             ])
+        w.writerows(count_rows)
 
-    # 3) Build a project-only symmetric per-function summary.
-    incoming_callers: Dict[str, Set[str]] = defaultdict(set)
-    incoming_caller_names: Dict[str, Set[str]] = defaultdict(set)
-    incoming_callsites: Dict[str, Set[str]] = defaultdict(set)
-    incoming_tus: Dict[str, Set[str]] = defaultdict(set)
-    incoming_edge_counts: Dict[str, int] = defaultdict(int)
-
-    outgoing_callees: Dict[str, Set[str]] = defaultdict(set)
-    outgoing_callee_names: Dict[str, Set[str]] = defaultdict(set)
-    outgoing_callsites: Dict[str, Set[str]] = defaultdict(set)
-    outgoing_tus: Dict[str, Set[str]] = defaultdict(set)
-    outgoing_edge_counts: Dict[str, int] = defaultdict(int)
-
-    for row in incoming_subject_edges:
-        callee_k = row["callee_project_key"]
-        caller_k = row["caller_project_key"] or row["caller_key"] or row["caller_name"]
-        caller_def = project_defs_by_key.get(row["caller_project_key"])
-        caller_name = caller_def.function if caller_def is not None else row["caller_name"]
-        loc = row["loc"]
-        tu = row["translation_unit"]
-
-        incoming_edge_counts[callee_k] += 1
-        if caller_k:
-            incoming_callers[callee_k].add(caller_k)
-        if caller_name:
-            incoming_caller_names[callee_k].add(caller_name)
-        if loc:
-            incoming_callsites[callee_k].add(loc)
-        if tu:
-            incoming_tus[callee_k].add(tu)
-
-    for row in outgoing_subject_edges:
-        caller_k = row["caller_project_key"]
-        callee_k = row["callee_project_key"] or row["callee_key"] or row["callee_name"]
-        loc = row["loc"]
-        tu = row["translation_unit"]
-        callee_def = project_defs_by_key.get(row["callee_project_key"])
-        callee_name = callee_def.function if callee_def is not None else row["callee_name"]
-
-        outgoing_edge_counts[caller_k] += 1
-
-        if callee_k:
-            outgoing_callees[caller_k].add(callee_k)
-
-        if callee_name:
-            outgoing_callee_names[caller_k].add(callee_name)
-        if loc:
-            outgoing_callsites[caller_k].add(loc)
-        if tu:
-            outgoing_tus[caller_k].add(tu)
-
+    # 3) Project-only symmetric per-function summary.
     summary_defs = sorted(
         project_defs_by_key.values(),
         key=lambda fd: (
@@ -581,7 +557,7 @@ def write_callgraph(
         ),
     )
 
-    with open(outputs_dir / "function_fan_summary.csv", "w", newline="", encoding="utf-8") as f:
+    with open(outputs_dir / "function_fan_summary.csv", "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         w.writerow([
             "function",
@@ -603,6 +579,7 @@ def write_callgraph(
             "incoming_translation_units",
             "outgoing_translation_units",
         ])
+        summary_rows = []
         for fn_def in summary_defs:
             key = fn_def.function_key
             caller_keys = sorted(incoming_callers.get(key, set()))
@@ -611,7 +588,7 @@ def write_callgraph(
             callee_names = sorted(outgoing_callee_names.get(key, set()))
             incoming_translation_units = sorted(incoming_tus.get(key, set()))
             outgoing_translation_units = sorted(outgoing_tus.get(key, set()))
-            w.writerow([
+            summary_rows.append([
                 fn_def.function,
                 key,
                 fn_def.file,
@@ -631,6 +608,7 @@ def write_callgraph(
                 ";".join(incoming_translation_units),
                 ";".join(outgoing_translation_units),
             ])
+        w.writerows(summary_rows)
 
     if tu_reports is None:
         return
@@ -641,7 +619,7 @@ def write_callgraph(
         for report in tu_reports
     }
     tu_keys = sorted(set(report_by_tu.keys()) | set(exported_edge_count_by_tu.keys()))
-    with open(outputs_dir / "translation_units.csv", "w", newline="", encoding="utf-8") as f:
+    with open(outputs_dir / "translation_units.csv", "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         w.writerow([
             "translation_unit",
@@ -5,17 +5,41 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
 
 import yaml
 
 
+# Backreferences are numbered per pattern, so such patterns cannot be OR-ed together.
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _union_regex(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+    """One pattern equivalent to any(p.search(...)), or None if it cannot be built safely."""
+    if not patterns:
+        return None
+    for p in patterns:
+        # Inline flags (e.g. "(?i)") apply to the whole union, so keep those separate too.
+        if not isinstance(p.pattern, str) or p.flags & ~re.UNICODE or _BACKREF_RE.search(p.pattern):
+            return None
+    try:
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+    except Exception:
+        return None
+
+
 @dataclass
 class HelperConfig:
     benign: Set[str]
     benign_regex: List[re.Pattern]
     helpers: Set[str]
     helpers_regex: List[re.Pattern]
+    _benign_union: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    _helpers_union: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._benign_union = _union_regex(self.benign_regex)
+        self._helpers_union = _union_regex(self.helpers_regex)
 
     def any_match(self, name: str, which: str = "helpers") -> bool:
         """
@@ -24,20 +48,28 @@ class HelperConfig:
         if which == "benign":
             if name in self.benign:
                 return True
+            if self._benign_union is not None:
+                return self._benign_union.search(name) is not None
             return any(r.search(name) for r in self.benign_regex)
         if name in self.helpers:
             return True
+        if self._helpers_union is not None:
+            return self._helpers_union.search(name) is not None
         return any(r.search(name) for r in self.helpers_regex)
 
 
 @dataclass
 class ApiCatalog:
-    """API catalog loaded from YAML."""
-    libc: Set[str]
-    syscalls: Set[str]
-    target_names: Set[str]
+    """API catalog loaded from YAML.
+
+    The name sets are frozen: analysis memoizes results per target-set object,
+    so narrowing the targets means assigning a new set, never mutating one.
+    """
+    libc: FrozenSet[str]
+    syscalls: FrozenSet[str]
+    target_names: FrozenSet[str]
     helpers: HelperConfig
-    thin_aliases: Set[str] = field(default_factory=set)
+    thin_aliases: FrozenSet[str] = frozenset()
     categories: Dict[str, Set[str]] = field(default_factory=dict)
     name_to_category: Dict[str, str] = field(default_factory=dict)
 
@@ -182,11 +214,11 @@ def load_api_catalog(yaml_path: Path) -> ApiCatalog:
         target_names = set().union(libc, syscalls)
 
     return ApiCatalog(
-        libc=libc,
-        syscalls=syscalls,
-        target_names=target_names,
+        libc=frozenset(libc),
+        syscalls=frozenset(syscalls),
+        target_names=frozenset(target_names),
         helpers=helpers,
-        thin_aliases=thin_aliases,
+        thin_aliases=frozenset(thin_aliases),
         categories=categories,
         name_to_category=name_to_category,
     )
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
 import sys
-from pathlib import Path
 from typing import Optional
 
 from cwrappers.shared.log import eprint
@@ -17,11 +17,32 @@ def _debug(msg: str) -> None:
         eprint(msg)
 
 
-try:
-    from clang import cindex
-except Exception as e:
-    print("ERROR: failed to import clang.cindex. Try `pip install clang`.", file=sys.stderr)
-    raise
+# clang.cindex is imported and libclang configured on first use (see get_cindex),
+# so help output and non-parsing commands never pay for it.
+_CINDEX = None
+
+
+def get_cindex():
+    """Return the clang.cindex module, importing it and locating libclang on first call."""
+    global _CINDEX
+    if _CINDEX is None:
+        try:
+            from clang import cindex as _cindex
+        except Exception:
+            print("ERROR: failed to import clang.cindex. Try `pip install clang`.", file=sys.stderr)
+            raise
+        _CINDEX = _cindex
+        _init_libclang()
+    return _CINDEX
+
+
+def __getattr__(name: str):
+    # PEP 562: `from cwrappers.finder.clang_bootstrap import cindex, K` stays valid.
+    if name == "cindex":
+        return get_cindex()
+    if name == "K":
+        return get_cindex().CursorKind
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Helper used by the clang-args sanitizer to detect existing -I entries.
 def _include_already_present(args: list[str], include_path: str) -> bool:
@@ -38,8 +59,36 @@ def _include_already_present(args: list[str], include_path: str) -> bool:
     return False
 
 
+def _libclang_cache_file() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cwrappers", "libclang_path")
+
+
+def _read_cached_libclang() -> Optional[str]:
+    """Return the libclang path recorded by a previous run, if it still exists."""
+    try:
+        with open(_libclang_cache_file(), encoding="utf-8") as fh:
+            path = fh.read().strip()
+    except OSError:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def _remember_libclang(path: str) -> None:
+    if not os.path.isfile(path):
+        return
+    cache_file = _libclang_cache_file()
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as fh:
+            fh.write(path + "\n")
+    except OSError:
+        pass
+
+
 # Robust libclang loader: prefer LIBCLANG_PATH, then common distro locations.
 def _init_libclang() -> None:
+    cindex = _CINDEX
     tried: list[str] = []
 
     def _try_set(libpath: str) -> bool:
@@ -47,11 +96,11 @@ def _init_libclang() -> None:
             if not libpath:
                 return False
             libfile = libpath
-            if Path(libfile).is_dir():
+            if os.path.isdir(libfile):
                 candidates = [
-                    str(Path(libfile) / "libclang.so"),
-                    str(Path(libfile) / "libclang.so.1"),
-                    str(Path(libfile) / "libclang-20.so"),
+                    os.path.join(libfile, "libclang.so"),
+                    os.path.join(libfile, "libclang.so.1"),
+                    os.path.join(libfile, "libclang-20.so"),
                 ]
             else:
                 candidates = [libfile]
@@ -82,7 +131,12 @@ def _init_libclang() -> None:
         except Exception:
             tried.append(libfile)
 
-    # 3) common system locations for libclang
+    # 3) libclang found by a previous run; skips the directory and ldconfig scans
+    cached = _read_cached_libclang()
+    if cached and _try_set(cached):
+        return
+
+    # 4) common system locations for libclang
     common_dirs = [
         "/usr/lib/llvm-20/lib",
         "/usr/lib/llvm-19/lib",
@@ -93,18 +147,24 @@ def _init_libclang() -> None:
     ]
     for d in common_dirs:
         if _try_set(d):
+            _remember_libclang(tried[-1])
             return
 
-    # 4) attempt to find libclang via ldconfig
+    # 5) attempt to find libclang via ldconfig
     try:
-        out = subprocess.check_output(["/sbin/ldconfig", "-p"], stderr=subprocess.DEVNULL, text=True)
-        for line in out.splitlines():
-            if "libclang.so" in line:
-                parts = line.strip().split(" => ")
-                if len(parts) == 2:
-                    candidate = parts[1]
-                    if _try_set(candidate):
-                        return
+        # Stream the cache listing and stop at the first usable entry.
+        with subprocess.Popen(
+            ["/sbin/ldconfig", "-p"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ) as proc:
+            for line in proc.stdout:
+                if "libclang.so" in line:
+                    parts = line.strip().split(" => ")
+                    if len(parts) == 2:
+                        candidate = parts[1]
+                        if _try_set(candidate):
+                            proc.kill()
+                            _remember_libclang(tried[-1])
+                            return
     except Exception:
         pass
 
@@ -116,16 +176,18 @@ def _init_libclang() -> None:
     eprint("[warn] libclang not set. Tried:", tried)
 
 
+@functools.lru_cache(maxsize=None)
+def _which_cached(name: str) -> Optional[str]:
+    """shutil.which(name), looked up once per process."""
+    return shutil.which(name)
+
+
 def _locate_clang_binary() -> Optional[str]:
     """Return a clang binary path (CLANG_BIN env override, then common names) or None."""
     try:
-        return os.environ.get("CLANG_BIN") or shutil.which("clang") or shutil.which("clang-20") or shutil.which("clang-19")
+        return os.environ.get("CLANG_BIN") or _which_cached("clang") or _which_cached("clang-20") or _which_cached("clang-19")
     except Exception:
         return os.environ.get("CLANG_BIN")
 
 
-_init_libclang()
-
-K = cindex.CursorKind
-
-__all__ = ["cindex", "K", "_include_already_present", "_locate_clang_binary"]
+__all__ = ["cindex", "K", "get_cindex", "_include_already_present", "_locate_clang_binary"]
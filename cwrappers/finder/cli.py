@@ -3,12 +3,21 @@
 from __future__ import annotations
 
 import argparse
-from typing import List
 
-from cwrappers.finder.runner import run_finder
+_MODE_CHOICES = (
+    "relaxed",
+    "accurate",
+    "all",
+    "single",
+    "perpath",
+    "perpath_relaxed",
+    "perpath_strict_plus",
+)
+_OUTPUT_CHOICES = ("csv", "json", "jsonl")
+_THIN_ALIAS_CHOICES = ("default", "direct-only", "allow-1-hop")
 
 
-def parse_args(argv: List[str] | None = None):
+def parse_args(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Find libc/syscall wrapper candidates")
     parser.add_argument(
         "--repo",
@@ -50,15 +59,7 @@ def parse_args(argv: List[str] | None = None):
     parser.add_argument(
         "--mode",
         type=str,
-        choices=[
-            "relaxed",
-            "accurate",
-            "all",
-            "single",
-            "perpath",
-            "perpath_relaxed",
-            "perpath_strict_plus",
-        ],
+        choices=_MODE_CHOICES,
         default="all",
         help=(
             "Mode: 'relaxed' (broader, higher recall), 'accurate' (low-FP), or 'all' (include every function; "
@@ -69,7 +70,7 @@ def parse_args(argv: List[str] | None = None):
     parser.add_argument(
         "--output",
         type=str,
-        choices=["csv", "json", "jsonl"],
+        choices=_OUTPUT_CHOICES,
         default="csv",
         help="Output format.",
     )
@@ -91,7 +92,27 @@ def parse_args(argv: List[str] | None = None):
         "-j",
         type=int,
         default=1,
-        help="Number of processes (1 = no multiprocessing).",
+        help="Number of processes (1 = no multiprocessing, 0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--tu-cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help=(
+            "Reuse parsed translation units across runs from an on-disk AST cache "
+            "($XDG_CACHE_HOME/cwrappers/tu). Entries are invalidated when the source, "
+            "any included header, or the compile flags change."
+        ),
+    )
+    parser.add_argument(
+        "--pch-common-header",
+        type=str,
+        default=None,
+        help=(
+            "Precompile this header once per distinct set of compile flags and pass it to "
+            "each translation unit with -include-pch. The header should have include guards; "
+            "it is included in every TU that shares a flag set."
+        ),
     )
     parser.add_argument(
         "--verbose",
@@ -170,7 +191,7 @@ def parse_args(argv: List[str] | None = None):
     parser.add_argument(
         "--treat-thin-alias",
         type=str,
-        choices=["default", "direct-only", "allow-1-hop"],
+        choices=_THIN_ALIAS_CHOICES,
         default="default",
         help=(
             "Accurate-mode policy for categories.thin_alias APIs: "
@@ -182,9 +203,12 @@ def parse_args(argv: List[str] | None = None):
     return parser.parse_args(argv)
 
 
-def main(argv: List[str] | None = None) -> int:
+def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
 
+    # Imported after argument parsing so --help doesn't load libclang.
+    from cwrappers.finder.runner import run_finder
+
     # Backward/ergonomic alias: --repo behaves like --project-root + --project-only.
     if hasattr(args, "repo") and args.repo:
         existing_roots = list(getattr(args, "project_root", []) or [])
@@ -2,31 +2,100 @@
 
 from __future__ import annotations
 
+import functools
+import glob
 import json
 import os
+import re
 import shlex
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import ijson  # type: ignore
+except Exception:
+    ijson = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
 
-from cwrappers.finder.clang_bootstrap import _include_already_present
 from cwrappers.shared.log import eprint
 
 # Optional list of (old_prefix, new_prefix) mappings applied to compile_commands
 PATH_MAPS: List[Tuple[str, str]] = []
 
 
-def load_compile_commands(cc_path: Path) -> List[dict]:
+def _iter_entries(cc_path: Path) -> Iterator[dict]:
+    if ijson is not None:
+        with open(cc_path, "rb") as fh:
+            head = fh.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")
+            if head and not head.startswith(b"["):
+                raise ValueError("compile_commands.json root must be a list")
+            fh.seek(0)
+            yield from ijson.items(fh, "item", use_float=True)
+        return
+    raw = Path(cc_path).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    if not isinstance(data, list):
+        raise ValueError("compile_commands.json root must be a list")
+    yield from data
+
+
+def iter_compile_commands(cc_path: Path) -> Iterator[dict]:
+    """Yield compile_commands.json entries, streaming with ijson (or orjson) when installed."""
     try:
-        text = cc_path.read_text(encoding="utf-8")
-        data = json.loads(text)
-        if not isinstance(data, list):
-            raise ValueError("compile_commands.json root must be a list")
-        return data
+        yield from _iter_entries(cc_path)
     except Exception as e:
         eprint(f"ERROR: Failed to read {cc_path}: {e}")
         raise SystemExit(1)
 
 
+def load_compile_commands(cc_path: Path) -> List[dict]:
+    return list(iter_compile_commands(cc_path))
+
+
+# POSIX shlex.split() word syntax: unquoted runs, '...', "..." (with \" and \\
+# escapes) and backslash-escaped characters, separated by shlex whitespace.
+_SHELL_PIECE = r"""[^ \t\r\n'"\\]+|'[^']*'|"(?:[^"\\]|\\.)*"|\\."""
+_SHELL_WORD_RE = re.compile(r"(?:" + _SHELL_PIECE + r")+", re.DOTALL)
+_SHELL_PIECE_RE = re.compile(_SHELL_PIECE, re.DOTALL)
+_SHELL_DQ_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def _unquote_shell_piece(piece: str) -> str:
+    head = piece[0]
+    if head == "'":
+        return piece[1:-1]
+    if head == '"':
+        return _SHELL_DQ_ESCAPE_RE.sub(
+            lambda m: m.group(1) if m.group(1) in '"\\' else m.group(0), piece[1:-1]
+        )
+    if head == "\\":
+        return piece[1:]
+    return piece
+
+
+def _fast_shell_split(cmd: str) -> List[str]:
+    """shlex.split(cmd) equivalent; scans in C and falls back to shlex on bad quoting."""
+    words: List[str] = []
+    pos = 0
+    for m in _SHELL_WORD_RE.finditer(cmd):
+        if cmd[pos:m.start()].strip(" \t\r\n"):
+            return shlex.split(cmd)
+        word = m.group(0)
+        if "'" in word or '"' in word or "\\" in word:
+            word = "".join(_unquote_shell_piece(p) for p in _SHELL_PIECE_RE.findall(word))
+        words.append(word)
+        pos = m.end()
+    if cmd[pos:].strip(" \t\r\n"):
+        return shlex.split(cmd)
+    return words
+
+
 def _tokenize_command_or_args(entry: dict) -> List[str]:
     """Return a token list from either 'arguments' (preferred) or 'command'."""
     args = entry.get("arguments")
@@ -34,13 +103,23 @@ def _tokenize_command_or_args(entry: dict) -> List[str]:
         return list(args)
     cmd = entry.get("command")
     if isinstance(cmd, str):
-        return shlex.split(cmd)
+        return _fast_shell_split(cmd)
     return []
 
 
+_COMPILER_NAMES = frozenset({
+    "clang", "clang-20", "clang-19", "clang-18", "clang-17", "clang-16",
+    "gcc", "cc", "c99", "c11",
+})
+
+_UNSUPPORTED_WARNINGS = frozenset({
+    "-Wno-missing-attributes",
+    "-Wno-unknown-warning-option",
+})
+
+
 def _looks_like_compiler(tok: str) -> bool:
-    base = os.path.basename(tok)
-    return base in {"cc", "gcc", "clang", "clang-16", "clang-17", "clang-18", "clang-19", "clang-20", "c99", "c11"}
+    return os.path.basename(tok) in _COMPILER_NAMES
 
 
 def _is_output_flag(tok: str) -> bool:
@@ -60,11 +139,7 @@ def _is_unsupported_warning(tok: str) -> bool:
         return False
     if tok.startswith("-Wno-"):
         return True
-    bad_exact = {
-        "-Wno-missing-attributes",
-        "-Wno-unknown-warning-option",
-    }
-    return tok in bad_exact
+    return tok in _UNSUPPORTED_WARNINGS
 
 
 def _abs_if_needed(p: str, base: Path) -> str:
@@ -75,6 +150,135 @@ def _abs_if_needed(p: str, base: Path) -> str:
         return p
 
 
+_DROP_EXACT = frozenset({
+    "-c", "-E", "-S",
+    "-pipe",
+    "-static", "-shared", "-rdynamic",
+    "-s",
+    "-g", "-ggdb", "-gsplit-dwarf",
+    "-save-temps",
+})
+_DROP_PREFIXES = (
+    "-Wl,", "-Xlinker",
+    "-l", "-L",
+    "-fuse-ld", "-T", "-u",
+    "-flto", "-fwhole-program-vtables",
+    "-fprofile", "-fcoverage", "--coverage", "-fprofile-",
+    "-fsanitize", "-fno-sanitize",
+    "-fmodules", "-fmodule-file=", "-fmodule-map-file=", "-fmodules-cache-path",
+    "-W",
+)
+_SKIP_SUFFIXES = (
+    ".o", ".obj", ".lo", ".a", ".lib", ".so", ".dylib", ".bc", ".ll",
+    ".c", ".cc", ".cpp", ".cxx", ".c++", ".m", ".mm",
+)
+# Dropped tokens: linker/profiling/module/warning flags by prefix, and
+# objects, libraries and source files by (case-insensitive) suffix.
+_SKIP_TOK_RE = re.compile(
+    r"\A(?:" + "|".join(map(re.escape, _DROP_PREFIXES)) + r")"
+    r"|(?i:" + "|".join(map(re.escape, _SKIP_SUFFIXES)) + r")\Z"
+)
+
+_PRESERVE_EXACT = frozenset({
+    "-pthread",
+    "-ansi",
+    "-fsigned-char",
+    "-pedantic",
+    "-nostdinc",
+    "-nostdinc++",
+    "-nostdlibinc",
+})
+_PRESERVE_PREFIXES = ("-D", "-U", "-m", "-f", "-stdlib=", "-O")
+
+_PAIR_FLAGS = frozenset({
+    "-I", "-isystem", "-iquote", "-idirafter",
+    "-include", "-imacros",
+    "-o", "-MF", "-MT", "-MQ", "-MJ",
+    "-x", "-isysroot", "--sysroot",
+    "-resource-dir", "-target",
+    "-D", "-U",
+    "-std", "-stdlib",
+    "--gcc-toolchain", "-B",
+})
+_OUTPUT_FLAGS = frozenset({"-o", "-MF", "-MT", "-MQ", "-MJ"})
+_PATH_VALUE_FLAGS = frozenset({
+    "-I", "-isystem", "-iquote", "-idirafter", "-include", "-imacros",
+    "-isysroot", "--sysroot", "--gcc-toolchain", "-B",
+})
+# Joined forms: "-I<dir>" etc., and "<flag>=<path>".
+_JOINED_INCLUDE_FLAGS = ("-I", "-isystem", "-iquote", "-idirafter")
+_JOINED_PATH_FLAGS = ("-isysroot=", "--sysroot=", "-resource-dir=", "--gcc-toolchain=")
+
+
+# Token kinds for the sanitizer loop, in its precedence order.
+_TOK_DROP, _TOK_PAIR, _TOK_STD, _TOK_JOINED_INCLUDE, _TOK_JOINED_PATH, _TOK_KEEP = range(6)
+
+
+def _classify_token(tok: str) -> int:
+    if tok in _DROP_EXACT or _SKIP_TOK_RE.search(tok):
+        return _TOK_DROP
+    if tok in _PAIR_FLAGS:
+        return _TOK_PAIR
+    if tok.startswith("-std="):
+        return _TOK_STD
+    if tok.startswith(_JOINED_INCLUDE_FLAGS):
+        return _TOK_JOINED_INCLUDE
+    if tok.startswith(_JOINED_PATH_FLAGS):
+        return _TOK_JOINED_PATH
+    if tok in _PRESERVE_EXACT or tok.startswith(_PRESERVE_PREFIXES):
+        return _TOK_KEEP
+    return _TOK_DROP
+
+
+# Flags repeat across entries, so each distinct token is classified once.
+# Bounded because one-off tokens (source and object names) never repeat.
+_TOKEN_KIND_CACHE_MAX = 1 << 16
+_token_kinds: Dict[str, int] = {}
+
+
+@functools.lru_cache(maxsize=8192)
+def _resolve_cached(path: str) -> str:
+    """str(Path(path).resolve()), memoized; include and entry dirs repeat across entries."""
+    return os.path.realpath(path)
+
+
+def _clean_abs_path(path: str) -> str:
+    """str(Path(path)) for an absolute path, skipping Path for already-clean strings."""
+    if "//" in path[1:] or "/./" in path or (len(path) > 1 and path.endswith(("/", "/."))):
+        return str(Path(path))
+    return path
+
+
+@functools.lru_cache(maxsize=1024)
+def _isdir_cached(path: str) -> bool:
+    return os.path.isdir(path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _exists_cached(path: str) -> bool:
+    return os.path.exists(path)
+
+
+def _clear_path_caches() -> None:
+    _resolve_cached.cache_clear()
+    _isdir_cached.cache_clear()
+    _exists_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _discover_resource_dir(env_rd: Optional[str]) -> Optional[str]:
+    """Pick a clang resource dir (one with include/stddef.h); globbed once per process."""
+    if env_rd and _exists_cached(os.path.join(env_rd, "include", "stddef.h")):
+        return env_rd
+    candidates = []
+    candidates += sorted(glob.glob("/usr/lib/llvm-*/lib/clang/*"), reverse=True)
+    candidates += sorted(glob.glob("/usr/lib/clang/*"), reverse=True)
+    for rd in candidates:
+        if _exists_cached(os.path.join(rd, "include", "stddef.h")):
+            return rd
+    return None
+
+
 def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
     """
     Minimal, strict sanitizer for libclang parse args.
@@ -84,10 +288,11 @@ def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
     def _split_response_file(tok: str):
         if not tok.startswith("@"):
             return [tok]
-        p = Path(tok[1:])
+        p = tok[1:]
         try:
-            if p.is_file() and p.stat().st_size <= 2 * 1024 * 1024:
-                return shlex.split(p.read_text(errors="ignore"))
+            if os.path.isfile(p) and os.path.getsize(p) <= 2 * 1024 * 1024:
+                with open(p, errors="ignore") as fh:
+                    return _fast_shell_split(fh.read())
         except Exception:
             pass
         return []
@@ -96,65 +301,12 @@ def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
         try:
             if candidate is None:
                 return ""
-            p = Path(candidate)
-            if not p.is_absolute():
-                p = (Path(base_dir) / p).resolve()
-            return str(p)
+            if not os.path.isabs(candidate):
+                return _resolve_cached(os.path.join(base_dir, candidate))
+            return _clean_abs_path(candidate)
         except Exception:
             return candidate or ""
 
-    def _is_obj_or_lib(tok: str) -> bool:
-        lo = tok.lower()
-        return lo.endswith((".o", ".obj", ".lo", ".a", ".lib", ".so", ".dylib", ".bc", ".ll"))
-
-    def _is_source_file(tok: str) -> bool:
-        lo = tok.lower()
-        return lo.endswith((".c", ".cc", ".cpp", ".cxx", ".c++", ".m", ".mm"))
-
-    def _is_warning(tok: str) -> bool:
-        if tok.startswith("-Wl,"):
-            return False
-        return tok.startswith("-W")
-
-    DROP_EXACT = {
-        "-c", "-E", "-S",
-        "-pipe",
-        "-static", "-shared", "-rdynamic",
-        "-s",
-        "-g", "-ggdb", "-gsplit-dwarf",
-        "-save-temps",
-    }
-    DROP_PREFIXES = (
-        "-Wl,", "-Xlinker",
-        "-l", "-L",
-        "-fuse-ld", "-T", "-u",
-        "-flto", "-fwhole-program-vtables",
-        "-fprofile", "-fcoverage", "--coverage", "-fprofile-",
-        "-fsanitize", "-fno-sanitize",
-        "-fmodules", "-fmodule-file=", "-fmodule-map-file=", "-fmodules-cache-path",
-    )
-
-    PRESERVE_EXACT = {
-        "-pthread",
-        "-ansi",
-        "-fsigned-char",
-        "-pedantic",
-        "-nostdinc",
-        "-nostdinc++",
-        "-nostdlibinc",
-    }
-
-    PAIR_FLAGS = {
-        "-I", "-isystem", "-iquote", "-idirafter",
-        "-include", "-imacros",
-        "-o", "-MF", "-MT", "-MQ", "-MJ",
-        "-x", "-isysroot", "--sysroot",
-        "-resource-dir", "-target",
-        "-D", "-U",
-        "-std", "-stdlib",
-        "--gcc-toolchain", "-B",
-    }
-
     tokens = []
     for t in (raw_args or []):
         tokens.extend(_split_response_file(t))
@@ -169,28 +321,30 @@ def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
     while i < n:
         tok = tokens[i]
 
-        if i == 0 and (not tok.startswith("-")) and (os.path.basename(tok) in {"clang", "clang-20", "clang-19", "clang-18", "clang-17", "clang-16", "gcc", "cc", "c99", "c11"}):
+        if i == 0 and (not tok.startswith("-")) and (os.path.basename(tok) in _COMPILER_NAMES):
             i += 1
             continue
 
-        if tok in DROP_EXACT:
-            i += 1
-            continue
-        if _is_obj_or_lib(tok) or _is_source_file(tok):
-            i += 1
-            continue
-        if any(tok.startswith(pref) for pref in DROP_PREFIXES):
+        kind = _token_kinds.get(tok)
+        if kind is None:
+            kind = _classify_token(tok)
+            if len(_token_kinds) < _TOKEN_KIND_CACHE_MAX:
+                _token_kinds[tok] = kind
+
+        if kind == _TOK_DROP:
             i += 1
             continue
-        if _is_warning(tok):
+
+        if kind == _TOK_KEEP:
+            filtered.append(tok)
             i += 1
             continue
 
-        if tok in PAIR_FLAGS:
+        if kind == _TOK_PAIR:
             has_value = (i + 1 < n) and (not tokens[i + 1].startswith("-"))
             val = tokens[i + 1] if has_value else None
 
-            if tok in {"-o", "-MF", "-MT", "-MQ", "-MJ"}:
+            if tok in _OUTPUT_FLAGS:
                 i += 1 + (1 if has_value else 0)
                 continue
 
@@ -200,7 +354,7 @@ def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
                 continue
 
             abs_val = val
-            if tok in {"-I", "-isystem", "-iquote", "-idirafter", "-include", "-imacros", "-isysroot", "--sysroot", "--gcc-toolchain", "-B"}:
+            if tok in _PATH_VALUE_FLAGS:
                 abs_val = _abspath(val, entry_dir)
 
             if tok == "-x":
@@ -215,180 +369,88 @@ def _sanitize_clang_args_for_libclang(raw_args, src_path, entry_dir):
             i += 2
             continue
 
-        if tok.startswith("-std="):
+        if kind == _TOK_STD:
             saw_std = True
             filtered.append(tok)
             i += 1
             continue
 
-        if tok.startswith("-I") and tok != "-I":
-            val = tok[2:]
-            if val:
-                filtered.append("-I")
-                filtered.append(_abspath(val, entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-isystem") and tok != "-isystem":
-            val = tok[len("-isystem"):]
-            if val:
-                filtered.append("-isystem")
-                filtered.append(_abspath(val, entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-iquote") and tok != "-iquote":
-            val = tok[len("-iquote"):]
-            if val:
-                filtered.append("-iquote")
-                filtered.append(_abspath(val, entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-idirafter") and tok != "-idirafter":
-            val = tok[len("-idirafter"):]
+        if kind == _TOK_JOINED_INCLUDE:
+            for flag in _JOINED_INCLUDE_FLAGS:
+                if tok.startswith(flag):
+                    break
+            val = tok[len(flag):]
             if val:
-                filtered.append("-idirafter")
+                filtered.append(flag)
                 filtered.append(_abspath(val, entry_dir))
             i += 1
             continue
 
-        if tok.startswith("-isysroot="):
-            filtered.append("-isysroot=" + _abspath(tok.split("=", 1)[1], entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("--sysroot="):
-            filtered.append("--sysroot=" + _abspath(tok.split("=", 1)[1], entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-resource-dir="):
+        # _TOK_JOINED_PATH
+        flag, _, val = tok.partition("=")
+        if flag == "-resource-dir":
             saw_resource_dir = True
-            filtered.append("-resource-dir=" + _abspath(tok.split("=", 1)[1], entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-D"):
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok.startswith("-U"):
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok in PRESERVE_EXACT:
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok.startswith("-m"):
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok.startswith("-f"):
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok.startswith("-stdlib="):
-            filtered.append(tok)
-            i += 1
-            continue
-
-        if tok.startswith("--gcc-toolchain="):
-            filtered.append("--gcc-toolchain=" + _abspath(tok.split("=", 1)[1], entry_dir))
-            i += 1
-            continue
-
-        if tok.startswith("-O"):
-            filtered.append(tok)
-            i += 1
-            continue
-
+        filtered.append(flag + "=" + _abspath(val, entry_dir))
         i += 1
 
-    if not any(a == "-working-directory" or str(a).startswith("-working-directory=") for a in filtered):
+    def _resolved(path: str) -> str:
+        try:
+            return _resolve_cached(path)
+        except Exception:
+            return path
+
+    # Index the include flags in one pass; the checks below are set lookups.
+    include_args: Set[str] = set()  # raw -I values
+    include_dirs: Set[str] = set()  # resolved -I/-isystem/-iquote/-idirafter values
+    saw_working_dir = False
+    for k, t in enumerate(filtered):
+        if t in _JOINED_INCLUDE_FLAGS:
+            if k + 1 < len(filtered):
+                if t == "-I":
+                    include_args.add(filtered[k + 1])
+                include_dirs.add(_resolved(filtered[k + 1]))
+        elif t.startswith("-I"):
+            include_args.add(t[2:])
+            include_dirs.add(_resolved(t[2:]))
+        elif t == "-working-directory" or t.startswith("-working-directory="):
+            saw_working_dir = True
+
+    if not saw_working_dir:
         filtered.append(f"-working-directory={str(Path(entry_dir))}")
 
-    src_dir = str(Path(src_path).parent.resolve())
-    ent_dir = str(Path(entry_dir).resolve())
-    if src_dir != ent_dir and not _include_already_present(filtered, src_dir):
-        filtered.extend(["-I", src_dir])
+    def _add_include(path: str, abs_path: Optional[str] = None) -> None:
+        filtered.extend(["-I", path])
+        include_args.add(path)
+        include_dirs.add(abs_path if abs_path is not None else _resolved(path))
 
-    def _has_sys_include(argv: list[str], path: str) -> bool:
-        try:
-            abs_path = str(Path(path).resolve())
-        except Exception:
-            abs_path = path
-        for k, t in enumerate(argv):
-            if t in ("-I", "-isystem", "-iquote", "-idirafter"):
-                if k + 1 < len(argv) and str(Path(argv[k + 1]).resolve()) == abs_path:
-                    return True
-            if isinstance(t, str) and t.startswith("-I") and t != "-I":
-                v = t[2:]
-                try:
-                    if str(Path(v).resolve()) == abs_path:
-                        return True
-                except Exception:
-                    pass
-        return False
+    # Most entries compile a file that sits directly in the entry directory.
+    src_parent = os.path.dirname(src_path)
+    ent_dir = _resolve_cached(str(entry_dir))
+    src_dir = ent_dir if src_parent == str(entry_dir) else _resolve_cached(src_parent)
+    if src_dir != ent_dir and src_dir not in include_args:
+        _add_include(src_dir)
+
+    def _add_sys_include(path: str) -> None:
+        abs_path = _resolved(path)
+        if abs_path not in include_dirs:
+            _add_include(path, abs_path)
 
-    if not _has_sys_include(filtered, "/usr/include"):
-        filtered.extend(["-I", "/usr/include"])
+    _add_sys_include("/usr/include")
 
     multiarch = "/usr/include/x86_64-linux-gnu"
-    if os.path.isdir(multiarch) and not _has_sys_include(filtered, multiarch):
-        filtered.extend(["-I", multiarch])
+    if _isdir_cached(multiarch):
+        _add_sys_include(multiarch)
 
     if not saw_resource_dir:
-        import glob
-        candidates = []
-        candidates += sorted(glob.glob("/usr/lib/llvm-*/lib/clang/*"), reverse=True)
-        candidates += sorted(glob.glob("/usr/lib/clang/*"), reverse=True)
-        picked = None
-
-        env_rd = os.environ.get("CLANG_RESOURCE_DIR")
-        if env_rd and os.path.exists(os.path.join(env_rd, "include", "stddef.h")):
-            picked = env_rd
-        else:
-            for rd in candidates:
-                if os.path.exists(os.path.join(rd, "include", "stddef.h")):
-                    picked = rd
-                    break
+        picked = _discover_resource_dir(os.environ.get("CLANG_RESOURCE_DIR"))
         if picked:
             filtered.append(f"-resource-dir={picked}")
 
-    def _has_any_project_includes(argv: list[str]) -> bool:
-        sys_paths = {"/usr/include", "/usr/include/x86_64-linux-gnu"}
-        for j, t in enumerate(argv):
-            if t in ("-I", "-isystem", "-iquote", "-idirafter"):
-                if j + 1 < len(argv) and not str(argv[j + 1]).startswith("-"):
-                    try:
-                        abs_p = str(Path(argv[j + 1]).resolve())
-                        if abs_p not in sys_paths:
-                            return True
-                    except Exception:
-                        pass
-            if isinstance(t, str) and t.startswith("-I") and t != "-I":
-                v = t[2:]
-                try:
-                    abs_p = str(Path(v).resolve())
-                    if abs_p not in sys_paths:
-                        return True
-                except Exception:
-                    pass
-        return False
-
-    if ADD_DEFAULTS and not _has_any_project_includes(filtered):
-        src_dir = str(Path(src_path).parent.resolve())
-        ent_dir = str(Path(entry_dir).resolve())
+    sys_paths = {"/usr/include", "/usr/include/x86_64-linux-gnu"}
+    if ADD_DEFAULTS and include_dirs <= sys_paths:
         for pth in (ent_dir, src_dir):
-            if pth and not _include_already_present(filtered, pth):
-                filtered.extend(["-I", pth])
+            if pth and pth not in include_args:
+                _add_include(pth)
 
     for k, t in enumerate(filtered[:-1]):
         if t == "-I" and str(filtered[k + 1]).startswith("-"):
@@ -417,7 +479,8 @@ def make_retry_clang_args(clang_args: List[str]) -> List[str]:
     while i < len(clang_args):
         tok = clang_args[i]
         has_value = (i + 1 < len(clang_args)) and (not str(clang_args[i + 1]).startswith("-"))
-        if tok in {"-o", "-MF", "-MT", "-MQ", "-MJ"}:
+        # A PCH can be stale against headers edited since it was built; parse without it.
+        if tok in {"-o", "-MF", "-MT", "-MQ", "-MJ", "-include-pch"}:
             i += 1 + (1 if has_value else 0)
             continue
         if str(tok).startswith("-m"):
@@ -428,16 +491,18 @@ def make_retry_clang_args(clang_args: List[str]) -> List[str]:
     return cleaned
 
 
-def normalize_args_from_entry(entry: dict) -> Tuple[Path, List[str]]:
+def normalize_args_from_entry(
+    entry: dict, path_maps: Optional[List[Tuple[str, str]]] = None
+) -> Tuple[Path, List[str]]:
     """Convert one compile_commands entry into (absolute_src_path, sanitized_args)."""
-    directory = Path(entry.get("directory") or ".").resolve()
+    directory = Path(_resolve_cached(entry.get("directory") or "."))
     file_field = entry.get("file")
     if not file_field:
         raise ValueError("compile_commands entry missing 'file'")
-    src_path = (directory / file_field).resolve()
+    src_path = Path(_resolve_cached(os.path.join(directory, file_field)))
 
     if not src_path.exists():
-        for old_prefix, new_prefix in PATH_MAPS:
+        for old_prefix, new_prefix in (PATH_MAPS if path_maps is None else path_maps):
             try:
                 s = str(src_path)
                 if s.startswith(old_prefix):
@@ -461,12 +526,44 @@ def normalize_args_from_entry(entry: dict) -> Tuple[Path, List[str]]:
     return (src_path, args)
 
 
-def build_file_to_args_map(entries: List[dict]) -> Dict[Path, List[str]]:
-    out: Dict[Path, List[str]] = {}
-    for ent in entries:
-        try:
-            src, args = normalize_args_from_entry(ent)
-            out[src] = args
-        except Exception as e:
-            eprint(f"[warn] skipping entry due to parse error: {e}")
+def _normalize_entry_job(
+    entry: dict, path_maps: List[Tuple[str, str]]
+) -> Tuple[Optional[Path], Optional[List[str]], Optional[str]]:
+    """Pool worker: errors come back as text so the parent reports them in entry order."""
+    try:
+        src, args = normalize_args_from_entry(entry, path_maps)
+        return (src, args, None)
+    except Exception as e:
+        return (None, None, str(e))
+
+
+def _map_entries(entries: Iterable[dict], jobs: int) -> Iterator:
+    # PATH_MAPS is passed explicitly so spawned workers see the parent's mappings.
+    worker = functools.partial(_normalize_entry_job, path_maps=list(PATH_MAPS))
+    if jobs <= 1:
+        yield from map(worker, entries)
+        return
+    entries = list(entries)
+    if len(entries) <= 1:
+        yield from map(worker, entries)
+        return
+    chunksize = max(1, len(entries) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, entries, chunksize=chunksize)
+
+
+def build_file_to_args_map(entries: Iterable[dict], jobs: int = 1) -> Dict[Path, Tuple[str, ...]]:
+    """Map each source file to its sanitized args; identical arg lists share one tuple."""
+    out: Dict[Path, Tuple[str, ...]] = {}
+    seen: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    try:
+        for src, args, err in _map_entries(entries, jobs):
+            if err is not None:
+                eprint(f"[warn] skipping entry due to parse error: {err}")
+            else:
+                key = tuple(map(intern, args))
+                out[src] = seen.setdefault(key, key)
+    finally:
+        # Filesystem state may change between runs; only reuse within one map build.
+        _clear_path_caches()
     return out
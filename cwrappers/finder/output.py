@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import csv
+import io
 import json
 import re
 import sys
-from dataclasses import asdict
+from contextlib import contextmanager
+from dataclasses import fields
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional, TextIO
 
 from cwrappers.finder.models import EdgeEvidenceRow, Row
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
 
 def is_stdout(path_str: Optional[str]) -> bool:
     return (path_str is None) or (path_str == "-")
@@ -34,28 +41,85 @@ def prepare_output_location(path_str: str, prefer_dir: bool = False) -> Path:
     return p
 
 
+_HIT_SEP_RE = re.compile(r"[\s,;]+")
+
+
+def _clean_hit_loc(s) -> str:
+    ss = str(s).strip()
+    # Fast path: typical "file:line:col" locations contain no separators at all.
+    if "," not in ss and ";" not in ss and len(ss.split(None, 1)) == 1:
+        return ss
+    return _HIT_SEP_RE.sub("_", ss)
+
+
 def serialize_hit_locs(hit_locs: Optional[List[str]]) -> str:
     """Encode hit_locs into a delimiter-safe string for CSV consumers."""
     if not hit_locs:
         return ""
-    out = []
-    for s in hit_locs:
+    return "|".join([_clean_hit_loc(s) for s in hit_locs])
+
+
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+_ALL_COLUMNS_HEADER = [
+    "file","function","function_key","api_called","category","total_target_calls",
+    "hit_locs","per_path_single","derived_from_params",
+    "derivation_trace","arg_pass","ret_pass","reason","function_loc",
+    "pair_used","via_helper_hop","ignored_helpers","fan_in","fan_out",
+    "family","is_thin_alias","callee"
+]
+_DEFAULT_HEADER = ["file","function","api_called","category","fan_in","fan_out","callee","hit_locs","arg_pass","ret_pass","reason"]
+
+_EDGE_EVIDENCE_FIELDS = tuple(f.name for f in fields(EdgeEvidenceRow))
+_ROW_FIELDS = tuple(f.name for f in fields(Row))
+
+# Reused encoders: json.dump() with keyword options builds a new encoder per call.
+# Both lay records out exactly as orjson does (compact and OPT_INDENT_2), so the
+# bytes written do not depend on whether orjson is installed.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_JSON_INDENT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+# Below this many rows stdout output is written as it is produced.
+_BULK_STDOUT_MIN_ROWS = 1000
+
+
+@contextmanager
+def _stdout_writer(n_rows: int) -> Iterator[TextIO]:
+    """Yield the stream for stdout output; large outputs are assembled and written once."""
+    if n_rows < _BULK_STDOUT_MIN_ROWS:
+        yield sys.stdout
+        return
+    buf = io.StringIO()
+    yield buf
+    sys.stdout.write(buf.getvalue())
+
+
+def _record_dict(obj, names) -> dict:
+    # Shallow stand-in for asdict(); the Row/EdgeEvidenceRow fields are flat.
+    return {name: getattr(obj, name) for name in names}
+
+
+def _encode_record(obj, names, indent: bool = False) -> str:
+    if orjson is not None:
+        # orjson serializes the dataclass directly, in field order.
         try:
-            ss = str(s).strip()
-            ss = re.sub(r"[\s,;]+", "_", ss)
-            out.append(ss)
-        except Exception:
-            out.append(str(s))
-    return "|".join(out)
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+        except TypeError:
+            # JSONEncodeError, e.g. a lone surrogate in a path; let json handle it.
+            pass
+    return (_JSON_INDENT_ENCODER if indent else _JSON_ENCODER).encode(_record_dict(obj, names))
 
 
 def write_rows_csv(rows: Iterable[Row], out_path: Path, all_columns: bool = False) -> None:
     if str(out_path) == "-":
-        w = csv.writer(sys.stdout, quoting=csv.QUOTE_MINIMAL)
-        _write_csv_rows(w, rows, all_columns)
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            w = csv.writer(out, quoting=csv.QUOTE_MINIMAL)
+            _write_csv_rows(w, rows, all_columns)
         return
 
-    with open(out_path, "w", newline="") as f:
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         _write_csv_rows(w, rows, all_columns)
 
@@ -65,141 +129,124 @@ def _write_csv_rows(w: csv.writer, rows: Iterable[Row], all_columns: bool) -> No
     rows_list.sort(key=lambda r: (-int(getattr(r, "fan_in", 0)), -int(getattr(r, "fan_out", 0)), str(getattr(r, "function", "")), str(getattr(r, "file", ""))))
 
     if all_columns:
-        w.writerow([
-            "file","function","function_key","api_called","category","total_target_calls",
-            "hit_locs","per_path_single","derived_from_params",
-            "derivation_trace","arg_pass","ret_pass","reason","function_loc",
-            "pair_used","via_helper_hop","ignored_helpers","fan_in","fan_out",
-            "family","is_thin_alias","callee"
-        ])
-        for r in rows_list:
-            w.writerow([
+        w.writerow(_ALL_COLUMNS_HEADER)
+        w.writerows(
+            [
                 r.file, r.function, r.function_key or "", r.api_called, r.category, r.total_target_calls,
                 serialize_hit_locs(r.hit_locs),
                 "TRUE" if r.per_path_single else "FALSE",
                 "TRUE" if r.derived_from_params else "FALSE",
-                ";".join(r.derivation_trace or []),
+                ";".join(r.derivation_trace) if r.derivation_trace else "",
                 r.arg_pass,
                 r.ret_pass,
                 r.reason or "-",
                 r.function_loc or "-",
-                "TRUE" if getattr(r, "pair_used", False) else "FALSE",
-                "TRUE" if getattr(r, "via_helper_hop", False) else "FALSE",
-                ";".join(getattr(r, "ignored_helpers", []) or []),
+                "TRUE" if r.pair_used else "FALSE",
+                "TRUE" if r.via_helper_hop else "FALSE",
+                ";".join(r.ignored_helpers) if r.ignored_helpers else "",
                 r.fan_in,
                 r.fan_out,
                 r.family,
-                "TRUE" if getattr(r, "is_thin_alias", False) else "FALSE",
-                " - ".join(r.callees or []),
-            ])
+                "TRUE" if r.is_thin_alias else "FALSE",
+                " - ".join(r.callees) if r.callees else "",
+            ]
+            for r in rows_list
+        )
     else:
-        w.writerow(["file","function","api_called","category","fan_in","fan_out","callee","hit_locs","arg_pass","ret_pass","reason"])
-        for r in rows_list:
-            w.writerow([
+        w.writerow(_DEFAULT_HEADER)
+        w.writerows(
+            [
                 r.file,
                 r.function,
                 r.api_called,
                 r.category,
                 r.fan_in,
                 r.fan_out,
-                " - ".join(r.callees or []),
+                " - ".join(r.callees) if r.callees else "",
                 serialize_hit_locs(r.hit_locs),
                 r.arg_pass,
                 r.ret_pass,
                 r.reason or "-",
-            ])
+            ]
+            for r in rows_list
+        )
 
 
 def write_edge_evidence_csv(rows: Iterable[EdgeEvidenceRow], out_path: Path) -> None:
     if str(out_path) == "-":
-        w = csv.writer(sys.stdout, quoting=csv.QUOTE_MINIMAL)
-        _write_edge_evidence_rows(w, rows)
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            w = csv.writer(out, quoting=csv.QUOTE_MINIMAL)
+            _write_edge_evidence_rows(w, rows)
         return
 
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
         w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
         _write_edge_evidence_rows(w, rows)
 
 
 def _write_edge_evidence_rows(w: csv.writer, rows: Iterable[EdgeEvidenceRow]) -> None:
-    w.writerow([
-        "direction",
-        "match_kind",
-        "query_function",
-        "query_function_key",
-        "query_function_file",
-        "query_function_line",
-        "caller",
-        "caller_key",
-        "callee",
-        "callee_key",
-        "callsite_file",
-        "callsite_line",
-        "callsite_column",
-        "translation_unit",
-    ])
-    for row in rows:
-        w.writerow([
-            row.direction,
-            row.match_kind,
-            row.query_function,
-            row.query_function_key,
-            row.query_function_file,
-            row.query_function_line,
-            row.caller,
-            row.caller_key,
-            row.callee,
-            row.callee_key,
-            row.callsite_file,
-            row.callsite_line,
-            row.callsite_column,
-            row.translation_unit,
-        ])
+    w.writerow(_EDGE_EVIDENCE_FIELDS)
+    w.writerows([getattr(row, name) for name in _EDGE_EVIDENCE_FIELDS] for row in rows)
+
+
+def _write_json_array(records: Iterable, names, f) -> None:
+    """Stream records as json.dump(list, indent=2) would lay them out."""
+    first = True
+    for rec in records:
+        f.write("[\n  " if first else ",\n  ")
+        f.write(_encode_record(rec, names, indent=True).replace("\n", "\n  "))
+        first = False
+    f.write("[]" if first else "\n]")
+
+
+def _write_json_lines(records: Iterable, names, f) -> None:
+    for rec in records:
+        f.write(_encode_record(rec, names))
+        f.write("\n")
 
 
 def write_rows_json(rows: Iterable[Row], out_path: Path) -> None:
     if str(out_path) == "-":
-        import sys
-        json.dump([asdict(r) for r in rows], sys.stdout, ensure_ascii=False, indent=2)
-        sys.stdout.write("\n")
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            _write_json_array(rows, _ROW_FIELDS, out)
+            out.write("\n")
         return
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, ensure_ascii=False, indent=2)
+    with open(out_path, "w", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
+        _write_json_array(rows, _ROW_FIELDS, f)
 
 
 def write_edge_evidence_json(rows: Iterable[EdgeEvidenceRow], out_path: Path) -> None:
     if str(out_path) == "-":
-        json.dump([asdict(r) for r in rows], sys.stdout, ensure_ascii=False, indent=2)
-        sys.stdout.write("\n")
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            _write_json_array(rows, _EDGE_EVIDENCE_FIELDS, out)
+            out.write("\n")
         return
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, ensure_ascii=False, indent=2)
+    with open(out_path, "w", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
+        _write_json_array(rows, _EDGE_EVIDENCE_FIELDS, f)
 
 
 def write_rows_jsonl(rows: Iterable[Row], out_path: Path) -> None:
     if str(out_path) == "-":
-        import sys
-        for r in rows:
-            json.dump(asdict(r), sys.stdout, ensure_ascii=False)
-            sys.stdout.write("\n")
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            _write_json_lines(rows, _ROW_FIELDS, out)
         return
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        for r in rows:
-            json.dump(asdict(r), f, ensure_ascii=False)
-            f.write("\n")
+    with open(out_path, "w", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
+        _write_json_lines(rows, _ROW_FIELDS, f)
 
 
 def write_edge_evidence_jsonl(rows: Iterable[EdgeEvidenceRow], out_path: Path) -> None:
     if str(out_path) == "-":
-        for row in rows:
-            json.dump(asdict(row), sys.stdout, ensure_ascii=False)
-            sys.stdout.write("\n")
+        rows = list(rows)
+        with _stdout_writer(len(rows)) as out:
+            _write_json_lines(rows, _EDGE_EVIDENCE_FIELDS, out)
         return
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        for row in rows:
-            json.dump(asdict(row), f, ensure_ascii=False)
-            f.write("\n")
+    with open(out_path, "w", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f:
+        _write_json_lines(rows, _EDGE_EVIDENCE_FIELDS, f)
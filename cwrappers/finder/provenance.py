@@ -6,11 +6,33 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 
-from cwrappers.finder.ast_utils import _cursor_loc_key, _function_body_cursor, _is_param, _var_key
-from cwrappers.finder.analysis import is_helper_call
+from cwrappers.finder.ast_utils import (
+    _cursor_children,
+    _cursor_loc_key,
+    _descendants_of_kind,
+    _function_body_cursor,
+    _is_param,
+    _var_key,
+)
+from cwrappers.finder.analysis import _LEAF_KINDS
 from cwrappers.finder.catalog import HelperConfig
 from cwrappers.finder.clang_bootstrap import cindex, K
 
+# Kind sets for the hot membership tests below.
+_NOOP_KINDS = frozenset({K.PAREN_EXPR, K.CSTYLE_CAST_EXPR, K.UNEXPOSED_EXPR})
+_OPERATOR_KINDS = frozenset({K.BINARY_OPERATOR, K.UNARY_OPERATOR, K.CONDITIONAL_OPERATOR})
+# Anything but plain member/decl refs breaks a `&p->a.b` chain.
+_BAD_CHAIN_KINDS = frozenset({
+    K.ARRAY_SUBSCRIPT_EXPR,
+    K.BINARY_OPERATOR,
+    K.CALL_EXPR,
+    K.CONDITIONAL_OPERATOR,
+    K.UNARY_OPERATOR,
+})
+
+# Stand-in when no helper config is given; immutable containers, shared by all calls.
+_EMPTY_HELPERS = HelperConfig(frozenset(), (), frozenset(), ())
+
 
 @dataclass
 class TaintState:
@@ -19,7 +41,11 @@ class TaintState:
     ret_trace: List[str] = field(default_factory=list)
 
     def mark(self, key: str, why: str) -> None:
-        self.taint[key] = self.taint.get(key, []) + [why]
+        self.taint.setdefault(key, []).append(why)
+
+    def mark_many(self, key: str, reasons: List[str]) -> None:
+        # reasons may be this key's own trace (x = x + 1); extend from a snapshot.
+        self.taint.setdefault(key, []).extend(tuple(reasons))
 
     def is_tainted(self, key: str) -> bool:
         return key in self.taint
@@ -32,36 +58,39 @@ def taint_stmt(stmt: cindex.Cursor,
                 state: TaintState,
                 helpers: Optional[HelperConfig]) -> None:
     """Very simple intra-procedural taint: track assignments from params through locals."""
-    kind = stmt.kind
-    if kind == K.DECL_STMT:
-        for child in stmt.get_children():
-            taint_stmt(child, state, helpers)
-    elif kind == K.VAR_DECL:
-        lhs = _var_key(stmt)
-        for child in stmt.get_children():
-            t, trace = taint_expr(child, state, helpers or HelperConfig(set(), [], set(), []))
-            if t:
-                for reason in trace:
-                    state.mark(lhs, reason)
-    elif kind == K.BINARY_OPERATOR:
-        kids = list(stmt.get_children())
-        if len(kids) == 2:
-            lhs, rhs = kids
-            if lhs.kind == K.DECL_REF_EXPR:
-                key = _var_key(lhs)
-                t, trace = taint_expr(rhs, state, helpers or HelperConfig(set(), [], set(), []))
+    helpers = helpers or _EMPTY_HELPERS
+    # Preorder walk with an explicit stack (same visit order as recursion), so
+    # assignments are applied in source order and deep bodies cannot overflow.
+    stack = [stmt]
+    while stack:
+        n = stack.pop()
+        kind = n.kind
+        if kind == K.VAR_DECL:
+            lhs = _var_key(n)
+            for child in _cursor_children(n):
+                t, trace = taint_expr(child, state, helpers)
                 if t:
-                    for reason in trace:
-                        state.mark(key, reason)
-    elif kind == K.RETURN_STMT:
-        for ch in stmt.get_children():
-            t, trace = taint_expr(ch, state, helpers or HelperConfig(set(), [], set(), []))
-            if t:
-                state.ret_tainted = True
-                state.ret_trace += trace
-    else:
-        for ch in stmt.get_children():
-            taint_stmt(ch, state, helpers)
+                    state.mark_many(lhs, trace)
+        elif kind == K.BINARY_OPERATOR:
+            kids = _cursor_children(n)
+            if len(kids) == 2:
+                lhs, rhs = kids
+                if lhs.kind == K.DECL_REF_EXPR:
+                    key = _var_key(lhs)
+                    t, trace = taint_expr(rhs, state, helpers)
+                    if t:
+                        state.mark_many(key, trace)
+        elif kind == K.RETURN_STMT:
+            for ch in _cursor_children(n):
+                t, trace = taint_expr(ch, state, helpers)
+                if t:
+                    state.ret_tainted = True
+                    state.ret_trace += trace
+        else:
+            # DECL_STMT and every other statement: visit children in order.
+            children = list(_cursor_children(n))
+            children.reverse()
+            stack.extend(children)
 
 
 def taint_expr(expr: cindex.Cursor,
@@ -70,38 +99,28 @@ def taint_expr(expr: cindex.Cursor,
     """Check if an expression is tainted (data-derived from params)."""
     if expr is None:
         return False, []
-    kind = expr.kind
-    if kind == K.DECL_REF_EXPR:
-        key = _var_key(expr)
-        if state.is_tainted(key):
-            return True, state.trace(key)
-    elif kind in (K.UNARY_OPERATOR, K.CSTYLE_CAST_EXPR,
-                  K.MEMBER_REF_EXPR, K.ARRAY_SUBSCRIPT_EXPR):
-        for ch in expr.get_children():
-            t, tr = taint_expr(ch, state, helpers)
-            if t:
-                return True, tr
-    elif kind == K.BINARY_OPERATOR:
-        kids = list(expr.get_children())
-        for ch in kids:
-            t, tr = taint_expr(ch, state, helpers)
-            if t:
-                return True, tr
-    elif kind == K.CALL_EXPR:
-        if is_helper_call(expr, helpers or HelperConfig(set(), [], set(), []), kind="benign"):
-            return False, []
-        return False, []
-    else:
-        for ch in expr.get_children():
-            t, tr = taint_expr(ch, state, helpers)
-            if t:
-                return True, tr
+    # The first tainted DECL_REF_EXPR in preorder decides. References are not
+    # descended into, and call results are never tainted (benign helpers or not).
+    decl_ref_kind = K.DECL_REF_EXPR
+    call_kind = K.CALL_EXPR
+    stack = [expr]
+    while stack:
+        n = stack.pop()
+        kind = n.kind
+        if kind == decl_ref_kind:
+            key = _var_key(n)
+            if state.is_tainted(key):
+                return True, state.trace(key)
+        elif kind != call_kind:
+            children = list(_cursor_children(n))
+            children.reverse()
+            stack.extend(children)
     return False, []
 
 
 def extract_call_args(call: cindex.Cursor) -> List[cindex.Cursor]:
     """Return the argument expression cursors for this CALL_EXPR."""
-    kids = list(call.get_children())
+    kids = list(_cursor_children(call))
     if not kids:
         return []
     return kids[1:]
@@ -112,7 +131,7 @@ def check_arguments_provenance(func: cindex.Cursor,
                                helpers: Optional[HelperConfig] = None) -> Tuple[bool, List[str]]:
     """Run taint analysis on `func`; check that each call's args are derived from params."""
     state = TaintState()
-    for ch in func.get_children():
+    for ch in _cursor_children(func):
         if _is_param(ch):
             state.mark(_var_key(ch), f"{ch.spelling} is param")
 
@@ -120,7 +139,9 @@ def check_arguments_provenance(func: cindex.Cursor,
     if not body:
         return False, ["no-body"]
 
-    taint_stmt(body, state, helpers or HelperConfig(set(), [], set(), []))
+    helpers = helpers or _EMPTY_HELPERS
+    taint_stmt(body, state, helpers)
+
     trace_out: List[str] = []
     ok = True
 
@@ -139,7 +160,7 @@ def check_arguments_provenance(func: cindex.Cursor,
 def _gather_params(fn: cindex.Cursor) -> List[cindex.Cursor]:
     params = []
     try:
-        for ch in fn.get_children():
+        for ch in _cursor_children(fn):
             if _is_param(ch):
                 params.append(ch)
     except Exception:
@@ -340,30 +361,82 @@ def _build_call_result_varset(fn: cindex.Cursor, call_loc_keys: Set[Tuple[str, i
     return result_vars
 
 
+# Node budget for the return-counting walk. Macro-heavy bodies can expand to
+# huge ASTs; past this many nodes ret_pass is left undetermined ("-", as for
+# rows whose provenance could not be computed) instead of walking on.
+_MAX_RETURN_WALK_NODES = 50_000
+
+
+def _body_returns(body: cindex.Cursor) -> Optional[List[cindex.Cursor]]:
+    """Every RETURN_STMT under body, or None once the node budget runs out."""
+    if isinstance(body, cindex.Cursor):
+        try:
+            # One libclang visit; no Python child tuple is built per node.
+            returns, complete = _descendants_of_kind(body, K.RETURN_STMT, _LEAF_KINDS, _MAX_RETURN_WALK_NODES)
+            return returns if complete else None
+        except Exception:
+            pass
+    returns = []
+    budget = _MAX_RETURN_WALK_NODES
+    stack = [body]
+    while stack:
+        budget -= 1
+        if budget < 0:
+            return None
+        n = stack.pop()
+        kind = n.kind
+        if kind == K.RETURN_STMT:
+            returns.append(n)
+        elif kind in _LEAF_KINDS:
+            continue
+        stack.extend(_cursor_children(n))
+    return returns
+
+
+def _strip_noop(expr: Optional[cindex.Cursor]) -> Optional[cindex.Cursor]:
+    """Peel paren/cast/unexposed wrappers, following the last (operand) child."""
+    n = expr
+    while n is not None and n.kind in _NOOP_KINDS:
+        # Children come from the memoized tuple, so [-1] is O(1) with no list built.
+        kids = _cursor_children(n)
+        if not kids:
+            break
+        n = kids[-1]
+    return n
+
+
 def compute_arg_ret_pass_multi(fn: cindex.Cursor, matching_calls: List[cindex.Cursor]) -> Tuple[str, str]:
     """Compute arg_pass and ret_pass with strict AST rules (direct passthrough only)."""
     if not matching_calls:
         return "no", "no"
 
-    def _strip_noop(expr: Optional[cindex.Cursor]) -> Optional[cindex.Cursor]:
-        n = expr
-        while n is not None and n.kind in (K.PAREN_EXPR, K.CSTYLE_CAST_EXPR, K.UNEXPOSED_EXPR):
-            kids = list(n.get_children())
-            if not kids:
-                break
-            n = kids[-1]
-        return n
+    params = _gather_params(fn)
+    param_keys: Set[str] = {_var_key(p) for p in params}
+    param_count = len(param_keys)
+    # A DECL_REF to one of fn's params finds its key by cursor hash instead of
+    # rebuilding it per argument. Hashes can collide, so a hit must also be
+    # the same cursor.
+    param_key_by_id: Dict[int, Tuple[cindex.Cursor, str]] = {p.hash: (p, _var_key(p)) for p in params}
+
+    def _param_key_of(ref: Optional[cindex.Cursor]) -> Optional[str]:
+        if ref is None or ref.kind != K.PARM_DECL:
+            return None
+        entry = param_key_by_id.get(ref.hash)
+        if entry is not None and entry[0] == ref:
+            return entry[1]
+        return _var_key(ref)
 
     def _is_direct_param_ref(expr: Optional[cindex.Cursor]) -> Optional[str]:
         e = _strip_noop(expr)
         if e is None:
             return None
-        if e.kind == K.DECL_REF_EXPR:
-            ref = getattr(e, 'referenced', None)
-            if ref is not None and ref.kind == K.PARM_DECL:
-                return _var_key(ref)
-        if e.kind == K.UNARY_OPERATOR:
-            kids = list(e.get_children())
+        kind = e.kind
+        if kind == K.DECL_REF_EXPR:
+            pk = _param_key_of(e.referenced)
+            if pk is not None:
+                return pk
+        elif kind == K.UNARY_OPERATOR:
+            kids = _cursor_children(e)
             if len(kids) == 1:
                 inner = _strip_noop(kids[0])
                 if inner is not None and inner.kind == K.MEMBER_REF_EXPR:
@@ -373,15 +446,13 @@ def compute_arg_ret_pass_multi(fn: cindex.Cursor, matching_calls: List[cindex.Cu
                     while stack_chain and not bad:
                         n = stack_chain.pop()
                         try:
-                            for ch in n.get_children():
-                                if ch.kind == K.DECL_REF_EXPR:
-                                    ref = getattr(ch, 'referenced', None)
-                                    if ref is not None and ref.kind == K.PARM_DECL:
-                                        base_param_key = _var_key(ref)
-                                if ch.kind in (K.ARRAY_SUBSCRIPT_EXPR, K.BINARY_OPERATOR, K.CALL_EXPR, K.CONDITIONAL_OPERATOR):
-                                    bad = True
-                                    break
-                                if ch.kind == K.UNARY_OPERATOR:
+                            for ch in _cursor_children(n):
+                                ch_kind = ch.kind
+                                if ch_kind == K.DECL_REF_EXPR:
+                                    pk = _param_key_of(ch.referenced)
+                                    if pk is not None:
+                                        base_param_key = pk
+                                elif ch_kind in _BAD_CHAIN_KINDS:
                                     bad = True
                                     break
                                 stack_chain.append(ch)
@@ -391,10 +462,9 @@ def compute_arg_ret_pass_multi(fn: cindex.Cursor, matching_calls: List[cindex.Cu
                         return base_param_key
         return None
 
-    params = _gather_params(fn)
-    param_keys: Set[str] = {_var_key(p) for p in params}
-    param_count = len(param_keys)
-
+    # Calls listed more than once (or sharing argument cursors) are checked once.
+    # Keyed by cursor hash; the argument cursor is kept to rule out collisions.
+    direct_ref_cache: Dict[int, Tuple[cindex.Cursor, Optional[str]]] = {}
     used_direct_params_union: Set[str] = set()
     arg_all_direct = False
     for call in matching_calls:
@@ -406,7 +476,13 @@ def compute_arg_ret_pass_multi(fn: cindex.Cursor, matching_calls: List[cindex.Cu
         direct_map: List[Optional[str]] = []
         ok_all_direct = True
         for a in args:
-            pk = _is_direct_param_ref(a)
+            h = a.hash
+            entry = direct_ref_cache.get(h)
+            if entry is not None and entry[0] == a:
+                pk = entry[1]
+            else:
+                pk = _is_direct_param_ref(a)
+                direct_ref_cache[h] = (a, pk)
             if pk is None or pk not in param_keys:
                 ok_all_direct = False
             else:
@@ -430,34 +506,29 @@ def compute_arg_ret_pass_multi(fn: cindex.Cursor, matching_calls: List[cindex.Cu
         if k:
             call_loc_keys.add(k)
 
-    def _return_directly_call(ret_node: cindex.Cursor) -> bool:
-        expr_children = list(ret_node.get_children())
-        for ec in expr_children:
-            e = _strip_noop(ec)
-            if e is None:
-                continue
-            if e.kind in (K.BINARY_OPERATOR, K.UNARY_OPERATOR, K.CONDITIONAL_OPERATOR):
-                return False
-            if e.kind == K.CALL_EXPR and _cursor_loc_key(e) in call_loc_keys:
-                return True
-        return False
-
     body = _function_body_cursor(fn)
     total_returns = 0
     direct_returns = 0
     if body is not None:
-        stack = [body]
-        while stack:
-            n = stack.pop()
-            if n.kind == K.RETURN_STMT:
-                total_returns += 1
-                if _return_directly_call(n):
+        returns = _body_returns(body)
+        if returns is None:
+            return arg_pass, "-"
+        for n in returns:
+            total_returns += 1
+            if not call_loc_keys:
+                continue
+            # A return counts as direct when its (stripped) operand is one of the
+            # matching calls and no operator wraps it.
+            for ec in _cursor_children(n):
+                e = _strip_noop(ec)
+                if e is None:
+                    continue
+                e_kind = e.kind
+                if e_kind in _OPERATOR_KINDS:
+                    break
+                if e_kind == K.CALL_EXPR and _cursor_loc_key(e) in call_loc_keys:
                     direct_returns += 1
-            try:
-                for ch in n.get_children():
-                    stack.append(ch)
-            except Exception:
-                pass
+                    break
 
     try:
         if str(fn.result_type.spelling or "").strip() == "void" or total_returns == 0:
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import dataclasses
+import functools
+import heapq
 import os
 import re
 import shlex
@@ -9,13 +12,15 @@ import subprocess
 import sys
 import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
 import yaml
 
-from cwrappers.finder import compile_commands
-from cwrappers.finder.analysis import collect_target_calls, _resolve_target_name_for_call
+from cwrappers.finder import compile_commands, tu_cache
+from cwrappers.finder.analysis import collect_target_calls, reset_hop_cache, _resolve_target_name_for_call
 from cwrappers.finder.callgraph import (
     DetailedEdge,
     FunctionDef,
@@ -42,7 +47,13 @@ from cwrappers.finder.output import (
 )
 from cwrappers.finder.provenance import compute_arg_ret_pass_multi
 from cwrappers.finder.wrapper_detection import analyze_wrapper_relaxed, analyze_wrapper_strict_plus
-from cwrappers.finder.ast_utils import _caller_name, _function_key, _is_callable_definition
+from cwrappers.finder.ast_utils import (
+    _caller_name,
+    _function_key,
+    _resolved_file_name,
+    iter_callable_definitions,
+    reset_caches,
+)
 from cwrappers.shared.log import eprint
 from cwrappers.shared.paths import default_catalog_path
 
@@ -141,9 +152,9 @@ def _trace_reachable_target_apis(
         keys_by_name[nm].add(k)
 
     for e in all_edges:
-        caller_k = str(getattr(e, "caller_key", None) or getattr(e, "caller", "") or "")
-        callee_k = str(getattr(e, "callee_key", None) or getattr(e, "callee", "") or "")
-        callee_nm = str(getattr(e, "callee", "") or "")
+        caller_k = e.caller_key or e.caller or ""
+        callee_k = e.callee_key or e.callee or ""
+        callee_nm = e.callee or ""
         if not caller_k:
             continue
 
@@ -158,7 +169,7 @@ def _trace_reachable_target_apis(
         if resolved_callee_key:
             if resolved_callee_key not in adjacency_seen[caller_k]:
                 adjacency_seen[caller_k].add(resolved_callee_key)
-                adjacency[caller_k].append((resolved_callee_key, _parse_callsite_loc(getattr(e, "loc", ""))))
+                adjacency[caller_k].append((resolved_callee_key, _parse_callsite_loc(e.loc)))
 
     for caller_k in list(adjacency.keys()):
         adjacency[caller_k].sort(key=lambda pair: pair[1])
@@ -188,38 +199,57 @@ def _trace_reachable_target_apis(
     return memo
 
 
-def _trace_reachable_callee_names(
+def _group_edges(
     all_edges: List[DetailedEdge],
-    function_defs_by_key: Dict[str, FunctionDef],
-) -> Dict[str, List[str]]:
-    """Compute transitive reachable callee names for project-defined callers."""
-    _defs_by_key, keys_by_name = build_function_index(function_defs_by_key.values())
+    function_defs_by_key: Mapping[str, FunctionDef],
+    keys_by_name: Mapping[str, Set[str]],
+) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Dict[str, List[str]], Dict[str, Set[str]]]:
+    """Group edges by their project endpoints, resolving each endpoint once.
+
+    Returns callers by callee and callees by caller (the fan-in/out sets), plus
+    callee names and project callee keys by caller for _reachable_callee_names.
+    """
+    callers_by_callee: Dict[str, Set[str]] = defaultdict(set)
+    callees_by_caller: Dict[str, Set[str]] = defaultdict(set)
     direct_names_by_caller: Dict[str, List[str]] = defaultdict(list)
     project_callees_by_caller: Dict[str, Set[str]] = defaultdict(set)
 
+    # Every edge here is a DetailedEdge whose fields are already strings.
     for e in all_edges:
         caller_k, _caller_match = resolve_project_function_key(
-            getattr(e, "caller_key", None),
-            getattr(e, "caller", ""),
+            e.caller_key,
+            e.caller,
             function_defs_by_key,
             keys_by_name,
         )
-        if not caller_k:
-            continue
-
-        callee_nm = str(getattr(e, "callee", "") or "")
-        if callee_nm:
-            direct_names_by_caller[caller_k].append(callee_nm)
-
         callee_k, _callee_match = resolve_project_function_key(
-            getattr(e, "callee_key", None),
-            getattr(e, "callee", ""),
+            e.callee_key,
+            e.callee,
             function_defs_by_key,
             keys_by_name,
         )
-        if callee_k:
-            project_callees_by_caller[caller_k].add(callee_k)
+        caller_identity = caller_k or e.caller_key or e.caller
+        callee_identity = callee_k or e.callee_key or e.callee
 
+        if callee_k and caller_identity:
+            callers_by_callee[callee_k].add(caller_identity)
+        if caller_k and callee_identity:
+            callees_by_caller[caller_k].add(callee_identity)
+        if caller_k:
+            if e.callee:
+                direct_names_by_caller[caller_k].append(e.callee)
+            if callee_k:
+                project_callees_by_caller[caller_k].add(callee_k)
+
+    return callers_by_callee, callees_by_caller, direct_names_by_caller, project_callees_by_caller
+
+
+def _reachable_callee_names(
+    direct_names_by_caller: Mapping[str, List[str]],
+    project_callees_by_caller: Mapping[str, Set[str]],
+    function_keys: Iterable[str],
+) -> Dict[str, List[str]]:
+    """Callee names reachable from each of function_keys, given the per-caller edge groups."""
     memo: Dict[str, List[str]] = {}
 
     def dfs(func_key: str, stack: Set[str]) -> List[str]:
@@ -239,7 +269,7 @@ def _trace_reachable_callee_names(
         memo[func_key] = _unique_in_order(names)
         return memo[func_key]
 
-    for fk in function_defs_by_key.keys():
+    for fk in function_keys:
         dfs(fk, set())
 
     return memo
@@ -368,13 +398,75 @@ def _select_category_from_api_called(api_called: str, catalog: ApiCatalog, defau
     return winners[0] if winners else default_category
 
 
+# One libclang index per process, created on first use, so pool workers each
+# build their own after the fork and reuse it for every TU they parse.
+_INDEX: Optional[cindex.Index] = None
+
+
+def _shared_index() -> cindex.Index:
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = cindex.Index.create()
+    return _INDEX
+
+
+def _with_common_pch(
+    file_to_args: Dict[Path, Tuple[str, ...]],
+    header: Path,
+    verbose: bool = False,
+) -> Dict[Path, Tuple[str, ...]]:
+    """Append -include-pch to every arg tuple shared by two or more TUs.
+
+    One PCH is built per distinct flag set, since clang rejects a PCH whose
+    flags differ from the TU's. Flag sets used by a single TU would pay for the
+    PCH without reusing it, so they are left alone, as are sets whose PCH fails.
+    """
+    uses: Dict[Tuple[str, ...], int] = defaultdict(int)
+    for clang_args in file_to_args.values():
+        uses[clang_args] += 1
+    pch_args: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    out_dir = tu_cache.default_pch_dir()
+    for clang_args, n in uses.items():
+        if n < 2:
+            continue
+        pch = tu_cache.build_common_pch(header, clang_args, out_dir)
+        if pch is None:
+            eprint(f"[pch][warn] could not precompile {header}; {n} TUs parse without it")
+            continue
+        if verbose:
+            eprint(f"[pch] {pch} shared by {n} TUs")
+        pch_args[clang_args] = (*clang_args, "-include-pch", str(pch))
+    return {src: pch_args.get(clang_args, clang_args) for src, clang_args in file_to_args.items()}
+
+
 def _parse_translation_unit(
     src: Path,
-    clang_args: List[str],
+    clang_args: Sequence[str],
+    verbose: bool = False,
+    debug_preprocess: bool = False,
+    tu_cache_dir: Optional[Path] = None,
+) -> tuple[Optional[cindex.TranslationUnit], TranslationUnitReport]:
+    if tu_cache_dir is None:
+        return _parse_translation_unit_uncached(src, clang_args, verbose, debug_preprocess)
+    options = cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+    cached = tu_cache.load_cached_tu(tu_cache_dir, src, clang_args, options, _shared_index())
+    if cached is not None:
+        if verbose:
+            eprint(f"[parsed:cache] {src}")
+        return cached
+    tu, report = _parse_translation_unit_uncached(src, clang_args, verbose, debug_preprocess)
+    if tu is not None:
+        tu_cache.store_tu(tu_cache_dir, src, clang_args, options, tu, report)
+    return tu, report
+
+
+def _parse_translation_unit_uncached(
+    src: Path,
+    clang_args: Sequence[str],
     verbose: bool = False,
     debug_preprocess: bool = False,
 ) -> tuple[Optional[cindex.TranslationUnit], TranslationUnitReport]:
-    index = cindex.Index.create()
+    index = _shared_index()
     try:
         t0 = time.time()
         tu = index.parse(
@@ -409,7 +501,7 @@ def _parse_translation_unit(
             return tu, _build_translation_unit_report(src, tu, retry_used=True)
         except cindex.TranslationUnitLoadError as e2:
             eprint(f"[error] libclang failed to parse {src}")
-            eprint(f"  original args={clang_args}")
+            eprint(f"  original args={list(clang_args)}")
             eprint(f"  cleaned  args={cleaned}")
             eprint(f"  {e2}")
             if debug_preprocess:
@@ -444,6 +536,370 @@ def _parse_translation_unit(
             return None, _build_translation_unit_report(src, None, retry_used=True, parse_failure=str(e2))
 
 
+# Toolchain and system header locations: one of these directories (or the directory
+# itself), anything under /usr/lib/llvm*, or any path containing /lib/clang/.
+_SYSTEM_PATH_RE = re.compile(
+    r"^(?:/usr/include|/usr/local/include|/usr/lib/clang|/usr/lib/gcc|/lib/clang"
+    r"|/opt/homebrew/include|/opt/local/include)(?:/|\Z)"
+    r"|^/usr/lib/llvm"
+    r"|/lib/clang/"
+)
+
+
+def _is_in_project(path_str: str, project_roots: Tuple[Path, ...]) -> bool:
+    # Every function of a TU asks about the same handful of files (the source and
+    # its headers), so the resolve()/relative_to() work is memoized per path.
+    return _is_in_project_cached(path_str, project_roots, os.environ.get("REPO_ROOT"))
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_in_project_cached(path_str: str, project_roots: Tuple[Path, ...], repo_root_env: Optional[str]) -> bool:
+    try:
+        rp = Path(path_str).resolve()
+    except Exception:
+        rp = Path(path_str)
+
+    s = str(rp)
+    if project_roots:
+        return any(_path_is_under(s, str(root)) for root in project_roots)
+    else:
+        if _SYSTEM_PATH_RE.search(s):
+            return False
+        if repo_root_env:
+            try:
+                rr = Path(repo_root_env).resolve()
+            except Exception:
+                return True
+            return _path_is_under(s, str(rr))
+        return True
+
+
+def _path_is_under(path_str: str, root_str: str) -> bool:
+    # Path.relative_to() without the ValueError on a miss; both sides are resolved.
+    if path_str == root_str:
+        return True
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    return path_str.startswith(prefix)
+
+
+_LEGACY_MODES = {
+    "perpath_relaxed": "relaxed",
+    "single": "accurate",
+    "perpath": "accurate",
+    "perpath_strict_plus": "accurate",
+}
+
+
+@dataclass(frozen=True)
+class _TuJobOptions:
+    """Picklable per-run settings shared by every TU worker."""
+    verbose: bool = False
+    debug_preprocess: bool = False
+    filter_active: bool = True
+    project_roots: Tuple[Path, ...] = ()
+    catalog: Optional[ApiCatalog] = None
+    mode_eff: str = "all"
+    treat_thin_alias: str = "default"
+    tu_cache_dir: Optional[Path] = None
+
+
+@dataclass
+class _CallgraphTuResult:
+    tu_report: TranslationUnitReport
+    function_defs: List[FunctionDef] = field(default_factory=list)
+    edges: List[DetailedEdge] = field(default_factory=list)
+
+
+@dataclass
+class _WrapperTuResult:
+    tu_report: TranslationUnitReport
+    # (row, (arg_pass, ret_pass) or None when provenance could not be computed)
+    rows: List[Tuple[Row, Optional[Tuple[str, str]]]] = field(default_factory=list)
+    function_names: List[Tuple[str, str]] = field(default_factory=list)
+    function_defs: List[FunctionDef] = field(default_factory=list)
+    direct_targets: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    edges: List[DetailedEdge] = field(default_factory=list)
+
+
+def _resolve_jobs(jobs: Optional[int]) -> int:
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+# Worker callable (and the catalog bound into it) installed once per pool process.
+_TU_WORKER: Optional[Callable] = None
+
+
+def _install_tu_worker(worker: Callable) -> None:
+    global _TU_WORKER
+    _TU_WORKER = worker
+
+
+def _run_tu_worker(item: Tuple[Path, Tuple[str, ...]]):
+    return _TU_WORKER(item)
+
+
+def _source_size(src: Path) -> int:
+    try:
+        return src.stat().st_size
+    except OSError:
+        return 0
+
+
+def _map_translation_units(worker: Callable, items: List[Tuple[Path, Tuple[str, ...]]], jobs: int) -> Iterator:
+    """Yield worker(item) for each TU in order, in a process pool when jobs > 1."""
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield worker(item)
+        return
+    # libclang holds the GIL, so TUs are spread over processes; cursors never
+    # leave the worker, only the picklable per-TU results do. The worker goes
+    # through the pool initializer so its options/catalog are sent once per
+    # process rather than with every TU.
+    #
+    # Per-function work is independent, so a TU's cost tracks its size; the
+    # biggest sources are submitted first so one large file does not start last
+    # and leave the other workers idle. Results are still yielded in input order
+    # so the merge downstream is unchanged.
+    #
+    # TUs are not bucketed by identical flags: the index is already reused
+    # across every TU a process handles (_shared_index), identical arg tuples
+    # are already shared by build_file_to_args_map, and one task per bucket
+    # would undo the size ordering above.
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items)),
+                             initializer=_install_tu_worker, initargs=(worker,)) as pool:
+        futures = [None] * len(items)
+        for i in sorted(range(len(items)), key=lambda i: _source_size(items[i][0]), reverse=True):
+            futures[i] = pool.submit(_run_tu_worker, items[i])
+        for i, fut in enumerate(futures):
+            # Let go of each TU's result once it is handed out, so the caller's
+            # merge is the only copy kept alive rather than every TU's rows/edges.
+            futures[i] = None
+            yield fut.result()
+
+
+def _collect_callgraph_tu(job: Tuple[Path, Tuple[str, ...]], options: _TuJobOptions) -> _CallgraphTuResult:
+    src, clang_args = job
+    if options.verbose:
+        eprint(f"[callgraph] parsing {src}")
+
+    tu, tu_report = _parse_translation_unit(
+        src,
+        clang_args,
+        verbose=options.verbose,
+        debug_preprocess=options.debug_preprocess,
+        tu_cache_dir=options.tu_cache_dir,
+    )
+    reset_caches()
+    result = _CallgraphTuResult(tu_report=tu_report)
+    if tu is None:
+        return result
+
+    definitions = list(iter_callable_definitions(tu.cursor))
+    for fn_def in collect_function_defs_for_tu(tu, definitions):
+        if options.filter_active and not _is_in_project(fn_def.file or str(src), options.project_roots):
+            continue
+        result.function_defs.append(fn_def)
+
+    edges_tu, _seen_tu = collect_callgraph_for_tu_detailed(tu, translation_unit=str(src), definitions=definitions)
+    result.edges.extend(edges_tu)
+    return result
+
+
+def _resolved_target_hits(
+    cursor: cindex.Cursor,
+    catalog: ApiCatalog,
+) -> List[Tuple[cindex.Cursor, str, Optional[str]]]:
+    """(call, hit loc, resolved target name) for each target call in cursor."""
+    return [
+        (call_cur, hit_loc, _resolve_target_name_for_call(call_cur, catalog))
+        for call_cur, hit_loc in collect_target_calls(cursor, catalog.target_names)
+    ]
+
+
+def _analyze_wrapper_tu(job: Tuple[Path, Tuple[str, ...]], options: _TuJobOptions) -> _WrapperTuResult:
+    src, clang_args = job
+    catalog = options.catalog
+    if options.verbose:
+        eprint(f"[processing] {src}")
+        eprint(f"[debug] Clang args for {src}:")
+        for a in clang_args:
+            eprint(f"  {a}")
+
+    tu, tu_report = _parse_translation_unit(
+        src,
+        clang_args,
+        verbose=options.verbose,
+        debug_preprocess=options.debug_preprocess,
+        tu_cache_dir=options.tu_cache_dir,
+    )
+    reset_caches()
+    reset_hop_cache()
+    result = _WrapperTuResult(tu_report=tu_report)
+    if tu is None:
+        return result
+
+    # Definitions are found without walking function bodies, and the list is
+    # reused for the TU's call graph below.
+    definitions = list(iter_callable_definitions(tu.cursor))
+    target_names = catalog.target_names
+    thin_aliases = catalog.thin_aliases
+    category_of = catalog.category_of
+    # The mode is fixed for the run: pick the analysis once, not per function.
+    # "all" mode runs the accurate analysis on functions that call a target.
+    all_mode = options.mode_eff == "all"
+    if options.mode_eff == "relaxed":
+        analyze = analyze_wrapper_relaxed
+    else:
+        analyze = functools.partial(analyze_wrapper_strict_plus, thin_policy=options.treat_thin_alias)
+    for cursor in definitions:
+        func_name = _caller_name(cursor)
+        loc = cursor.location
+        func_file = loc.file.name if (loc and loc.file) else str(src)
+        func_loc = f"{func_file}:{loc.line}" if (loc and loc.file) else "-"
+
+        if options.filter_active:
+            try:
+                exp = cursor.extent.start.file
+                exp_path = exp.name if exp is not None else func_file
+            except Exception:
+                exp_path = func_file
+            if not _is_in_project(exp_path, options.project_roots):
+                if options.verbose:
+                    eprint(f"[skip:out-of-project] {func_name} @ {exp_path}")
+                continue
+
+        func_key = _function_key(cursor)
+        result.function_names.append((func_key, func_name))
+        result.function_defs.append(
+            FunctionDef(
+                function_key=func_key,
+                function=func_name,
+                file=_resolved_file_name(func_file) if func_file not in ("", "-") else "",
+                line=int(getattr(loc, "line", 0) or 0),
+            )
+        )
+
+        # Target calls and their resolved names, shared by the direct-target
+        # index, the "all" mode hit list and the arg/ret pass below.
+        try:
+            target_hits: Optional[List[Tuple[cindex.Cursor, str, Optional[str]]]] = _resolved_target_hits(cursor, catalog)
+        except Exception:
+            target_hits = None
+        for _call_cur, _hit_loc, resolved_name in target_hits or ():
+            if resolved_name and resolved_name in target_names:
+                result.direct_targets[func_key].append(resolved_name)
+
+        keep = False
+        per_path_single = False
+        total_hits = 0
+        reason = "n/a"
+        hit_locs: List[str] = []
+        api_name: Optional[str] = None
+        derived_ok = True
+        deriv_trace: List[str] = []
+        pair_used = False
+        via_helper_hop = False
+        ignored_helpers: List[str] = []
+
+        if not all_mode:
+            (keep,
+             per_path_single,
+             total_hits,
+             reason,
+             hit_locs,
+             api_name,
+             derived_ok,
+             deriv_trace,
+             pair_used,
+             via_helper_hop,
+             ignored_helpers) = analyze(cursor, catalog)
+
+        else:
+            if target_hits is None:
+                target_hits = _resolved_target_hits(cursor, catalog)
+            apis: List[str] = []
+            hit_locs = []
+            for _call_cur, hit_loc, nm in target_hits:
+                if nm:
+                    apis.append(nm)
+                    hit_locs.append(hit_loc)
+            total_hits = len(apis)
+            if total_hits > 0:
+                (keep,
+                 per_path_single,
+                 _th,
+                 reason,
+                 _hl,
+                 api_name,
+                 derived_ok,
+                 deriv_trace,
+                 pair_used,
+                 via_helper_hop,
+                 ignored_helpers) = analyze(cursor, catalog)
+                if not api_name and apis:
+                    api_name = apis[0]
+            else:
+                keep = True
+                per_path_single = True
+                reason = "N/A"
+                api_name = None
+                derived_ok = False
+                deriv_trace = []
+                pair_used = False
+                via_helper_hop = False
+                ignored_helpers = []
+
+        if not all_mode:
+            if (not keep) or (total_hits == 0) or (not api_name) or (api_name not in target_names):
+                continue
+
+        # "all" mode keeps functions that call no target API; they get placeholder fields.
+        no_api_row = all_mode and not api_name
+        is_thin_alias = bool(api_name and api_name in thin_aliases)
+        r = Row(
+            file=func_file,
+            function=func_name,
+            function_key=func_key,
+            api_called="other" if no_api_row else (api_name or ""),
+            category="N/A" if no_api_row else category_of(api_name or ""),
+            total_target_calls=total_hits,
+            hit_locs=hit_locs,
+            per_path_single=per_path_single,
+            derived_from_params=derived_ok,
+            derivation_trace=deriv_trace,
+            reason="N/A" if no_api_row else (reason if reason != "n/a" else ("ok" if keep else "-")),
+            function_loc=func_loc,
+            pair_used=pair_used,
+            via_helper_hop=via_helper_hop,
+            ignored_helpers=ignored_helpers or [],
+            family="thin_alias" if is_thin_alias else "-",
+            is_thin_alias=is_thin_alias,
+        )
+        passes: Optional[Tuple[str, str]] = None
+        try:
+            if no_api_row:
+                passes = ("N/A", "N/A")
+            else:
+                if target_hits is None:
+                    target_hits = _resolved_target_hits(cursor, catalog)
+                matching_calls = [call_cur for call_cur, _hit_loc, nm in target_hits if nm == api_name]
+                passes = compute_arg_ret_pass_multi(cursor, matching_calls)
+        except Exception:
+            pass
+        result.rows.append((r, passes))
+
+    try:
+        edges_tu, _seen_tu = collect_callgraph_for_tu_detailed(tu, translation_unit=str(src), definitions=definitions)
+        result.edges.extend(edges_tu)
+    except Exception:
+        pass
+    return result
+
+
 def run_finder(args) -> Optional[Path]:
     provided_args = _parse_args_provided()
 
@@ -496,8 +952,9 @@ def run_finder(args) -> Optional[Path]:
         if not is_stdout(args.out):
             prepare_output_location(args.out, prefer_dir=False)
 
-    entries = compile_commands.load_compile_commands(Path(args.compile_commands))
-    file_to_args = compile_commands.build_file_to_args_map(entries)
+    jobs = _resolve_jobs(getattr(args, "j", 1))
+    entries = compile_commands.iter_compile_commands(Path(args.compile_commands))
+    file_to_args = compile_commands.build_file_to_args_map(entries, jobs=jobs)
 
     project_roots: List[Path] = []
     filter_active: bool = False
@@ -546,48 +1003,16 @@ def run_finder(args) -> Optional[Path]:
     if not filter_active:
         filter_active = True
 
-    def _is_in_project(path_str: str) -> bool:
-        try:
-            rp = Path(path_str).resolve()
-        except Exception:
-            rp = Path(path_str)
-
-        if project_roots:
-            for root in project_roots:
-                try:
-                    rp.relative_to(root)
-                    return True
-                except Exception:
-                    continue
-            return False
-        else:
-            s = str(rp)
-            sys_prefixes = (
-                "/usr/include",
-                "/usr/local/include",
-                "/usr/lib/clang",
-                "/usr/lib/gcc",
-                "/lib/clang",
-                "/opt/homebrew/include",
-                "/opt/local/include",
-            )
-            for pref in sys_prefixes:
-                if s == pref or s.startswith(pref + "/"):
-                    return False
-            if "/lib/clang/" in s or s.startswith("/usr/lib/llvm") or s.startswith("/usr/lib/llvm-"):
-                return False
-            repo_root_env = os.environ.get("REPO_ROOT")
-            if repo_root_env:
-                try:
-                    rr = Path(repo_root_env).resolve()
-                    try:
-                        rp.relative_to(rr)
-                        return True
-                    except Exception:
-                        return False
-                except Exception:
-                    pass
-            return True
+    if getattr(args, "pch_common_header", None):
+        file_to_args = _with_common_pch(file_to_args, Path(args.pch_common_header), getattr(args, "verbose", False))
+    tu_jobs = list(file_to_args.items())
+    job_options = _TuJobOptions(
+        verbose=getattr(args, "verbose", False),
+        debug_preprocess=getattr(args, "debug_preprocess", False),
+        filter_active=filter_active,
+        project_roots=tuple(project_roots),
+        tu_cache_dir=tu_cache.default_tu_cache_dir() if getattr(args, "tu_cache", False) else None,
+    )
 
     # ============================
     # CALLGRAPH-ONLY EARLY RETURN
@@ -597,27 +1022,14 @@ def run_finder(args) -> Optional[Path]:
         function_defs_by_key: Dict[str, FunctionDef] = {}
         tu_reports: List[TranslationUnitReport] = []
 
-        for src, clang_args in file_to_args.items():
-            if getattr(args, "verbose", False):
-                eprint(f"[callgraph] parsing {src}")
-
-            tu, tu_report = _parse_translation_unit(
-                src,
-                clang_args,
-                verbose=getattr(args, "verbose", False),
-                debug_preprocess=getattr(args, "debug_preprocess", False),
-            )
-            tu_reports.append(tu_report)
-            if tu is None:
-                continue
-
-            for fn_def in collect_function_defs_for_tu(tu):
-                if filter_active and not _is_in_project(fn_def.file or str(src)):
-                    continue
+        worker = functools.partial(_collect_callgraph_tu, options=job_options)
+        # No run-wide dedup set here: each TU's edges are already unique, and
+        # write_callgraph drops repeats across TUs with digest keys as it writes.
+        for res in _map_translation_units(worker, tu_jobs, jobs):
+            tu_reports.append(res.tu_report)
+            for fn_def in res.function_defs:
                 function_defs_by_key.setdefault(fn_def.function_key, fn_def)
-
-            edges_tu, _seen_tu = collect_callgraph_for_tu_detailed(tu, translation_unit=str(src))
-            callgraph_edges.extend(edges_tu)
+            callgraph_edges.extend(res.edges)
 
         if getattr(args, "callgraph_only", False):
             out_dir = Path(args.callgraph_out)
@@ -687,22 +1099,22 @@ def run_finder(args) -> Optional[Path]:
             for cat, vals in catalog.categories.items():
                 if cat != "system_calls":
                     keep_targets |= set(vals)
-            catalog.target_names = keep_targets
+            catalog.target_names = frozenset(keep_targets)
         else:
-            catalog.target_names = set(catalog.libc)
+            catalog.target_names = catalog.libc
     elif args.only_syscalls:
         if getattr(catalog, "categories", None) and "system_calls" in catalog.categories:
-            catalog.target_names = set(catalog.categories.get("system_calls", set()))
+            catalog.target_names = frozenset(catalog.categories.get("system_calls", set()))
         else:
-            catalog.target_names = set(catalog.syscalls)
+            catalog.target_names = catalog.syscalls
     else:
         if getattr(catalog, "categories", None):
             all_union: Set[str] = set()
             for vals in catalog.categories.values():
                 all_union |= set(vals)
-            catalog.target_names = all_union
+            catalog.target_names = frozenset(all_union)
         else:
-            catalog.target_names = set().union(catalog.libc, catalog.syscalls)
+            catalog.target_names = catalog.libc | catalog.syscalls
 
     rows: List[Row] = []
     rows_by_identity: Dict[str, Row] = {}
@@ -712,250 +1124,64 @@ def run_finder(args) -> Optional[Path]:
     direct_targets_by_function: Dict[str, List[str]] = defaultdict(list)
     tu_reports: List[TranslationUnitReport] = []
 
-    for src, clang_args in file_to_args.items():
-        if getattr(args, "verbose", False):
-            eprint(f"[processing] {src}")
-            eprint(f"[debug] Clang args for {src}:")
-            for a in clang_args:
-                eprint(f"  {a}")
-
-        tu, tu_report = _parse_translation_unit(
-            src,
-            clang_args,
-            verbose=getattr(args, "verbose", False),
-            debug_preprocess=getattr(args, "debug_preprocess", False),
-        )
-        tu_reports.append(tu_report)
-        if tu is None:
-            continue
-
-        for cursor in tu.cursor.walk_preorder():
-            if not _is_callable_definition(cursor):
-                continue
-
-            func_name = _caller_name(cursor)
-            loc = cursor.location
-            func_file = loc.file.name if (loc and loc.file) else str(src)
-            func_loc = f"{func_file}:{loc.line}" if (loc and loc.file) else "-"
-
-            if filter_active:
-                try:
-                    exp = cursor.extent.start.file
-                    exp_path = exp.name if exp is not None else func_file
-                except Exception:
-                    exp_path = func_file
-                if not _is_in_project(exp_path):
-                    if getattr(args, "verbose", False):
-                        eprint(f"[skip:out-of-project] {func_name} @ {exp_path}")
-                    continue
-
-            func_key = _function_key(cursor)
+    job_options = dataclasses.replace(
+        job_options,
+        catalog=catalog,
+        mode_eff=_LEGACY_MODES.get(args.mode, args.mode),
+        treat_thin_alias=getattr(args, "treat_thin_alias", "default"),
+    )
+    worker = functools.partial(_analyze_wrapper_tu, options=job_options)
+    for res in _map_translation_units(worker, tu_jobs, jobs):
+        tu_reports.append(res.tu_report)
+        for func_key, func_name in res.function_names:
             function_name_by_key[func_key] = func_name
-            project_function_defs_by_key.setdefault(
-                func_key,
-                FunctionDef(
-                    function_key=func_key,
-                    function=func_name,
-                    file=str(Path(func_file).resolve()) if func_file not in ("", "-") else "",
-                    line=int(getattr(loc, "line", 0) or 0),
-                ),
-            )
-
-            try:
-                for call_cur, _loc in collect_target_calls(cursor, catalog.target_names):
-                    resolved_name = _resolve_target_name_for_call(call_cur, catalog)
-                    if resolved_name and resolved_name in catalog.target_names:
-                        direct_targets_by_function[func_key].append(resolved_name)
-            except Exception:
-                pass
-
-            keep = False
-            per_path_single = False
-            total_hits = 0
-            reason = "n/a"
-            hit_locs: List[str] = []
-            api_name: Optional[str] = None
-            derived_ok = True
-            deriv_trace: List[str] = []
-            pair_used = False
-            via_helper_hop = False
-            ignored_helpers: List[str] = []
-
-            legacy_map = {
-                "perpath_relaxed": "relaxed",
-                "single": "accurate",
-                "perpath": "accurate",
-                "perpath_strict_plus": "accurate",
-            }
-            mode_eff = legacy_map.get(args.mode, args.mode)
-
-            if mode_eff == "relaxed":
-                (keep,
-                 per_path_single,
-                 total_hits,
-                 reason,
-                 hit_locs,
-                 api_name,
-                 derived_ok,
-                 deriv_trace,
-                 pair_used,
-                 via_helper_hop,
-                 ignored_helpers) = analyze_wrapper_relaxed(cursor, catalog)
-
-            elif mode_eff == "accurate":
-                (keep,
-                 per_path_single,
-                 total_hits,
-                 reason,
-                 hit_locs,
-                 api_name,
-                 derived_ok,
-                 deriv_trace,
-                 pair_used,
-                 via_helper_hop,
-                 ignored_helpers) = analyze_wrapper_strict_plus(cursor, catalog, getattr(args, "treat_thin_alias", "default"))
-
-            else:  # mode_eff == "all"
-                hits = collect_target_calls(cursor, catalog.target_names)
-                apis: List[str] = []
-                hit_locs = []
-                for call, loc in hits:
-                    nm = _resolve_target_name_for_call(call, catalog)
-                    if nm:
-                        apis.append(nm)
-                        hit_locs.append(loc)
-                total_hits = len(apis)
-                if total_hits > 0:
-                    (keep,
-                     per_path_single,
-                     _th,
-                     reason,
-                     _hl,
-                     api_name,
-                     derived_ok,
-                     deriv_trace,
-                     pair_used,
-                     via_helper_hop,
-                     ignored_helpers) = analyze_wrapper_strict_plus(cursor, catalog, getattr(args, "treat_thin_alias", "default"))
-                    if not api_name and apis:
-                        api_name = apis[0]
-                else:
-                    keep = True
-                    per_path_single = True
-                    reason = "N/A"
-                    api_name = None
-                    derived_ok = False
-                    deriv_trace = []
-                    pair_used = False
-                    via_helper_hop = False
-                    ignored_helpers = []
-
-            if mode_eff in ("relaxed", "accurate"):
-                if (not keep) or (total_hits == 0) or (not api_name) or (api_name not in catalog.target_names):
-                    continue
-
-            r = Row(
-                file=func_file,
-                function=func_name,
-                function_key=func_key,
-                api_called=(api_name or "other") if mode_eff == "all" and not api_name else (api_name or ""),
-                category=(catalog.category_of(api_name or "") if (api_name and api_name in catalog.target_names) else ("N/A" if (mode_eff == "all" and not api_name) else catalog.category_of(api_name or ""))),
-                total_target_calls=total_hits,
-                hit_locs=hit_locs,
-                per_path_single=per_path_single,
-                derived_from_params=derived_ok,
-                derivation_trace=deriv_trace,
-                reason=("N/A" if (mode_eff == "all" and not api_name) else (reason if reason != "n/a" else ("ok" if keep else "-"))),
-                function_loc=func_loc,
-                pair_used=pair_used,
-                via_helper_hop=via_helper_hop,
-                ignored_helpers=ignored_helpers or [],
-                family=("thin_alias" if (api_name and api_name in (catalog.thin_aliases or set())) else "-"),
-                is_thin_alias=bool(api_name and api_name in (catalog.thin_aliases or set())),
-            )
+        for fn_def in res.function_defs:
+            project_function_defs_by_key.setdefault(fn_def.function_key, fn_def)
+        for func_key, names in res.direct_targets.items():
+            direct_targets_by_function[func_key].extend(names)
+        for r, passes in res.rows:
             rid = _row_identity(r)
             if rid in rows_by_identity:
                 _merge_rows(rows_by_identity[rid], r)
             else:
                 rows_by_identity[rid] = r
                 rows.append(r)
-            try:
-                if mode_eff == "all" and not api_name:
-                    rows_by_identity[rid].arg_pass = "N/A"
-                    rows_by_identity[rid].ret_pass = "N/A"
-                else:
-                    matching_calls: List[cindex.Cursor] = []
-                    for call_cur, _loc in collect_target_calls(cursor, catalog.target_names):
-                        resolved = _resolve_target_name_for_call(call_cur, catalog)
-                        if resolved == api_name:
-                            matching_calls.append(call_cur)
-                    arg_pass, ret_pass = compute_arg_ret_pass_multi(cursor, matching_calls)
-                    rows_by_identity[rid].arg_pass = arg_pass
-                    rows_by_identity[rid].ret_pass = ret_pass
-            except Exception:
-                pass
-
-        try:
-            edges_tu, _seen_tu = collect_callgraph_for_tu_detailed(tu, translation_unit=str(src))
-            all_edges.extend(edges_tu)
-        except Exception:
-            pass
+            if passes is not None:
+                rows_by_identity[rid].arg_pass, rows_by_identity[rid].ret_pass = passes
+        all_edges.extend(res.edges)
 
     project_defs_by_key, project_keys_by_name = build_function_index(project_function_defs_by_key.values())
-    callers_by_callee: Dict[str, Set[str]] = defaultdict(set)
-    callees_by_caller: Dict[str, Set[str]] = defaultdict(set)
-
-    for e in all_edges:
-        raw_caller_key = str(getattr(e, "caller_key", None) or getattr(e, "caller", "") or "")
-        raw_caller_name = str(getattr(e, "caller", "") or "")
-        raw_callee_key = str(getattr(e, "callee_key", None) or getattr(e, "callee", "") or "")
-        raw_callee_name = str(getattr(e, "callee", "") or "")
-
-        caller_k, _caller_match = resolve_project_function_key(
-            getattr(e, "caller_key", None),
-            getattr(e, "caller", ""),
-            project_defs_by_key,
-            project_keys_by_name,
-        )
-        callee_k, _callee_match = resolve_project_function_key(
-            getattr(e, "callee_key", None),
-            getattr(e, "callee", ""),
-            project_defs_by_key,
-            project_keys_by_name,
-        )
-        caller_identity = caller_k or raw_caller_key or raw_caller_name
-        callee_identity = callee_k or raw_callee_key or raw_callee_name
-
-        if callee_k and caller_identity:
-            callers_by_callee[callee_k].add(caller_identity)
-        if caller_k and callee_identity:
-            callees_by_caller[caller_k].add(callee_identity)
+    callers_by_callee, callees_by_caller, direct_names_by_caller, project_callees_by_caller = _group_edges(
+        all_edges, project_defs_by_key, project_keys_by_name
+    )
 
     traced_targets_by_function = _trace_reachable_target_apis(
         all_edges=all_edges,
         direct_targets_by_function=direct_targets_by_function,
         function_name_by_key=function_name_by_key,
     )
-    reachable_callee_names_by_function = _trace_reachable_callee_names(all_edges, project_defs_by_key)
+    reachable_callee_names_by_function = _reachable_callee_names(
+        direct_names_by_caller, project_callees_by_caller, project_defs_by_key
+    )
 
+    # One pass over the rows: traced APIs, then fan-in/out and callees.
+    empty: FrozenSet[str] = frozenset()
+    traced_of = traced_targets_by_function.get
+    callers_of = callers_by_callee.get
+    callees_of = callees_by_caller.get
+    reachable_of = reachable_callee_names_by_function.get
     for r in rows:
-        row_key = r.function_key or ""
-        traced = list(traced_targets_by_function.get(row_key, []))
-        combined = [*_split_api_names(r.api_called), *traced]
+        combined = [*_split_api_names(r.api_called), *traced_of(r.function_key or "", ())]
         if combined:
             r.api_called = _join_api_names(combined)
             if r.total_target_calls <= 0:
                 r.total_target_calls = len(_unique_in_order(combined))
             r.category = _select_category_from_api_called(r.api_called, catalog, r.category)
 
-    for r in rows:
         key = r.function_key or r.function
-        fin = len(callers_by_callee.get(key, set()))
-        fout = len(callees_by_caller.get(key, set()))
-        r.fan_in = fin
-        r.fan_out = fout
-        names = list(reachable_callee_names_by_function.get(key, []))
-        r.callees = names
+        r.fan_in = len(callers_of(key, empty))
+        r.fan_out = len(callees_of(key, empty))
+        r.callees = list(reachable_of(key, ()))
 
     if getattr(args, "callgraph_out", None):
         try:
@@ -993,13 +1219,13 @@ def run_finder(args) -> Optional[Path]:
         agg_counts: Dict[str, int] = defaultdict(int)
         agg_callers: Dict[str, Set[str]] = defaultdict(set)
         for e in all_edges:
-            ck = getattr(e, "callee_key", None) or getattr(e, "callee", None) or "<unknown>"
-            ak = getattr(e, "caller_key", None) or getattr(e, "caller", None) or "<unknown>"
+            ck = e.callee_key or e.callee or "<unknown>"
+            ak = e.caller_key or e.caller or "<unknown>"
             agg_counts[ck] += 1
             agg_callers[ck].add(ak)
 
         def top_n(d: Dict[str, int], n: int = 10):
-            return sorted(d.items(), key=lambda x: (-x[1], x[0]))[:n]
+            return heapq.nsmallest(n, d.items(), key=lambda x: (-x[1], x[0]))
 
         print("\n[summary] run metrics:")
         print(f"  files processed: {files_processed}")
@@ -1012,8 +1238,9 @@ def run_finder(args) -> Optional[Path]:
             print(f"    {k}: total_calls={v}, unique_callers={uniq}")
 
         if rows:
-            by_fan_in = sorted(rows, key=lambda r: (-r.fan_in, r.function_key or r.function))[:10]
-            by_fan_out = sorted(rows, key=lambda r: (-r.fan_out, r.function_key or r.function))[:10]
+            # Only the top ten are printed; no need to sort every row twice.
+            by_fan_in = heapq.nsmallest(10, rows, key=lambda r: (-r.fan_in, r.function_key or r.function))
+            by_fan_out = heapq.nsmallest(10, rows, key=lambda r: (-r.fan_out, r.function_key or r.function))
             print("  top wrapper candidates by fan_in:")
             for r in by_fan_in:
                 print(f"    {r.function_key or r.function}: fan_in={r.fan_in}, fan_out={r.fan_out}, file={r.file}")
@@ -0,0 +1,182 @@
+"""On-disk cache of parsed translation units and shared precompiled headers (libclang AST files)."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cwrappers.finder.clang_bootstrap import cindex
+from cwrappers.finder.models import TranslationUnitReport
+
+# Bumped whenever the manifest layout or what goes into the key changes.
+_FORMAT_VERSION = "1"
+
+
+def default_tu_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "cwrappers" / "tu"
+
+
+def default_pch_dir() -> Path:
+    return default_tu_cache_dir().parent / "pch"
+
+
+def _file_stamp(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _include_stamps(tu: cindex.TranslationUnit, main_file: Path) -> Optional[Dict[str, List[int]]]:
+    """Stamps of main_file and every file tu included, or None if one cannot be read."""
+    stamps: Dict[str, Optional[List[int]]] = {str(main_file): _file_stamp(str(main_file))}
+    for inc in tu.get_includes():
+        name = str(inc.include.name)
+        if name not in stamps:
+            stamps[name] = _file_stamp(name)
+    if any(stamp is None for stamp in stamps.values()):
+        return None
+    return stamps  # type: ignore[return-value]
+
+
+def _stamps_current(stamps: Dict[str, List[int]]) -> bool:
+    return all(_file_stamp(path) == stamp for path, stamp in stamps.items())
+
+
+def _cache_paths(cache_dir: Path, src: Path, clang_args: Sequence[str], options: int) -> Tuple[Path, Path]:
+    h = hashlib.blake2b(digest_size=20)
+    for part in (_FORMAT_VERSION, str(src), str(options), *clang_args):
+        h.update(part.encode("utf-8", "surrogateescape"))
+        h.update(b"\0")
+    key = h.hexdigest()
+    return cache_dir / f"{key}.ast", cache_dir / f"{key}.json"
+
+
+def load_cached_tu(
+    cache_dir: Path,
+    src: Path,
+    clang_args: Sequence[str],
+    options: int,
+    index: cindex.Index,
+) -> Optional[Tuple[cindex.TranslationUnit, TranslationUnitReport]]:
+    """Return the cached TU and its parse report, or None if missing or stale.
+
+    An entry is stale once the source or any file it included has a different
+    mtime/size than when it was saved. The report is stored alongside because
+    a TU loaded from an AST file carries no diagnostics.
+    """
+    ast_path, manifest_path = _cache_paths(cache_dir, src, clang_args, options)
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    stamps: Dict[str, List[int]] = manifest.get("files") or {}
+    if stamps.get(str(src)) is None or not _stamps_current(stamps):
+        return None
+    try:
+        report = TranslationUnitReport(**manifest["report"])
+        tu = cindex.TranslationUnit.from_ast_file(str(ast_path), index)
+    except Exception:
+        return None
+    return tu, report
+
+
+def store_tu(
+    cache_dir: Path,
+    src: Path,
+    clang_args: Sequence[str],
+    options: int,
+    tu: cindex.TranslationUnit,
+    report: TranslationUnitReport,
+) -> None:
+    """Save tu and its report; failures are ignored (the cache is best-effort)."""
+    ast_path, manifest_path = _cache_paths(cache_dir, src, clang_args, options)
+    # Written to temporaries and renamed, so concurrent runs never see half a file.
+    tmp_ast = ast_path.with_name(f"{ast_path.name}.{os.getpid()}.tmp")
+    tmp_manifest = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    try:
+        stamps = _include_stamps(tu, src)
+        if stamps is None:
+            return
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tu.save(str(tmp_ast))
+        with open(tmp_manifest, "w", encoding="utf-8") as fh:
+            json.dump({"files": stamps, "report": dataclasses.asdict(report)}, fh)
+        os.replace(tmp_ast, ast_path)
+        os.replace(tmp_manifest, manifest_path)
+    except Exception:
+        for tmp in (tmp_ast, tmp_manifest):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def build_common_pch(header: Path, clang_args: Sequence[str], out_dir: Path) -> Optional[Path]:
+    """Precompile header under clang_args, returning the PCH path or None if it fails.
+
+    A manifest keyed on the header and the flags records the mtime/size of the
+    header and every file it includes. The PCH is reused only while all of them
+    are unchanged; otherwise it is rebuilt under a new name, so TUs that pass it
+    with -include-pch also get new TU cache keys.
+    """
+    if _file_stamp(str(header)) is None:
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    for part in (_FORMAT_VERSION, str(header), *clang_args):
+        h.update(part.encode("utf-8", "surrogateescape"))
+        h.update(b"\0")
+    key = h.hexdigest()
+    manifest_path = out_dir / f"{key}.json"
+    old_pch: Optional[Path] = None
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        old_pch = out_dir / manifest["pch"]
+        if _stamps_current(manifest["files"]) and old_pch.is_file():
+            return old_pch
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    tmp = out_dir / f"{key}.{os.getpid()}.tmp"
+    tmp_manifest = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    try:
+        tu = cindex.Index.create().parse(
+            str(header),
+            args=[*clang_args, "-x", "c-header"],
+            options=cindex.TranslationUnit.PARSE_INCOMPLETE | cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
+        )
+        if any(d.severity >= 3 for d in tu.diagnostics):
+            return None
+        stamps = _include_stamps(tu, header)
+        if stamps is None:
+            return None
+        sh = hashlib.blake2b(digest_size=8)
+        sh.update(json.dumps(stamps, sort_keys=True).encode("utf-8", "surrogateescape"))
+        pch_path = out_dir / f"{key}-{sh.hexdigest()}.pch"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        tu.save(str(tmp))
+        os.replace(tmp, pch_path)
+        with open(tmp_manifest, "w", encoding="utf-8") as fh:
+            json.dump({"files": stamps, "pch": pch_path.name}, fh)
+        os.replace(tmp_manifest, manifest_path)
+    except Exception:
+        for t in (tmp, tmp_manifest):
+            try:
+                t.unlink()
+            except OSError:
+                pass
+        return None
+    if old_pch is not None and old_pch != pch_path:
+        try:
+            old_pch.unlink()
+        except OSError:
+            pass
+    return pch_path
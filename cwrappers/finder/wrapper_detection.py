@@ -16,7 +16,7 @@ from cwrappers.finder.analysis import (
     is_helper_call,
     resolve_syscall_indirection,
 )
-from cwrappers.finder.ast_utils import _callee_name, _function_body_cursor
+from cwrappers.finder.ast_utils import _call_line_col, _callee_name, _function_body_cursor
 from cwrappers.finder.catalog import ApiCatalog
 from cwrappers.finder.clang_bootstrap import cindex, K
 from cwrappers.finder.provenance import check_arguments_provenance
@@ -63,8 +63,13 @@ def analyze_wrapper_strict_plus(func_cursor: cindex.Cursor,
 
     def walk_calls(n: cindex.Cursor) -> None:
         nonlocal via_helper_hop
-        for ch in n.get_children():
-            if ch.kind == K.CALL_EXPR:
+        # Preorder walk with an explicit stack (same visit order as recursion).
+        call_kind = K.CALL_EXPR
+        stack = list(n.get_children())
+        stack.reverse()
+        while stack:
+            ch = stack.pop()
+            if ch.kind == call_kind:
                 if is_helper_call(ch, helpers):
                     nm = _callee_name(ch) or "<anon>"
                     ignored_helpers.add(nm)
@@ -72,58 +77,63 @@ def analyze_wrapper_strict_plus(func_cursor: cindex.Cursor,
                     nm = _callee_name(ch)
                     if nm in targets:
                         apis.append(nm)
-                        loc = ch.location
-                        if loc and loc.file:
-                            hit_locs.append(f"{loc.line}:{loc.column}")
+                        loc = _call_line_col(ch)
+                        if loc:
+                            hit_locs.append(loc)
                     else:
                         mapped = resolve_syscall_indirection(ch)
                         if mapped and mapped in targets:
                             apis.append(mapped)
-                            loc = ch.location
-                            if loc and loc.file:
-                                hit_locs.append(f"{loc.line}:{loc.column}")
+                            loc = _call_line_col(ch)
+                            if loc:
+                                hit_locs.append(loc)
                         else:
                             if _call_hits_target_via_one_hop(ch, targets):
                                 via_helper_hop = True
                                 inner = _inner_target_from_one_hop(ch, targets)
                                 if inner and inner in targets:
                                     apis.append(inner)
-                                loc = ch.location
-                                if loc and loc.file:
-                                    hit_locs.append(f"{loc.line}:{loc.column}")
+                                loc = _call_line_col(ch)
+                                if loc:
+                                    hit_locs.append(loc)
                             elif _call_hits_target_via_n_hops(ch, targets, 2):
                                 via_helper_hop = True
                                 via_hop_depth_ge2 = True
                                 inner = _inner_target_from_one_hop(ch, targets)
                                 if inner and inner in targets:
                                     apis.append(inner)
-                                loc = ch.location
-                                if loc and loc.file:
-                                    hit_locs.append(f"{loc.line}:{loc.column}")
-            walk_calls(ch)
+                                loc = _call_line_col(ch)
+                                if loc:
+                                    hit_locs.append(loc)
+            children = list(ch.get_children())
+            if children:
+                children.reverse()
+                stack.extend(children)
 
     walk_calls(body)
+    # Rejections below still report the helpers seen (mode=all keeps those rows).
+    ignored_sorted = sorted(ignored_helpers) if ignored_helpers else []
 
     total_hits = len(hit_locs)
     if total_hits == 0:
-        return (False, False, 0, "no-calls", [], None, False, [], False, via_helper_hop, sorted(ignored_helpers))
+        return (False, False, 0, "no-calls", [], None, False, [], False, via_helper_hop, ignored_sorted)
 
     if apis:
         first_api = apis[0]
-        if first_api and first_api in (catalog.thin_aliases or set()):
+        if first_api and first_api in (catalog.thin_aliases or frozenset()):
             pol = thin_policy or "default"
             if pol in ("default", "direct-only"):
                 if via_helper_hop:
                     return (False, False, total_hits, "reject: thin-alias-via-helper", hit_locs, first_api,
-                            False, [], False, via_helper_hop, sorted(ignored_helpers))
+                            False, [], False, via_helper_hop, ignored_sorted)
             elif pol == "allow-1-hop":
                 if via_hop_depth_ge2:
                     return (False, False, total_hits, "reject: thin-alias-hop-depth>=2", hit_locs, first_api,
-                            False, [], False, via_helper_hop, sorted(ignored_helpers))
+                            False, [], False, via_helper_hop, ignored_sorted)
 
     if max_pos >= 2 and not (total_hits == 2 and is_atomic_pair(apis, "")):
         return (False, False, total_hits, "reject: multi-call-per-path", hit_locs, (apis[0] if apis else None),
-                False, [], False, via_helper_hop, sorted(ignored_helpers))
+                False, [], False, via_helper_hop, ignored_sorted)
     elif max_pos >= 2:
         pair_used = True
 
@@ -140,7 +150,7 @@ def analyze_wrapper_strict_plus(func_cursor: cindex.Cursor,
     per_path_single = True
     api_called = apis[0] if apis else None
     return (True, per_path_single, total_hits, reason, hit_locs, api_called, derived_ok, derivation_trace,
-        pair_used, via_helper_hop, sorted(ignored_helpers))
+        pair_used, via_helper_hop, ignored_sorted)
 
 
 # ==========================
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, FrozenSet, List, Set
 
 import yaml
 
+try:  # libyaml bindings, when PyYAML was built with them
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - pure-Python fallback
+    from yaml import SafeLoader as _SafeLoader
+
 from cwrappers.fuzzy.normalize import normalize
 from cwrappers.shared.paths import default_catalog_path
 
@@ -17,6 +22,38 @@ from cwrappers.shared.paths import default_catalog_path
 class CanonSet:
     key: str
     candidates: List[str]
+    # Derived from candidates[0], which every function name is scored against.
+    primary: str = field(init=False, repr=False, compare=False)
+    primary_tokens: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    primary_len: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.primary = self.candidates[0] if self.candidates else ""
+        self.primary_tokens = frozenset(self.primary.split())
+        self.primary_len = len(self.primary)
+
+
+@dataclass
+class CanonIndex:
+    """Positions in a canon-set list, by primary candidate and by its 3-grams.
+
+    A name can only reach the scoring cut (a common substring of length 3, or an
+    exact match) against candidates listed here under one of its 3-grams or its
+    whole normalized form.
+    """
+    by_candidate: Dict[str, List[int]]
+    by_trigram: Dict[str, List[int]]
+
+
+def build_canon_index(canon_sets: List[CanonSet]) -> CanonIndex:
+    by_candidate: Dict[str, List[int]] = {}
+    by_trigram: Dict[str, List[int]] = {}
+    for i, cs in enumerate(canon_sets):
+        cand = cs.primary
+        by_candidate.setdefault(cand, []).append(i)
+        for tri in {cand[j:j + 3] for j in range(len(cand) - 2)}:
+            by_trigram.setdefault(tri, []).append(i)
+    return CanonIndex(by_candidate=by_candidate, by_trigram=by_trigram)
 
 
 def _candidate_yaml_paths(yaml_path: str | None) -> List[str]:
@@ -68,7 +105,7 @@ def build_canon_sets(yaml_path: str | None = None) -> List[CanonSet]:
         tried.append(p)
         try:
             with open(p, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
+                cfg = yaml.load(f, Loader=_SafeLoader) or {}
                 yaml_path = p
                 break
         except Exception:
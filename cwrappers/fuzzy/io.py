@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import csv
+import functools
 import os
 import re
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 
-from cwrappers.fuzzy.canon import build_canon_sets
+from cwrappers.fuzzy.canon import build_canon_index, build_canon_sets
 from cwrappers.fuzzy.scoring import (
     MatchScore,
     best_strong_api_called_match,
@@ -19,65 +21,70 @@ from cwrappers.fuzzy.scoring import (
 from cwrappers.finder.catalog import load_api_catalog
 
 
+# Normalized header spellings for each column we use, in lookup priority order.
+# A column resolves to the earliest header position matching any of its spellings.
+_COLUMN_ALIASES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("function", ("function", "func", "symbol")),
+    ("function_loc", ("function_loc", "functionloc", "function_location")),
+    ("file", ("file", "filepath", "path", "filename", "source", "source_file", "location")),
+    ("fan_in", ("fan_in", "fanin")),
+    ("fan_out", ("fan_out", "fanout")),
+    ("callee", ("callee",)),
+    ("api_called", ("api_called", "api", "target", "called_api")),
+    ("category", ("category", "cat", "group")),
+    ("reason", ("reason",)),
+    ("arg_pass", ("arg_pass", "argpass", "arg_passed", "args_pass")),
+    ("ret_pass", ("ret_pass", "retpass", "return_pass", "ret_passed")),
+)
+
+# Hyphens, spaces and runs of underscores all collapse to a single underscore.
+_HEADER_SEP_RE = re.compile(r"[- _]+")
+
+
+def _norm_header(h: str) -> str:
+    h = h.lstrip("\ufeff").strip().lower()
+    return _HEADER_SEP_RE.sub("_", h)
+
+
+@functools.lru_cache(maxsize=64)
+def _detect_cols_cached(header: Tuple[str, ...]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    lower_to_idx: Dict[str, int] = {}
+    for i, h in enumerate(header):
+        lower_to_idx.setdefault(_norm_header(h), i)
+
+    found: Dict[str, Optional[int]] = {}
+    for col, options in _COLUMN_ALIASES:
+        hits = [lower_to_idx[o] for o in options if o in lower_to_idx]
+        found[col] = min(hits) if hits else None
+    if found["file"] is None:
+        found["file"] = found["function_loc"]
+
+    order = ("function", "file", "function_loc", "fan_in", "fan_out", "callee",
+             "api_called", "category", "reason", "arg_pass", "ret_pass")
+    return tuple((col, found[col]) for col in order)
+
+
 def detect_cols(header: List[str]) -> Dict[str, Optional[int]]:
     """Detect indices for columns we use."""
-    def norm_header(h: str) -> str:
-        if h is None:
-            return ""
-        h = h.lstrip("\ufeff").strip().lower()
-        h = h.replace("-", "_").replace(" ", "_")
-        h = re.sub(r"_+", "_", h)
-        return h
-
-    names = [h.strip() if isinstance(h, str) else "" for h in header]
-    lower = [norm_header(h) for h in names]
-
-    def find_one(options: List[str]) -> Optional[int]:
-        for i, h in enumerate(lower):
-            if h in options:
-                return i
-        return None
-
-    def first_not_none(*vals: Optional[int]) -> Optional[int]:
-        for v in vals:
-            if v is not None:
-                return v
-        return None
-
-    func_idx = find_one(["function", "func", "symbol"])
-    function_loc_idx = find_one(["function_loc", "functionloc", "function_location"])
-    file_idx = first_not_none(
-        find_one(["file", "filepath", "path", "filename", "source", "source_file", "location"]),
-        function_loc_idx,
-    )
-    fan_in_idx = first_not_none(
-        find_one(["fan_in", "fanin"]),
-        find_one(["fan-in"]),
-    )
-    fan_out_idx = first_not_none(
-        find_one(["fan_out", "fanout"]),
-        find_one(["fan-out"]),
-    )
-    callee_idx = find_one(["callee"])
-    api_called_idx = find_one(["api_called", "api", "target", "called_api"])
-    category_idx = find_one(["category", "cat", "group"])
-    reason_idx = find_one(["reason"])
-    arg_pass_idx = find_one(["arg_pass", "argpass", "arg_passed", "args_pass"])
-    ret_pass_idx = find_one(["ret_pass", "retpass", "return_pass", "ret_passed"])
-
-    return {
-        "function": func_idx,
-        "file": file_idx,
-        "function_loc": function_loc_idx,
-        "fan_in": fan_in_idx,
-        "fan_out": fan_out_idx,
-        "callee": callee_idx,
-        "api_called": api_called_idx,
-        "category": category_idx,
-        "reason": reason_idx,
-        "arg_pass": arg_pass_idx,
-        "ret_pass": ret_pass_idx,
-    }
+    names = tuple(h.strip() if isinstance(h, str) else "" for h in header)
+    return dict(_detect_cols_cached(names))
+
+
+# Scored CSVs are written in one pass; a large buffer keeps write syscalls few.
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def _parse_count(value: str) -> int:
+    """Parse a fan-in/fan-out cell; anything that is not an integer counts as 0."""
+    v = value.strip()
+    # An integer literal always ends in a digit, so blank/"-"/"n/a" cells are
+    # rejected without raising and catching a ValueError.
+    if not v or not v[-1].isdigit():
+        return 0
+    try:
+        return int(v)
+    except ValueError:
+        return 0
 
 
 def _reason_score(reason: str) -> float:
@@ -146,11 +153,12 @@ def process_csv(inp_path: str,
                 out_path: Optional[str] = None,
                 out_dir: Optional[str] = None) -> str:
     canon_sets = build_canon_sets(yaml_path)
+    canon_index = build_canon_index(canon_sets)
     catalog = _load_catalog_with_fallback(yaml_path)
     out_path = output_path(inp_path, out_path=out_path, out_dir=out_dir)
 
     with open(inp_path, "r", newline="", encoding="utf-8") as f_in, \
-         open(out_path, "w", newline="", encoding="utf-8") as f_out:
+         open(out_path, "w", newline="", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE) as f_out:
         rdr = csv.reader(f_in)
         w = csv.writer(f_out)
 
@@ -193,18 +201,8 @@ def process_csv(inp_path: str,
             reason = row[reason_idx] if (reason_idx is not None and reason_idx < len(row)) else ""
             arg_pass = row[arg_pass_idx] if (arg_pass_idx is not None and arg_pass_idx < len(row)) else ""
             ret_pass = row[ret_pass_idx] if (ret_pass_idx is not None and ret_pass_idx < len(row)) else ""
-            fan_in = 0
-            fan_out = 0
-            if fan_in_idx is not None and fan_in_idx < len(row):
-                try:
-                    fan_in = int(str(row[fan_in_idx]).strip())
-                except Exception:
-                    fan_in = 0
-            if fan_out_idx is not None and fan_out_idx < len(row):
-                try:
-                    fan_out = int(str(row[fan_out_idx]).strip())
-                except Exception:
-                    fan_out = 0
+            fan_in = _parse_count(row[fan_in_idx]) if (fan_in_idx is not None and fan_in_idx < len(row)) else 0
+            fan_out = _parse_count(row[fan_out_idx]) if (fan_out_idx is not None and fan_out_idx < len(row)) else 0
 
             raw.append({
                 "location": loc_str,
@@ -221,15 +219,26 @@ def process_csv(inp_path: str,
 
         fan_in_high = _fan_in_high_threshold(raw)
         out_rows: List[Tuple[Tuple[int, int, float, str], List[object]]] = []
+        # Function names repeat across rows (one row per wrapped API), and the
+        # fuzzy verdicts depend only on the name (and api_called), so compute
+        # each one once per distinct key.
+        best_by_function: Dict[str, MatchScore] = {}
+        strong_by_function: Dict[str, bool] = {}
+        api_match_by_pair: Dict[Tuple[str, str], str] = {}
         for r in raw:
-            scores = top_k_scores(r["function"], canon_sets, k=top_k)
-            if not scores:
-                scores = [MatchScore(key="", best_match="", exact=False, token_equal=False, lcs_len=0, combined=0.0, rf_score=0.0)]
-            best = scores[0]
+            best = best_by_function.get(r["function"])
+            if best is None:
+                scores = top_k_scores(r["function"], canon_sets, k=top_k, index=canon_index)
+                if not scores:
+                    scores = [MatchScore(key="", best_match="", exact=False, token_equal=False, lcs_len=0, combined=0.0, rf_score=0.0)]
+                best = best_by_function[r["function"]] = scores[0]
 
             category_out = r["category"]
             if catalog is not None:
-                matched_api = best_strong_api_called_match(r["function"], r.get("api_called", ""))
+                pair = (r["function"], r.get("api_called", ""))
+                matched_api = api_match_by_pair.get(pair)
+                if matched_api is None:
+                    matched_api = api_match_by_pair[pair] = best_strong_api_called_match(*pair)
                 if matched_api:
                     mapped = catalog.category_of(matched_api)
                     if mapped and mapped != "unknown":
@@ -254,10 +263,14 @@ def process_csv(inp_path: str,
             )
 
             fuzzy_match_out = best.key
-            if (not has_traced_catalog_api(r["api_called"], category_out)) and (
-                not is_strong_fuzzy_without_api(r["function"], best.key, best.combined, best.rf_score)
-            ):
-                fuzzy_match_out = "NO_MATCH"
+            if not has_traced_catalog_api(r["api_called"], category_out):
+                strong = strong_by_function.get(r["function"])
+                if strong is None:
+                    strong = strong_by_function[r["function"]] = is_strong_fuzzy_without_api(
+                        r["function"], best.key, best.combined, best.rf_score
+                    )
+                if not strong:
+                    fuzzy_match_out = "NO_MATCH"
 
             out_row = [
                 f"{int(round(wscore * 100))}%",
@@ -292,14 +305,13 @@ def process_csv(inp_path: str,
             sort_key = (tier, -fan_in_val, -wscore, str(r["function"]))
             out_rows.append((sort_key, out_row))
 
-        out_rows.sort(key=lambda t: t[0])
+        out_rows.sort(key=itemgetter(0))
 
         out_header = [
             "likelihood_score", "function", "api_called", "fuzzy_match", "category", "fan_in", "callee", "arg_pass", "ret_pass", "location",
         ]
         w.writerow(out_header)
-        for _, values in out_rows:
-            w.writerow(values)
+        w.writerows(values for _, values in out_rows)
 
     print(f"[ok] processed: {inp_path}")
     print(f"[ok] wrote:      {out_path}")
@@ -2,31 +2,42 @@
 
 from __future__ import annotations
 
+import functools
 import re
+import sys
 from typing import List
 
+_CAMEL_BOUNDARY_RE = re.compile(r"([a-z0-9])([A-Z])")
+_NON_ALNUM_RE = re.compile(r"[^A-Za-z0-9]+")
 
+
+@functools.lru_cache(maxsize=1 << 16)
 def normalize(s: str) -> str:
     if not s:
         return ""
-    s = s.strip()
-    s = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", s)
-    s = re.sub(r"[^A-Za-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip().lower()
-    return s
+    # Every run of non-alphanumerics (whitespace included) becomes one space, so
+    # no separate whitespace-collapse or leading strip pass is needed.
+    s = _CAMEL_BOUNDARY_RE.sub(r"\1 \2", s)
+    # Interned (once per distinct input, given the cache) so that a name equal
+    # to a catalog candidate is the same object and compares by identity.
+    return sys.intern(_NON_ALNUM_RE.sub(" ", s).strip().lower())
+
+
+_AFFIX_PREFIXES = ("ngx_", "redis_", "__")
+_AFFIX_SUFFIXES = ("_impl", "_locked")
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def strip_affixes(name: str) -> str:
     """Remove common project-specific prefixes/suffixes so matching isn't biased."""
     if not name:
         return ""
     s = name
-    for pref in ("ngx_", "redis_", "__"):
-        if s.startswith(pref):
-            s = s[len(pref):]
-    for suff in ("_impl", "_locked"):
-        if s.endswith(suff):
-            s = s[: -len(suff)]
+    # Applied in order, so stacked affixes (e.g. "ngx___foo") are all removed.
+    for pref in _AFFIX_PREFIXES:
+        s = s.removeprefix(pref)
+    for suff in _AFFIX_SUFFIXES:
+        s = s.removesuffix(suff)
     return s
 
 
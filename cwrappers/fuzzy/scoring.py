@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
 import re
 from dataclasses import dataclass
-from typing import List, Set
+from typing import FrozenSet, List, Optional, Set, Tuple
 
 try:
     from rapidfuzz import fuzz as rf_fuzz, process as rf_process  # type: ignore
@@ -12,7 +14,7 @@ except Exception:
     rf_fuzz = None  # type: ignore
     rf_process = None  # type: ignore
 
-from cwrappers.fuzzy.canon import CanonSet
+from cwrappers.fuzzy.canon import CanonIndex, CanonSet
 from cwrappers.fuzzy.normalize import normalize, strip_affixes, tokenize
 
 
@@ -22,6 +24,13 @@ API_CALLED_STRONG_RF_MIN = 86.0
 API_CALLED_STRONG_COMBINED_MIN = 72.0
 API_CALLED_TOKEN_OVERLAP_MIN = 0.60
 
+_CALLEE_SPLIT_RE = re.compile(r"[|;,\s]+")
+_WS_RE = re.compile(r"\s+")
+_YES_COUNT_RE = re.compile(r"yes\s*-\s*(\d+)")
+
+_CATALOG_BLACKLIST = frozenset({"", "other"})
+_CATEGORY_BLACKLIST = frozenset({"", "n/a", "na", "none"})
+
 
 @dataclass
 class MatchScore:
@@ -34,41 +43,48 @@ class MatchScore:
     rf_score: float
 
 
+# Function names share a small vocabulary of tokens, and every token is scored
+# against the same catalog candidates, so the same pairs come up again and again.
+@functools.lru_cache(maxsize=1 << 16)
 def _lcs_str_len(a: str, b: str) -> int:
     """Length of longest common substring (contiguous)."""
     if not a or not b:
         return 0
-    m, n = len(a), len(b)
-    dp = [0] * (n + 1)
+    if len(a) > len(b):
+        a, b = b, a
+    # Only a substring longer than the best so far can change the answer, and
+    # if a[i:i + best + 1] is not in b no longer one starting at i is either.
+    # So each start costs one C-level substring search plus one per unit of
+    # growth, rather than a Python-level O(len(a) * len(b)) table.
+    n = len(a)
     best = 0
-    for i in range(1, m + 1):
-        prev = 0
-        for j in range(1, n + 1):
-            tmp = dp[j]
-            if a[i - 1] == b[j - 1]:
-                dp[j] = prev + 1
-                if dp[j] > best:
-                    best = dp[j]
-            else:
-                dp[j] = 0
-            prev = tmp
+    for i in range(n):
+        if best >= n - i:
+            break
+        while i + best < n and a[i:i + best + 1] in b:
+            best += 1
     return best
 
 
 def score_against_canon(fn_tokens: List[str], fn_norm: str, cs: CanonSet) -> MatchScore:
     best_lcs = 0
     best_ratio = 0.0
-    cand = cs.candidates[0] if cs.candidates else ""
+    cand = cs.primary
+    cand_len = cs.primary_len
     exact = fn_norm == cand
-    token_equal = set(fn_tokens) == set(cand.split()) if fn_tokens and cand else False
+    token_equal = set(fn_tokens) == cs.primary_tokens if fn_tokens and cand else False
     for t in fn_tokens or [fn_norm]:
         lcs = _lcs_str_len(t, cand)
         if lcs > best_lcs:
             best_lcs = lcs
-            best_ratio = max(lcs / max(1, len(t)), lcs / max(1, len(cand)))
-    combined = 100.0 if exact else max(0.0, min(100.0, 100.0 * best_ratio))
+            # lcs > 0 here, so neither length is 0, and the larger of lcs/len(t)
+            # and lcs/len(cand) is the one over the shorter string, at most 1.
+            t_len = len(t)
+            best_ratio = lcs / (t_len if t_len < cand_len else cand_len)
+    combined = 100.0 if exact else 100.0 * best_ratio
     rf_score = combined
-    if rf_fuzz and fn_norm and cand:
+    # Both scorers give identical strings 100, which combined already is.
+    if rf_fuzz and fn_norm and cand and not exact:
         try:
             wratio = float(rf_fuzz.WRatio(fn_norm, cand))
             token_ratio = float(rf_fuzz.token_set_ratio(fn_norm, cand))
@@ -78,15 +94,39 @@ def score_against_canon(fn_tokens: List[str], fn_norm: str, cs: CanonSet) -> Mat
     return MatchScore(key=cs.key, best_match=cand, exact=exact, token_equal=token_equal, lcs_len=best_lcs, combined=combined, rf_score=rf_score)
 
 
-def top_k_scores(fn_name: str, canon_sets: List[CanonSet], k: int = 3) -> List[MatchScore]:
+def top_k_scores(
+    fn_name: str,
+    canon_sets: List[CanonSet],
+    k: int = 3,
+    index: Optional[CanonIndex] = None,
+) -> List[MatchScore]:
+    """Best k matches for fn_name; index (from build_canon_index(canon_sets)) narrows the scan."""
     fn_stripped = strip_affixes(fn_name)
     fn_tokens = tokenize(fn_stripped)
     fn_norm = normalize(fn_stripped)
-    scores = [score_against_canon(fn_tokens, fn_norm, cs) for cs in canon_sets]
-    scores = [s for s in scores if s.lcs_len >= 3 or s.exact]
+    # Most candidates fail the lcs_len >= 3 / exact cut; find the ones that pass
+    # first so the rapidfuzz scorers only run on the survivors.
+    probes = fn_tokens or [fn_norm]
+    scores = []
+    if index is not None:
+        # Sharing a 3-gram is the same as a common substring of length >= 3.
+        hits: Set[int] = set(index.by_candidate.get(fn_norm, ()))
+        by_trigram = index.by_trigram
+        for t in probes:
+            for j in range(len(t) - 2):
+                hits.update(by_trigram.get(t[j:j + 3], ()))
+        for i in sorted(hits):
+            scores.append(score_against_canon(fn_tokens, fn_norm, canon_sets[i]))
+    else:
+        for cs in canon_sets:
+            cand = cs.primary
+            if fn_norm != cand and max(_lcs_str_len(t, cand) for t in probes) < 3:
+                continue
+            scores.append(score_against_canon(fn_tokens, fn_norm, cs))
     if not scores:
         return []
-    scores.sort(key=lambda m: (
+    # Only k of the catalog-sized list are kept, so select rather than sort it all.
+    return heapq.nsmallest(k, scores, key=lambda m: (
         -m.rf_score,
         0 if m.exact else 1,
         0 if m.token_equal else 1,
@@ -94,19 +134,43 @@ def top_k_scores(fn_name: str, canon_sets: List[CanonSet], k: int = 3) -> List[M
         -m.combined,
         m.key,
     ))
-    return scores[:k]
 
 
-def _split_callees(callee_field: str) -> List[str]:
+def _split_callees(callee_field: str) -> Tuple[str, ...]:
     if not callee_field:
-        return []
+        return ()
     s = callee_field.strip()
     if not s:
-        return []
+        return ()
+    # Most fields name a single callee; " - " contains whitespace, so no
+    # delimiter match means nothing to split.
+    if _CALLEE_SPLIT_RE.search(s) is None:
+        return (s,)
     s = s.replace(" - ", "|")
-    parts = re.split(r"[|;,\s]+", s)
+    parts = _CALLEE_SPLIT_RE.split(s)
     parts = [p.strip() for p in parts]
-    return [p for p in parts if p]
+    return tuple(p for p in parts if p)
+
+
+# The same callee lists recur on many rows (one row per wrapped API).
+@functools.lru_cache(maxsize=1 << 16)
+def _callee_profile(callee_field: str) -> Tuple[Tuple[str, ...], int, FrozenSet[str]]:
+    """Normalized callees, how many distinct ones, and all of their tokens."""
+    norms = tuple(normalize(c) for c in _split_callees(callee_field))
+    tokens = frozenset(t for n in norms for t in n.split())
+    return norms, len(set(norms)), tokens
+
+
+# arg_pass / ret_pass cells come from a handful of values ("no", "yes - all",
+# "yes - N"), so each distinct one is parsed once.
+@functools.lru_cache(maxsize=1024)
+def _parse_provenance(value: str) -> Tuple[bool, int]:
+    """(every one passed, N of "yes - N") for an arg_pass/ret_pass value."""
+    prov = _WS_RE.sub(" ", value.strip().lower())
+    if prov == "yes - all":
+        return True, 0
+    m = _YES_COUNT_RE.match(prov)
+    return False, int(m.group(1)) if m else 0
 
 
 def _split_api_called(api_called: str) -> List[str]:
@@ -184,9 +248,7 @@ def best_strong_api_called_match(function: str, api_called: str) -> str:
 def has_traced_catalog_api(api_called: str, category: str = "") -> bool:
     api_called_norm = normalize(api_called)
     category_norm = normalize(category)
-    catalog_blacklist = {"", "other"}
-    category_blacklist = {"", "n/a", "na", "none"}
-    return bool(api_called_norm) and api_called_norm not in catalog_blacklist and category_norm not in category_blacklist
+    return bool(api_called_norm) and api_called_norm not in _CATALOG_BLACKLIST and category_norm not in _CATEGORY_BLACKLIST
 
 
 def is_strong_fuzzy_without_api(function: str,
@@ -248,9 +310,7 @@ def wrapper_score(function: str,
             except Exception:
                 api_alignment = 0.0
 
-    callees = _split_callees(callee_field)
-    callee_norms = [normalize(c) for c in callees if c]
-    n_callees = len(set(callee_norms))
+    callee_norms, n_callees, callee_tokens_all = _callee_profile(callee_field)
 
     if n_callees <= 0:
         s_thin = 0.0
@@ -260,14 +320,21 @@ def wrapper_score(function: str,
     def pos(tok: str) -> float:
         if not tok:
             return 0.0
-        if fn_norm.startswith(tok) or fn_norm.endswith(tok):
+        # Most tokens do not occur at all, so one find() settles those.
+        i = fn_norm.find(tok)
+        if i < 0:
+            return 0.0
+        if i == 0 or fn_norm.endswith(tok):
             return 1.0
-        pad = f" {fn_norm} "
-        if f" {tok} " in pad:
-            return 0.7
-        if tok in fn_norm:
-            return 0.4
-        return 0.0
+        # Normalized names are alphanumeric words joined by single spaces, and no
+        # occurrence touches either end here, so a whole-word hit is a space on
+        # both sides.
+        m = len(tok)
+        while i >= 0:
+            if fn_norm[i - 1] == " " and fn_norm[i + m] == " ":
+                return 0.7
+            i = fn_norm.find(tok, i + 1)
+        return 0.4
 
     pos_candidates = ([] if not api_norm else [pos(api_norm)]) + [pos(t) for t in callee_norms]
     s_pos = max(pos_candidates) if pos_candidates else 0.0
@@ -331,9 +398,6 @@ def wrapper_score(function: str,
     score += W_CAT * catalog_signal
 
     penalties = 1.0
-    callee_tokens_all: Set[str] = set()
-    for c in callees:
-        callee_tokens_all.update(tokenize(c))
     if api_from_catalog and api_tokens:
         api_first = api_tokens[0]
         if api_first and (api_first not in fn_tokens) and (api_first not in callee_tokens_all):
@@ -360,30 +424,14 @@ def wrapper_score(function: str,
     except Exception:
         pass
 
-    def _norm_prov(s: str) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip().lower())
-
-    ap = _norm_prov(arg_pass)
-    rp = _norm_prov(ret_pass)
+    arg_all, arg_count = _parse_provenance(arg_pass or "")
+    ret_all, ret_count = _parse_provenance(ret_pass or "")
 
-    if ap == "yes - all" and rp == "yes - all":
+    if arg_all and ret_all:
         score = 1.0
     else:
-        arg_bonus = 0.0
-        if ap == "yes - all":
-            arg_bonus = 0.12
-        else:
-            m = re.match(r"yes\s*-\s*(\d+)", ap)
-            if m:
-                arg_bonus = min(0.10, 0.02 * int(m.group(1)))
-
-        ret_bonus = 0.0
-        if rp == "yes - all":
-            ret_bonus = 0.08
-        else:
-            m = re.match(r"yes\s*-\s*(\d+)", rp)
-            if m:
-                ret_bonus = min(0.06, 0.02 * int(m.group(1)))
+        arg_bonus = 0.12 if arg_all else min(0.10, 0.02 * arg_count)
+        ret_bonus = 0.08 if ret_all else min(0.06, 0.02 * ret_count)
 
         score = min(1.0, score + arg_bonus + ret_bonus)
 
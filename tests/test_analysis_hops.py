@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cwrappers.finder import analysis
+from cwrappers.finder.ast_utils import _caller_name, _function_body_cursor, _is_callable_definition
+from cwrappers.finder.catalog import HelperConfig
+from cwrappers.finder.clang_bootstrap import cindex, K
+
+
+class HelperHopTests(unittest.TestCase):
+    def test_hop_checks_share_memoized_callee_summaries(self) -> None:
+        source = """
+        int close(int fd);
+        static int tiny(int fd) { close(fd); return 0; }
+        static int tiny2(int fd) { tiny(fd); return 0; }
+        int a(int fd) { return tiny(fd); }
+        int b(int fd) { return tiny2(fd); }
+        """
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "hops.c"
+            src.write_text(source, encoding="utf-8")
+            tu = cindex.Index.create().parse(str(src), args=["-x", "c"])
+
+            calls = {}
+            for cur in tu.cursor.walk_preorder():
+                if _is_callable_definition(cur):
+                    for n in cur.walk_preorder():
+                        if n.kind == K.CALL_EXPR:
+                            calls[_caller_name(cur)] = n
+
+            targets = {"close"}
+            analysis.reset_hop_cache()
+            self.assertTrue(analysis._call_hits_target_via_one_hop(calls["a"], targets))
+            self.assertFalse(analysis._call_hits_target_via_one_hop(calls["b"], targets))
+            self.assertTrue(analysis._call_hits_target_via_n_hops(calls["b"], targets, 2))
+            self.assertFalse(analysis._call_hits_target_via_n_hops(calls["b"], targets, 1))
+            self.assertEqual(analysis._inner_target_from_one_hop(calls["a"], targets), "close")
+            self.assertEqual(len(analysis._callee_cache), 2)
+
+            analysis.reset_hop_cache()
+            self.assertEqual(len(analysis._callee_cache), 0)
+
+
+class PathSummaryTests(unittest.TestCase):
+    def test_analyze_stmt_results_are_memoized_per_target_set(self) -> None:
+        source = """
+        int close(int fd);
+        int f(int fd, int x) {
+            if (x) { close(fd); close(fd); }
+            for (;;) { close(fd); }
+            return 0;
+        }
+        """
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "paths.c"
+            src.write_text(source, encoding="utf-8")
+            tu = cindex.Index.create().parse(str(src), args=["-x", "c"])
+            fn = next(c for c in tu.cursor.walk_preorder() if _is_callable_definition(c))
+            body = _function_body_cursor(fn)
+            helpers = HelperConfig(benign=set(), benign_regex=[], helpers=set(), helpers_regex=[])
+
+            targets = {"close"}
+            analysis.reset_hop_cache()
+            with mock.patch.object(analysis, "_analyze_stmt_bits_uncached",
+                                   wraps=analysis._analyze_stmt_bits_uncached) as uncached:
+                first = analysis.analyze_stmt(body, targets, helpers, max_helper_hops=2)
+                cold_calls = uncached.call_count
+                cached = len(analysis._path_cache)
+                again = analysis.analyze_stmt(body, targets, helpers, max_helper_hops=2)
+                warm_calls = uncached.call_count - cold_calls
+                other = analysis.analyze_stmt(body, {"open"}, helpers, max_helper_hops=2)
+                other_calls = uncached.call_count - cold_calls - warm_calls
+
+            self.assertEqual((first.counts, first.unknown), ({0, 1, 2}, False))
+            self.assertEqual((again.counts, again.unknown), (first.counts, first.unknown))
+            self.assertEqual((other.counts, other.unknown), ({0, 1}, False))
+            self.assertGreater(cold_calls, 0)
+            self.assertEqual(warm_calls, 0)
+            # A different target set is a different memo key, so it is summarized afresh.
+            self.assertEqual(other_calls, cold_calls)
+            self.assertGreater(cached, 0)
+            self.assertEqual(len(analysis._path_cache), cached)
+
+            analysis.reset_hop_cache()
+            self.assertEqual(len(analysis._path_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
 from types import SimpleNamespace
 
-from cwrappers.finder.ast_utils import _callsite_loc
+from cwrappers.finder.ast_utils import _CursorCache, _callsite_loc, _function_body_cursor_uncached
+from cwrappers.finder.clang_bootstrap import cindex, K
 
 
 class AstUtilsTests(unittest.TestCase):
@@ -18,6 +21,55 @@ class AstUtilsTests(unittest.TestCase):
 
         self.assertEqual(_callsite_loc(call), "<unknown>:17:9")
 
+    def test_cursor_cache_is_scoped_to_one_translation_unit(self) -> None:
+        cache = _CursorCache()
+        calls = []
+
+        def compute(c):
+            calls.append(c)
+            return c.value
+
+        tu_a, tu_b = object(), object()
+        first = SimpleNamespace(_tu=tu_a, hash=7, value="a")
+        equal_cursor = SimpleNamespace(_tu=tu_a, hash=7, value="a")
+        same_hash_other_tu = SimpleNamespace(_tu=tu_b, hash=7, value="b")
+        no_tu = SimpleNamespace(hash=7, value="raw")
+
+        self.assertEqual(cache.get(first, compute), "a")
+        self.assertEqual(cache.get(equal_cursor, compute), "a")
+        self.assertEqual(cache.get(same_hash_other_tu, compute), "b")
+        self.assertEqual(cache.get(no_tu, compute), "raw")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(cache), 1)
+
+    def test_cursor_cache_recomputes_on_hash_collision(self) -> None:
+        cache = _CursorCache()
+        tu = object()
+        first = SimpleNamespace(_tu=tu, hash=7, value="a")
+        colliding = SimpleNamespace(_tu=tu, hash=7, value="b")
+
+        compute = lambda c: c.value
+        self.assertEqual(cache.get(first, compute), "a")
+        self.assertEqual(cache.get(colliding, compute), "b")
+        self.assertEqual(cache.get(colliding, compute), "b")
+
+    def test_function_body_cursor_stops_at_compound_statement(self) -> None:
+        source = "int decl(int a);\nint defn(int a, int b) { return a + b; }\n"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "body.c"
+            src.write_text(source, encoding="utf-8")
+            tu = cindex.Index.create().parse(str(src), args=["-x", "c"])
+
+            fns = {c.spelling: c for c in tu.cursor.get_children() if c.kind == K.FUNCTION_DECL}
+            body = _function_body_cursor_uncached(fns["defn"])
+
+            self.assertIsNone(_function_body_cursor_uncached(fns["decl"]))
+            self.assertIsNotNone(body)
+            self.assertEqual(body.kind, K.COMPOUND_STMT)
+            self.assertIs(body._tu, tu)
+            self.assertEqual(body.extent.start.line, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from cwrappers.finder.callgraph import DetailedEdge, FunctionDef, write_callgraph
+from cwrappers.finder.callgraph import DetailedEdge, Edge, FunctionDef, write_callgraph
 from cwrappers.finder.models import TranslationUnitReport
 
 
@@ -238,6 +238,28 @@ class CallgraphExportTests(unittest.TestCase):
         self.assertEqual(summary_by_name["main"]["callee_names"], "foo;write")
         self.assertEqual(summary_by_name["foo"]["fan_in"], "1")
 
+    def test_write_callgraph_simple_edges_are_deduped_and_sorted(self) -> None:
+        edges = [
+            Edge(caller="main", callee="foo", loc="/repo/main.c:12:3"),
+            Edge(caller="main", callee="bar", loc="/repo/main.c:10:3"),
+            Edge(caller="main", callee="foo", loc="/repo/main.c:12:3"),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_dir = Path(tmpdir)
+            write_callgraph(out_dir, edges)
+
+            with open(out_dir / "callgraph_edges.csv", newline="", encoding="utf-8") as f:
+                edge_rows = list(csv.DictReader(f))
+            with open(out_dir / "call_counts.csv", newline="", encoding="utf-8") as f:
+                count_rows = list(csv.DictReader(f))
+            self.assertFalse((out_dir / "translation_units.csv").exists())
+
+        self.assertEqual(list(edge_rows[0].keys()), ["caller", "callee", "callsite", "callsite_file", "callsite_line", "callsite_column"])
+        self.assertEqual([row["callee"] for row in edge_rows], ["bar", "foo"])
+        self.assertEqual(edge_rows[1]["callsite_line"], "12")
+        self.assertEqual(count_rows, [])
+
 
 if __name__ == "__main__":
     unittest.main()
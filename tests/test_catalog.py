@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import re
+import unittest
+
+from cwrappers.finder.catalog import HelperConfig
+
+
+class HelperConfigTests(unittest.TestCase):
+    def test_regex_lists_match_like_individual_patterns(self) -> None:
+        benign = [re.compile(p) for p in ("^__builtin", "(log|trace)_msg$")]
+        helpers = [re.compile(p) for p in ("^x.*_impl$", r"(\w)\1", "(?i)^wrap")]
+        cfg = HelperConfig(benign={"assert_ok"}, benign_regex=benign, helpers={"xfree"}, helpers_regex=helpers)
+
+        self.assertIsNotNone(cfg._benign_union)
+        # Backreferences and inline flags cannot share one alternation.
+        self.assertIsNone(cfg._helpers_union)
+
+        for name in ("assert_ok", "__builtin_memcpy", "trace_msg", "msg_log", "xfree", "x_read_impl", "aab", "WRAP_open", "open"):
+            self.assertEqual(
+                cfg.any_match(name, "benign"),
+                name in cfg.benign or any(r.search(name) for r in benign),
+                name,
+            )
+            self.assertEqual(
+                cfg.any_match(name),
+                name in cfg.helpers or any(r.search(name) for r in helpers),
+                name,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class ClangBootstrapTests(unittest.TestCase):
+    def test_cli_import_does_not_load_libclang(self) -> None:
+        code = (
+            "import sys\n"
+            "import cwrappers.cli, cwrappers.finder.cli, cwrappers.finder.compile_commands\n"
+            "print('clang.cindex' in sys.modules)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+    def test_unified_cli_import_defers_subcommand_modules(self) -> None:
+        code = (
+            "import sys\n"
+            "import cwrappers.cli\n"
+            "print(sorted(m for m in ('yaml', 'cwrappers.fuzzy.io', 'cwrappers.finder.runner') if m in sys.modules))\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_libclang_path_recorded_by_previous_run_is_reused(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_lib = os.path.join(tmpdir, "libclang-cached.so")
+            open(fake_lib, "w").close()
+            os.makedirs(os.path.join(tmpdir, "cwrappers"))
+            with open(os.path.join(tmpdir, "cwrappers", "libclang_path"), "w") as fh:
+                fh.write(fake_lib + "\n")
+            env = {k: v for k, v in os.environ.items() if k != "LIBCLANG_PATH"}
+            env["XDG_CACHE_HOME"] = tmpdir
+            code = (
+                "from cwrappers.finder import clang_bootstrap\n"
+                "print(clang_bootstrap.get_cindex().Config.library_file)\n"
+            )
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+        self.assertEqual(out.stdout.strip(), fake_lib)
+
+    def test_cindex_attribute_is_resolved_on_access(self) -> None:
+        from cwrappers.finder import clang_bootstrap
+
+        self.assertIs(clang_bootstrap.cindex, clang_bootstrap.get_cindex())
+        self.assertIs(clang_bootstrap.K, clang_bootstrap.get_cindex().CursorKind)
+        with self.assertRaises(AttributeError):
+            clang_bootstrap.not_a_real_name
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
 from pathlib import Path
 
 from cwrappers.finder.compile_commands import (
+    _resolve_cached,
     _sanitize_clang_args_for_libclang,
+    build_file_to_args_map,
     make_retry_clang_args,
 )
 
@@ -44,6 +47,63 @@ class CompileCommandSanitizerTests(unittest.TestCase):
         self.assertNotIn("-o", sanitized)
         self.assertNotIn("src.o", sanitized)
 
+    def test_sanitizer_splits_joined_paths_and_drops_link_and_warning_flags(self) -> None:
+        args = [
+            "gcc",
+            "-Iinclude",
+            "-isystemthird_party",
+            "--sysroot=sysroot",
+            "-Wall",
+            "-Wl,-z,now",
+            "-lm",
+            "-fPIC",
+            "-O2",
+            "lib/Foo.O",
+            "src.c",
+        ]
+
+        sanitized = _sanitize_clang_args_for_libclang(
+            args,
+            Path("/repo/src.c"),
+            Path("/repo"),
+        )
+
+        self.assertEqual(
+            sanitized[:10],
+            [
+                "-x", "c",
+                "-I", "/repo/include",
+                "-isystem", "/repo/third_party",
+                "--sysroot=/repo/sysroot",
+                "-fPIC",
+                "-O2",
+                "-working-directory=/repo",
+            ],
+        )
+        for dropped in ("-Wall", "-Wl,-z,now", "-lm", "lib/Foo.O", "src.c", "gcc"):
+            self.assertNotIn(dropped, sanitized)
+
+    def test_build_map_clears_path_caches_afterwards(self) -> None:
+        _resolve_cached("/")
+        build_file_to_args_map([{"directory": "/repo", "file": "missing.c", "arguments": ["cc"]}])
+        self.assertEqual(_resolve_cached.cache_info().currsize, 0)
+
+    def test_build_map_shares_identical_arg_tuples(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("a.c", "b.c"):
+                Path(tmpdir, name).write_text("int x;\n")
+            entries = [
+                {"directory": tmpdir, "file": name, "command": f"cc -DFOO=1 -Iinclude -c {name}"}
+                for name in ("a.c", "b.c")
+            ]
+
+            file_to_args = build_file_to_args_map(entries)
+
+        args_a, args_b = file_to_args.values()
+        self.assertIsInstance(args_a, tuple)
+        self.assertIs(args_a, args_b)
+        self.assertIn("-DFOO=1", args_a)
+
     def test_retry_args_strip_arch_flags_but_keep_language_flags(self) -> None:
         cleaned = make_retry_clang_args(
             [
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import unittest
+
+from cwrappers.fuzzy.canon import CanonSet, build_canon_index
+from cwrappers.fuzzy.normalize import normalize, strip_affixes, tokenize
+from cwrappers.fuzzy.scoring import score_against_canon, top_k_scores
+
+
+def _canon(*names: str) -> list[CanonSet]:
+    return [CanonSet(key=n, candidates=[normalize(n)]) for n in names]
+
+
+class TopKScoresTests(unittest.TestCase):
+    def test_prefiltered_and_indexed_top_k_match_scoring_every_candidate(self) -> None:
+        canon_sets = _canon("read", "readv", "pread", "fread", "open", "openat", "fopen", "write", "io", "memcpy", "x")
+        index = build_canon_index(canon_sets)
+        for fn_name in ("my_read", "xReadFile", "safe_open", "io", "do_memcpy_fast", "zz", "", "wrapWriteAll"):
+            fn_stripped = strip_affixes(fn_name)
+            fn_tokens, fn_norm = tokenize(fn_stripped), normalize(fn_stripped)
+            expected = [
+                s for s in (score_against_canon(fn_tokens, fn_norm, cs) for cs in canon_sets)
+                if s.lcs_len >= 3 or s.exact
+            ]
+            expected.sort(key=lambda m: (-m.rf_score, not m.exact, not m.token_equal, -m.lcs_len, -m.combined, m.key))
+            self.assertEqual(top_k_scores(fn_name, canon_sets, k=3), expected[:3], fn_name)
+            self.assertEqual(top_k_scores(fn_name, canon_sets, k=3, index=index), expected[:3], fn_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
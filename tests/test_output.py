@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cwrappers.finder import output
+from cwrappers.finder.models import Row
+
+
+def _rows() -> list[Row]:
+    return [
+        Row(
+            file="/src/é.c", function="wrap_read", api_called="read", category="File IO",
+            total_target_calls=1, hit_locs=["3:9"], per_path_single=True, derived_from_params=True,
+            derivation_trace=["fd<-param"], reason="path-counts=[1]", function_key="c:@F@wrap_read",
+            callees=["read"],
+        ),
+        Row(
+            file="/src/odd.c", function="odd", api_called="other", category="N/A",
+            total_target_calls=0, hit_locs=[], per_path_single=False, derived_from_params=False,
+            derivation_trace=[], reason=" ", function_key=None,
+        ),
+    ]
+
+
+class JsonWriterTests(unittest.TestCase):
+    def _write_all(self, tmpdir: str, backend: object) -> dict[str, bytes]:
+        written = {}
+        with mock.patch.object(output, "orjson", backend):
+            for name, write in (("json", output.write_rows_json), ("jsonl", output.write_rows_jsonl)):
+                path = Path(tmpdir) / f"{name}-{backend is None}"
+                write(_rows(), path)
+                written[name] = path.read_bytes()
+        return written
+
+    def test_stdlib_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            written = self._write_all(tmpdir, None)
+        records = json.loads(written["json"])
+        self.assertEqual([r["function"] for r in records], ["wrap_read", "odd"])
+        self.assertEqual(records[0]["hit_locs"], ["3:9"])
+        self.assertEqual([json.loads(line) for line in written["jsonl"].splitlines()], records)
+
+    @unittest.skipUnless(output.orjson, "orjson not installed")
+    def test_output_does_not_depend_on_orjson(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertEqual(self._write_all(tmpdir, output.orjson), self._write_all(tmpdir, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from cwrappers.finder import provenance
+from cwrappers.finder.ast_utils import _is_callable_definition
+from cwrappers.finder.clang_bootstrap import cindex, K
+
+
+class ArgRetPassTests(unittest.TestCase):
+    def test_return_walk_over_budget_leaves_ret_pass_undetermined(self) -> None:
+        source = """
+        int read(int fd, void *buf, int n);
+        int wrap(int fd, void *buf, int n) { if (n < 0) { n = 0; } return read(fd, buf, n); }
+        """
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "ret.c"
+            src.write_text(source, encoding="utf-8")
+            tu = cindex.Index.create().parse(str(src), args=["-x", "c"])
+            fn = next(c for c in tu.cursor.walk_preorder() if _is_callable_definition(c))
+            calls = [c for c in fn.walk_preorder() if c.kind == K.CALL_EXPR]
+
+            self.assertEqual(provenance.compute_arg_ret_pass_multi(fn, calls), ("yes - all", "yes - all"))
+            with mock.patch.object(provenance, "_MAX_RETURN_WALK_NODES", 3):
+                self.assertEqual(provenance.compute_arg_ret_pass_multi(fn, calls), ("yes - all", "-"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import unittest
+from pathlib import Path
 
-from cwrappers.finder.callgraph import DetailedEdge, FunctionDef
-from cwrappers.finder.runner import _trace_reachable_callee_names
+from cwrappers.finder.callgraph import DetailedEdge, FunctionDef, build_function_index
+from cwrappers.finder.runner import _group_edges, _map_translation_units, _reachable_callee_names
 
 
 class RunnerCalleeTracingTests(unittest.TestCase):
@@ -31,11 +32,24 @@ class RunnerCalleeTracingTests(unittest.TestCase):
             ),
         ]
 
-        reachable = _trace_reachable_callee_names(edges, function_defs)
+        defs_by_key, keys_by_name = build_function_index(function_defs.values())
+        _callers, _callees, direct_names, project_callees = _group_edges(edges, defs_by_key, keys_by_name)
+        reachable = _reachable_callee_names(direct_names, project_callees, defs_by_key)
 
         self.assertEqual(reachable["usr:foo"], ["helper", "malloc"])
         self.assertEqual(reachable["usr:helper"], ["malloc"])
 
 
+class RunnerTranslationUnitMapTests(unittest.TestCase):
+    def test_process_pool_keeps_translation_unit_order(self) -> None:
+        items = [(Path(f"/repo/{name}.c"), ["-I/repo/include"]) for name in ("b", "a", "d", "c")]
+
+        serial = list(_map_translation_units(repr, items, 1))
+        pooled = list(_map_translation_units(repr, items, 2))
+
+        self.assertEqual(serial, [repr(item) for item in items])
+        self.assertEqual(pooled, serial)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cwrappers.finder.runner import _parse_translation_unit, _parse_translation_unit_uncached, _with_common_pch
+
+
+def _function_names(tu) -> list[str]:
+    return sorted(c.spelling for c in tu.cursor.get_children() if c.is_definition())
+
+
+class TranslationUnitCacheTests(unittest.TestCase):
+    def test_cached_parse_is_reused_until_a_header_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            cache_dir = root / "cache"
+            header = root / "util.h"
+            header.write_text("int helper(int x);\n", encoding="utf-8")
+            src = root / "main.c"
+            src.write_text('#include "util.h"\nint wrap(int x) { return helper(x) + missing; }\n', encoding="utf-8")
+            args = ("-x", "c", f"-I{root}")
+
+            tu, report = _parse_translation_unit(src, args, tu_cache_dir=cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.ast"))), 1)
+            self.assertEqual(report.diagnostic_error_count, 1)
+
+            cached_tu, cached_report = _parse_translation_unit(src, args, tu_cache_dir=cache_dir)
+            self.assertEqual(cached_report, report)
+            # Loaded from the AST file: libclang does not replay its diagnostics.
+            self.assertEqual(list(cached_tu.diagnostics), [])
+            self.assertEqual(_function_names(cached_tu), _function_names(tu))
+
+            header.write_text("int helper(int x);\nint extra(void) { return 0; }\n", encoding="utf-8")
+            stat = header.stat()
+            os.utime(header, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            fresh_tu, _ = _parse_translation_unit(src, args, tu_cache_dir=cache_dir)
+            self.assertEqual(list(fresh_tu.diagnostics)[0].severity, 3)
+            self.assertEqual(_function_names(fresh_tu), ["extra", "wrap"])
+
+    def test_common_pch_is_shared_only_by_repeated_flag_sets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            header = root / "common.h"
+            header.write_text(
+                "#ifndef COMMON_H\n#define COMMON_H\nint helper(int x);\n#define CALL(x) helper(x)\n#endif\n",
+                encoding="utf-8",
+            )
+            shared = ("-x", "c", f"-I{root}")
+            single = ("-x", "c", f"-I{root}", "-DONE")
+            srcs = []
+            for name in ("a.c", "b.c", "c.c"):
+                src = root / name
+                src.write_text('#include "common.h"\nint wrap(int x) { return CALL(x); }\n', encoding="utf-8")
+                srcs.append(src)
+            file_to_args = {srcs[0]: shared, srcs[1]: shared, srcs[2]: single}
+
+            with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(root / "xdg")}):
+                out = _with_common_pch(file_to_args, header)
+
+            self.assertEqual(out[srcs[0]][:-2], shared)
+            self.assertEqual(out[srcs[0]][-2], "-include-pch")
+            self.assertIs(out[srcs[1]], out[srcs[0]])
+            self.assertIs(out[srcs[2]], single)
+            tu, report = _parse_translation_unit(srcs[0], out[srcs[0]])
+            self.assertEqual(report.total_diagnostic_count, 0)
+            self.assertEqual(_function_names(tu), ["wrap"])
+
+    def test_common_pch_is_rebuilt_when_a_nested_header_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            inner = root / "inner.h"
+            inner.write_text("int helper(int x);\n", encoding="utf-8")
+            header = root / "common.h"
+            header.write_text('#ifndef COMMON_H\n#define COMMON_H\n#include "inner.h"\n#endif\n', encoding="utf-8")
+            args = ("-x", "c", f"-I{root}")
+            srcs = []
+            for name in ("a.c", "b.c"):
+                src = root / name
+                src.write_text('#include "common.h"\nint wrap(int x) { return helper(x); }\n', encoding="utf-8")
+                srcs.append(src)
+            file_to_args = {src: args for src in srcs}
+
+            with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(root / "xdg")}):
+                before = _with_common_pch(file_to_args, header)[srcs[0]]
+                self.assertEqual(_with_common_pch(file_to_args, header)[srcs[0]], before)
+
+                inner.write_text("int helper(int x);\nint extra(int y);\n", encoding="utf-8")
+                stat = inner.stat()
+                os.utime(inner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+                # A parse still holding the stale PCH falls back to parsing without it.
+                stale_tu, report = _parse_translation_unit_uncached(srcs[0], before)
+                self.assertTrue(report.retry_used)
+                self.assertEqual(_function_names(stale_tu), ["wrap"])
+
+                after = _with_common_pch(file_to_args, header)[srcs[0]]
+
+            self.assertEqual(after[-2], "-include-pch")
+            self.assertNotEqual(after[-1], before[-1])
+            tu, report = _parse_translation_unit(srcs[0], after)
+            self.assertFalse(report.retry_used)
+            self.assertEqual(report.total_diagnostic_count, 0)
+            self.assertEqual(_function_names(tu), ["wrap"])
+
+
+if __name__ == "__main__":
+    unittest.main()
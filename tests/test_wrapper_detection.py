@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from cwrappers.finder.ast_utils import _caller_name, _is_callable_definition
+from cwrappers.finder.catalog import ApiCatalog, HelperConfig
+from cwrappers.finder.clang_bootstrap import cindex
+from cwrappers.finder.wrapper_detection import analyze_wrapper_strict_plus
+
+
+class StrictPlusTests(unittest.TestCase):
+    def test_target_call_inside_benign_call_arguments_is_reported(self) -> None:
+        source = """
+        int open(const char *path, int flags);
+        int check(int rc);
+        int w1(const char *p) { return check(open(p, 0)); }
+        """
+        catalog = ApiCatalog(
+            libc=frozenset({"open"}),
+            syscalls=frozenset(),
+            target_names=frozenset({"open"}),
+            helpers=HelperConfig(benign={"check"}, benign_regex=[], helpers=set(), helpers_regex=[]),
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "benign.c"
+            src.write_text(source, encoding="utf-8")
+            tu = cindex.Index.create().parse(str(src), args=["-x", "c"])
+
+            fn = next(c for c in tu.cursor.walk_preorder()
+                      if _is_callable_definition(c) and _caller_name(c) == "w1")
+            result = analyze_wrapper_strict_plus(fn, catalog)
+
+        self.assertTrue(result[0])
+        self.assertEqual(result[5], "open")
+
+
+if __name__ == "__main__":
+    unittest.main()